@@ -0,0 +1,9 @@
+import sys
+
+# modules using syntax the running interpreter does not support
+collect_ignore = []
+if sys.version_info < (3, 5):
+    collect_ignore.append('owslib/wpsjobs.py')
+    collect_ignore.append('tests/doctests/wps_jobs.txt')
+    collect_ignore.append('owslib/aio.py')
+    collect_ignore.append('tests/doctests/aio.txt')
@@ -0,0 +1,634 @@
+# -*- coding: ISO-8859-15 -*-
+# =============================================================================
+# OWSLib. Copyright (C) 2005 Sean C. Gillies
+#
+# Contact email: sgillies@frii.com
+# =============================================================================
+
+"""
+asyncio service clients (Python 3.5+).
+
+AsyncWebMapService, AsyncWebMapTileService, AsyncWebFeatureService and
+AsyncCatalogueServiceWeb wrap the synchronous service objects: metadata
+(contents, operations, ...) is read from the wrapped object, requests are
+built by its own builders, and GetMap, GetTile, GetFeature and
+GetRecords/GetRecordById are sent on an AsyncTransport, so thousands of
+them can run concurrently on one event loop without a thread each.
+
+Example::
+
+    async with AsyncTransport(max_per_host=20) as transport:
+        wmts = await AsyncWebMapTileService.open(url, transport=transport)
+        tiles = await asyncio.gather(*[
+            wmts.gettile(layer=name, tilematrixset='EPSG:4326', tilematrix='EPSG:4326:5',
+                         row=row, column=column)
+            for row in range(32) for column in range(64)])
+
+The transport is a small HTTP/1.1 client on asyncio streams keeping
+connections alive per host.  Like openURL it uses the proxies of the
+environment (HTTP_PROXY, HTTPS_PROXY, NO_PROXY), https through CONNECT
+tunnels.  Cancelling a request closes its connection.  Errors are raised
+as by openURL: ServiceException for 400/401 and OGC exception reports,
+requests.HTTPError for 404 and 5xx, and asyncio.TimeoutError after
+timeout seconds.  The owslib.util retry_policy, circuit_breaker, limiter
+and deadline() apply as they do to openURL.
+"""
+
+import asyncio
+import base64
+import copy
+import socket
+import ssl
+import zlib
+from urllib.parse import unquote, urlencode, urljoin, urlsplit
+
+from owslib.etree import etree
+from owslib import util
+from owslib.namespaces import Namespaces
+from owslib.util import (DeadlineExceeded, OrderedDict, ServiceException, _UNHEALTHY, _check_exception_report,
+                         _retry_delay, bind_url, remaining_time, requests)
+
+OGC_NAMESPACE = Namespaces().get_namespace('ogc')
+
+USER_AGENT = 'OWSLib (https://geopython.github.io/OWSLib)'
+
+
+class HTTPResponse(object):
+    """
+    A response read by AsyncTransport, with the interface of the ResponseWrapper
+    returned by openURL: read(), info() and geturl().
+    """
+
+    def __init__(self, url, status_code, reason, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+
+    def read(self):
+        return self.content
+
+    def info(self):
+        return self.headers
+
+    def geturl(self):
+        return self.url.replace('&&', '&')
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', 'replace')
+
+
+async def acquire(limiter, url):
+    """
+    Wait on the event loop until limiter (an owslib.util.Limiter) lets a
+    request to url be sent; returns what to pass to limiter.release().
+    Threads and event loops using the same limiter share its limits.
+    Waiting counts against the deadline() in force.
+    """
+    limit = limiter.limit(url)
+    if limit is None:
+        return None
+    loop = _running_loop()
+    future = loop.create_future()
+
+    def handed():
+        if future.cancelled():
+            limit.leave()
+        else:
+            future.set_result(None)
+
+    def wake():
+        loop.call_soon_threadsafe(handed)
+
+    if not limit.enter(wake):
+        left = remaining_time()
+        try:
+            if left is None:
+                await future
+            else:
+                await asyncio.wait_for(future, max(0, left))
+        except (asyncio.CancelledError, asyncio.TimeoutError) as err:
+            # a slot handed over to a cancelled waiter goes back
+            if not limit.withdraw(wake) and future.done() and not future.cancelled():
+                limit.leave()
+            if isinstance(err, asyncio.TimeoutError):
+                raise DeadlineExceeded('Deadline exceeded waiting for a request slot of %s' % url)
+            raise
+    delay = limit.reserve()
+    if delay:
+        left = remaining_time()
+        if left is not None and delay > left:
+            limit.leave()
+            raise DeadlineExceeded('Deadline exceeded waiting %.2fs for the rate limit of %s' % (delay, url))
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            limit.leave()
+            raise
+    return limit
+
+
+def _running_loop():
+    # get_running_loop is Python 3.7+
+    return getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)()
+
+
+def _proxy_authorization(proxy):
+    """Proxy-Authorization header value for the credentials in the proxy URL, None without"""
+    if proxy.username is None:
+        return None
+    credentials = ('%s:%s' % (unquote(proxy.username), unquote(proxy.password or ''))).encode('utf-8')
+    return 'Basic ' + base64.b64encode(credentials).decode('ascii')
+
+
+class _StaleConnection(Exception):
+    """A kept alive connection was closed by the server before answering"""
+    pass
+
+
+class AsyncTransport(object):
+    """
+    HTTP/1.1 client on asyncio streams, keeping connections alive per host.
+
+    max_connections: requests in flight at once over all hosts
+    max_per_host: requests in flight at once to one host, and connections
+        kept alive for it
+    timeout: default seconds a whole request may take
+    proxies: proxy URLs by scheme, as for requests ({'https': 'http://proxy:3128'});
+        with trust_env those of the environment are used too
+    """
+
+    def __init__(self, max_connections=100, max_per_host=10, timeout=30, ssl_context=None, max_redirects=5,
+                 proxies=None, trust_env=True):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.max_redirects = max_redirects
+        self.proxies = dict(proxies or {})
+        self.trust_env = trust_env
+        self._idle = {}         # (scheme, host, port) -> [(reader, writer)]
+        self._proxy_urls = {}   # (scheme, host, port) -> split proxy URL or None
+        self._host_limits = {}  # (scheme, host, port) -> Semaphore
+        self._limit = None      # created on the event loop that uses it
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Close the kept alive connections"""
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for reader, writer in connections:
+                writer.close()
+
+    async def request(self, method, url, data=None, headers=None, username=None, password=None, timeout=None):
+        """
+        HTTPResponse to method ('Get' or 'Post') on url.  Like openURL, data
+        is the query string or parameters of GET requests, the body of POST
+        requests.
+        """
+        method = method.split('}')[-1].upper()
+        body = None
+        if method == 'GET':
+            if data:
+                query = data if isinstance(data, str) else urlencode(data)
+                url = url + ('&' if '?' in url else '?') + query
+        elif method == 'POST':
+            body = data.encode('utf-8') if isinstance(data, str) else (data or b'')
+        else:
+            raise ValueError("Unknown method ('%s'), expected 'get' or 'post'" % method)
+
+        headers = dict(headers or {})
+        if body is not None and 'Content-Type' not in headers and body.lstrip()[:1] == b'<':
+            headers['Content-Type'] = 'text/xml'
+        if username and password:
+            credentials = ('%s:%s' % (username, password)).encode('utf-8')
+            headers['Authorization'] = 'Basic ' + base64.b64encode(credentials).decode('ascii')
+
+        policy, breaker = util.retry_policy, util.circuit_breaker
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            if breaker is not None:
+                breaker.allow(host)
+            limiter = util.limiter
+            limit = await acquire(limiter, url)
+            error = response = retry_after = None
+            try:
+                seconds = timeout if timeout is not None else self.timeout
+                left = remaining_time()
+                if left is not None:
+                    if left <= 0:
+                        raise DeadlineExceeded('Deadline exceeded before %s %s' % (method, url))
+                    seconds = left if seconds is None else min(seconds, left)
+                response = await asyncio.wait_for(self._follow(method, url, body, headers), seconds)
+            except DeadlineExceeded:
+                raise
+            except (OSError, asyncio.TimeoutError) as err:
+                error, reason = err, '%s: %s' % (type(err).__name__, err)
+            else:
+                reason = 'HTTP %d' % response.status_code
+                retry_after = response.headers.get('Retry-After')
+            finally:
+                limiter.release(limit)
+            if breaker is not None:
+                breaker.record(host, error is None and response.status_code not in _UNHEALTHY, reason)
+
+            failed = error is not None or (policy is not None and response.status_code in policy.statuses)
+            delay = _retry_delay(policy, method, url, attempt, reason, retry_after) if failed else None
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            attempt += 1
+        if error is not None:
+            raise error
+        self._check(response)
+        return response
+
+    async def _follow(self, method, url, body, headers):
+        for i in range(self.max_redirects + 1):
+            response = await self._send(method, url, body, headers)
+            if response.status_code not in (301, 302, 303, 307, 308) or 'Location' not in response.headers:
+                return response
+            url = urljoin(url, response.headers['Location'])
+            if response.status_code in (301, 302, 303) and method != 'GET':
+                method, body = 'GET', None
+                headers = dict((k, v) for k, v in headers.items() if k != 'Content-Type')
+        raise IOError('Exceeded %d redirects' % self.max_redirects)
+
+    def _semaphores(self, key):
+        if self._limit is None:
+            self._limit = asyncio.Semaphore(self.max_connections)
+        if key not in self._host_limits:
+            self._host_limits[key] = asyncio.Semaphore(self.max_per_host)
+        return self._limit, self._host_limits[key]
+
+    async def _send(self, method, url, body, headers):
+        parts = urlsplit(url)
+        secure = parts.scheme == 'https'
+        port = parts.port or (443 if secure else 80)
+        key = (parts.scheme, parts.hostname, port)
+        host = parts.hostname if parts.port is None else '%s:%d' % (parts.hostname, parts.port)
+        target = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+        proxy = self._proxy(url, key)
+        if proxy is not None and not secure:
+            # plain requests go to the proxy with absolute URLs, https ones through a tunnel
+            target = '%s://%s%s' % (parts.scheme, parts.netloc.rsplit('@', 1)[-1], target)
+
+        lines = ['%s %s HTTP/1.1' % (method, target), 'Host: %s' % host, 'User-Agent: %s' % USER_AGENT,
+                 'Accept-Encoding: gzip, deflate']
+        if proxy is not None and not secure and _proxy_authorization(proxy):
+            lines.append('Proxy-Authorization: %s' % _proxy_authorization(proxy))
+        lines.extend('%s: %s' % item for item in headers.items())
+        if body is not None:
+            lines.append('Content-Length: %d' % len(body))
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+        limit, host_limit = self._semaphores(key)
+        async with limit:
+            async with host_limit:
+                idle = self._idle.get(key)
+                while idle:
+                    reader, writer = idle.pop()
+                    try:
+                        return await self._exchange(key, url, reader, writer, method, head, body)
+                    except _StaleConnection:
+                        continue
+                reader, writer = await self._connect(parts.hostname, port, secure, proxy)
+                try:
+                    return await self._exchange(key, url, reader, writer, method, head, body)
+                except _StaleConnection:
+                    raise ConnectionError('Connection closed by %s' % host)
+
+    def _proxy(self, url, key):
+        """Split URL of the proxy to send url through, None to connect directly"""
+        if key not in self._proxy_urls:
+            proxies = dict(self.proxies)
+            if self.trust_env:
+                for scheme, proxy in requests.utils.get_environ_proxies(url).items():
+                    proxies.setdefault(scheme, proxy)
+            proxy = requests.utils.select_proxy(url, proxies)
+            if proxy:
+                proxy = urlsplit(proxy if '//' in proxy else 'http://' + proxy)
+                if proxy.scheme != 'http':
+                    raise ValueError('Only http:// proxies are supported, not %s' % proxy.geturl())
+            self._proxy_urls[key] = proxy or None
+        return self._proxy_urls[key]
+
+    async def _connect(self, hostname, port, secure, proxy):
+        """(reader, writer) of a new connection to hostname, through proxy if not None"""
+        context = (self.ssl_context or ssl.create_default_context()) if secure else None
+        if proxy is None:
+            return await asyncio.open_connection(hostname, port, ssl=context)
+        if not secure:
+            return await asyncio.open_connection(proxy.hostname, proxy.port or 80)
+        sock = await self._tunnel(proxy, hostname, port)
+        try:
+            return await asyncio.open_connection(sock=sock, ssl=context, server_hostname=hostname)
+        except BaseException:
+            sock.close()
+            raise
+
+    async def _tunnel(self, proxy, hostname, port):
+        """Socket connected to hostname:port through a CONNECT tunnel of proxy"""
+        loop = _running_loop()
+        family, kind, protocol, _, address = (await loop.getaddrinfo(proxy.hostname, proxy.port or 80,
+                                                                     type=socket.SOCK_STREAM))[0]
+        sock = socket.socket(family, kind, protocol)
+        sock.setblocking(False)
+        try:
+            await loop.sock_connect(sock, address)
+            lines = ['CONNECT %s:%d HTTP/1.1' % (hostname, port), 'Host: %s:%d' % (hostname, port)]
+            if _proxy_authorization(proxy):
+                lines.append('Proxy-Authorization: %s' % _proxy_authorization(proxy))
+            await loop.sock_sendall(sock, ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+            response = b''
+            while b'\r\n\r\n' not in response:
+                chunk = await loop.sock_recv(sock, 4096)
+                if not chunk:
+                    raise ConnectionError('Proxy %s closed the connection' % proxy.hostname)
+                response += chunk
+            status_line = response.split(b'\r\n', 1)[0].decode('latin-1')
+            if status_line.split(' ')[1:2] != ['200']:
+                raise ConnectionError('Proxy %s refused to connect to %s:%d: %s'
+                                      % (proxy.hostname, hostname, port, status_line))
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    async def _exchange(self, key, url, reader, writer, method, head, body):
+        """Send one request on a connection and read its response"""
+        keep = False
+        try:
+            writer.write(head + body if body else head)
+            try:
+                await writer.drain()
+                status_line = await reader.readline()
+            except ConnectionError:
+                raise _StaleConnection()
+            if not status_line:
+                raise _StaleConnection()
+            version, status, reason = (status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+            status = int(status)
+            headers = requests.structures.CaseInsensitiveDict()
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, value = line.decode('latin-1').split(':', 1)
+                headers[name.strip()] = value.strip()
+
+            if status in (204, 304) or 100 <= status < 200:
+                content = b''
+            elif headers.get('Transfer-Encoding', '').lower() == 'chunked':
+                chunks = []
+                while True:
+                    size = int((await reader.readline()).split(b';')[0], 16)
+                    if size == 0:
+                        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                            pass
+                        break
+                    chunks.append(await reader.readexactly(size))
+                    await reader.readexactly(2)
+                content = b''.join(chunks)
+            elif 'Content-Length' in headers:
+                content = await reader.readexactly(int(headers['Content-Length']))
+            else:
+                content = await reader.read()
+                headers['Connection'] = 'close'
+
+            encoding = headers.get('Content-Encoding', '').lower()
+            if encoding == 'gzip':
+                content = zlib.decompress(content, 16 + zlib.MAX_WBITS)
+            elif encoding == 'deflate':
+                try:
+                    content = zlib.decompress(content)
+                except zlib.error:
+                    content = zlib.decompress(content, -zlib.MAX_WBITS)
+
+            keep = version == 'HTTP/1.1' and headers.get('Connection', '').lower() != 'close'
+            return HTTPResponse(url, status, reason, headers, content)
+        finally:
+            # connections of failed or cancelled requests are not reused
+            idle = self._idle.setdefault(key, [])
+            if keep and len(idle) < self.max_per_host:
+                idle.append((reader, writer))
+            else:
+                writer.close()
+
+    def _check(self, response):
+        """Raise the errors openURL raises for response"""
+        if response.status_code in [400, 401]:
+            raise ServiceException(response.text)
+        if response.status_code in [404, 500, 502, 503, 504]:
+            raise requests.HTTPError('%d %s for url: %s' % (response.status_code, response.reason, response.url))
+        _check_exception_report(response.headers, response.content)
+
+
+class _AsyncService(object):
+    """Wraps a service object, whose attributes it shows as its own"""
+
+    def __init__(self, service, transport=None):
+        self.service = service
+        self._owns_transport = transport is None
+        self.transport = transport if transport is not None else AsyncTransport()
+
+    def __getattr__(self, name):
+        return getattr(self.service, name)
+
+    def __getitem__(self, name):
+        return self.service[name]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Close the transport, when it was created for this service"""
+        if self._owns_transport:
+            await self.transport.close()
+
+    @classmethod
+    async def _fetch_capabilities(cls, url, transport, username=None, password=None, timeout=None):
+        response = await transport.request('Get', url, username=username, password=password, timeout=timeout)
+        return response.read()
+
+
+class AsyncWebMapService(_AsyncService):
+    """Asynchronous GetMap of a WebMapService_1_1_1 or WebMapService_1_3_0"""
+
+    @classmethod
+    async def open(cls, url, version='1.1.1', transport=None, username=None, password=None, timeout=30):
+        """AsyncWebMapService of the capabilities at url, requested on transport"""
+        from owslib.map.common import WMSCapabilitiesReader
+        from owslib.wms import WebMapService
+        transport = transport if transport is not None else AsyncTransport()
+        xml = await cls._fetch_capabilities(WMSCapabilitiesReader(version).capabilities_url(url), transport,
+                                            username, password, timeout)
+        service = WebMapService(url, version=version, xml=xml, username=username, password=password,
+                                timeout=timeout)
+        wrapped = cls(service, transport)
+        wrapped._owns_transport = False
+        return wrapped
+
+    async def getmap(self, method='Get', timeout=None, bbox_crs=None, **kwargs):
+        """Image from the WMS as a file-like object, see WebMapService.getmap for the arguments"""
+        base_url, data = self.service._getmap_url(method=method, bbox_crs=bbox_crs, **kwargs)
+        response = await self.transport.request(method, base_url, data, username=self.service.username,
+                                                password=self.service.password,
+                                                timeout=timeout or self.service.timeout)
+        return self.service._check_getmap_response(response)
+
+
+class AsyncWebMapTileService(_AsyncService):
+    """Asynchronous GetTile of a WebMapTileService"""
+
+    @classmethod
+    async def open(cls, url, version='1.0.0', transport=None, username=None, password=None,
+                   vendor_kwargs=None, timeout=30):
+        """AsyncWebMapTileService of the capabilities at url, requested on transport"""
+        from owslib.wmts import WebMapTileService, WMTSCapabilitiesReader
+        transport = transport if transport is not None else AsyncTransport()
+        xml = await cls._fetch_capabilities(WMTSCapabilitiesReader(version).capabilities_url(url, vendor_kwargs),
+                                            transport, username, password, timeout)
+        service = WebMapTileService(url, version=version, xml=xml, username=username, password=password,
+                                    vendor_kwargs=vendor_kwargs)
+        wrapped = cls(service, transport)
+        wrapped._owns_transport = False
+        return wrapped
+
+    async def gettile(self, base_url=None, layer=None, style=None, format=None, tilematrixset=None,
+                      tilematrix=None, row=None, column=None, timeout=None, **kwargs):
+        """Tile image as a file-like object, see WebMapTileService.gettile for the arguments"""
+        url, data = self.service._gettile_url(base_url, layer, style, format, tilematrixset, tilematrix,
+                                              row, column, **kwargs)
+        response = await self.transport.request('Get', url, data, username=self.service.username,
+                                                password=self.service.password, timeout=timeout)
+        if self.service.restonly:
+            return response
+        return self.service._check_gettile_response(response)
+
+
+class AsyncWebFeatureService(_AsyncService):
+    """Asynchronous GetFeature (KVP) of a WFS 1.1.0 or 2.0.0 service"""
+
+    def __init__(self, service, transport=None):
+        if not hasattr(service, 'getGETGetFeatureRequest'):
+            raise NotImplementedError('Asynchronous GetFeature needs WFS 1.1.0 or 2.0.0, not %s' % service.version)
+        super(AsyncWebFeatureService, self).__init__(service, transport)
+
+    @classmethod
+    async def open(cls, url, version='1.1.0', transport=None, username=None, password=None, timeout=30):
+        """AsyncWebFeatureService of the capabilities at url, requested on transport"""
+        from owslib.feature.common import WFSCapabilitiesReader
+        from owslib.wfs import WebFeatureService
+        transport = transport if transport is not None else AsyncTransport()
+        xml = await cls._fetch_capabilities(WFSCapabilitiesReader(version).capabilities_url(url), transport,
+                                            username, password, timeout)
+        service = WebFeatureService(url, version=version, xml=xml, username=username, password=password,
+                                    timeout=timeout)
+        wrapped = cls(service, transport)
+        wrapped._owns_transport = False
+        return wrapped
+
+    async def getfeature(self, typename=None, filter=None, bbox=None, featureid=None, featureversion=None,
+                         propertyname=None, maxfeatures=None, storedQueryID=None, storedQueryParams=None,
+                         outputFormat=None, startindex=None, timeout=None):
+        """
+        Feature data as a file-like object, see WebFeatureService.getfeature
+        for the arguments.  Requests are sent with GET.
+        """
+        if typename and isinstance(typename, str):
+            typename = [typename]
+        url = self.service.getGETGetFeatureRequest(typename, filter, bbox, featureid, featureversion,
+                                                   propertyname, maxfeatures, storedQueryID,
+                                                   storedQueryParams or {}, outputFormat, 'Get', startindex)
+        response = await self.transport.request('Get', url, username=self.service.username,
+                                                password=self.service.password,
+                                                timeout=timeout or self.service.timeout)
+        # as in getfeature, small responses may be exception reports
+        if len(response.content) < 32000:
+            try:
+                tree = etree.fromstring(response.content)
+            except Exception:
+                return response
+            if tree.tag == '{%s}ServiceExceptionReport' % OGC_NAMESPACE:
+                raise ServiceException(str(tree.find('{%s}ServiceException' % OGC_NAMESPACE).text).strip())
+        return response
+
+
+class AsyncCatalogueServiceWeb(_AsyncService):
+    """
+    Asynchronous GetRecords and GetRecordById of a CatalogueServiceWeb.
+
+    The wrapped object is not changed: each request works on a copy of
+    it, returned with its request, response, results and records.
+    """
+
+    @classmethod
+    async def open(cls, url, lang='en-US', version='2.0.2', transport=None, username=None, password=None,
+                   timeout=10):
+        """AsyncCatalogueServiceWeb of the capabilities at url, requested on transport"""
+        from owslib.csw import CatalogueServiceWeb
+        transport = transport if transport is not None else AsyncTransport()
+        service = CatalogueServiceWeb(url, lang=lang, version=version, timeout=timeout, skip_caps=True,
+                                      username=username, password=password)
+        service.request = urlencode({'service': service.service, 'version': version, 'request': 'GetCapabilities'})
+        wrapped = cls(service, transport)
+        wrapped._owns_transport = False
+        await wrapped._invoke(service, 'getcapabilities')
+        service._parsecapabilities()
+        return wrapped
+
+    async def _invoke(self, csw, operation):
+        """Send csw.request as CatalogueServiceWeb._invoke does, on the transport"""
+        request_url = csw._requesturl(operation)
+        if isinstance(csw.request, str):  # GET KVP
+            csw.request = '%s%s' % (bind_url(request_url), csw.request)
+            response = await self.transport.request('Get', csw.request, username=csw.username,
+                                                    password=csw.password, timeout=csw.timeout)
+        else:
+            csw._serializerequest()
+            response = await self.transport.request('Post', request_url, csw.request,
+                                                    headers={'Content-Type': 'text/xml', 'Accept': 'text/xml',
+                                                             'Accept-Language': csw.lang},
+                                                    username=csw.username, password=csw.password,
+                                                    timeout=csw.timeout)
+        csw.response = response.read()
+        csw._parseresponse()
+
+    async def getrecords2(self, constraints=[], sortby=None, typenames='csw:Record', esn='summary',
+                          outputschema=None, format=None, startposition=0, maxrecords=10, cql=None, xml=None,
+                          resulttype='results'):
+        """CatalogueServiceWeb with the results and records of getrecords2, see it for the arguments"""
+        from owslib.csw import namespaces, outputformat
+        csw = copy.copy(self.service)
+        outputschema, esn = csw._buildgetrecords2(constraints, sortby, typenames, esn,
+                                                  outputschema or namespaces['csw'], format or outputformat,
+                                                  startposition, maxrecords, cql, xml, resulttype)
+        await self._invoke(csw, 'getrecords')
+        if csw.exceptionreport is None:
+            csw._parsesearchresults(outputschema, esn)
+        return csw
+
+    async def getrecordbyid(self, id=[], esn='full', outputschema=None, format=None):
+        """CatalogueServiceWeb with the records of getrecordbyid, see it for the arguments"""
+        from owslib.csw import namespaces, outputformat
+        csw = copy.copy(self.service)
+        outputschema = outputschema or namespaces['csw']
+        csw._buildgetrecordbyid(id, esn, outputschema, format or outputformat)
+        await self._invoke(csw, 'getrecordbyid')
+        if csw.exceptionreport is None:
+            csw.results = {}
+            csw.records = OrderedDict()
+            csw._parserecords(outputschema, esn)
+        return csw
@@ -18,8 +18,10 @@ try:
     from urllib import urlencode
 except ImportError:
     from urllib.parse import urlencode
+from owslib.instrumentation import instrumented, span
 from owslib.util import openURL, testXMLValue
 from owslib.crs import Crs
+from owslib.reproject import transform_bbox
 
 import logging
 from owslib.util import log
@@ -58,6 +60,13 @@ class WebCoverageService_1_0_0(WCSBase):
             err_message = str(se.text).strip()
             raise ServiceException(err_message, xml)
 
+        with span('WCS.build'):
+            self._buildMetadata()
+
+        WCSBase.__init__(self)
+
+    def _buildMetadata(self):
+        """Set up capabilities metadata objects."""
         # serviceIdentification metadata
         subelem = self._capabilities.find('wcs:Service', self.ns)
         self.identification = ServiceIdentification(subelem, self.ns, self.version)
@@ -82,8 +91,6 @@ class WebCoverageService_1_0_0(WCSBase):
                 cm = ContentMetadata(elem, self, self.ns, self.version)
                 self.contents[cm.id] = cm
 
-        WCSBase.__init__(self)
-
     def __makeString(self, value):
         # using repr unconditionally breaks things in some circumstances if a value is already a string
         if type(value) is not str:
@@ -92,11 +99,13 @@ class WebCoverageService_1_0_0(WCSBase):
             sval = value
         return sval
 
+    @instrumented('WCS.GetCoverage')
     def getCoverage(self, identifier=None, bbox=None, time=None, format=None, crs=None, width=None, height=None,
-                    resx=None, resy=None, resz=None, parameter=None, method='Get', **kwargs):
+                    resx=None, resy=None, resz=None, parameter=None, method='Get', bbox_crs=None, **kwargs):
         """Request and return a coverage from the WCS as a file-like object
         note: additional **kwargs helps with multi-version implementation
         core keyword arguments should be supported cross version
+        bbox_crs: CRS of bbox when it is not crs, the bbox is then reprojected to crs
         example:
         cvg=wcs.getCoverage(identifier=['TuMYrRQ4'], timeSequence=['2792-06-01T00:00:00.0'], bbox=(-112,36,-106,41),format='cf-netcdf')
 
@@ -124,6 +133,8 @@ class WebCoverageService_1_0_0(WCSBase):
         assert len(identifier) > 0
         request['Coverage'] = identifier
         # request['identifier'] = ','.join(identifier)
+        if bbox and bbox_crs is not None and crs:
+            bbox = transform_bbox(bbox_crs, crs, bbox)
         if bbox:
             request['BBox'] = ','.join([self.__makeString(x) for x in bbox])
         else:
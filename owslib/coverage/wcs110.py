@@ -14,6 +14,7 @@
 from __future__ import (absolute_import, division, print_function)
 
 from .wcsBase import WCSBase, ServiceException, WCSCapabilitiesReader, getNamespaces, ServiceIdentification, ServiceProvider, OperationMetadata, RectifiedGrid, Grid
+from owslib.instrumentation import instrumented, span
 from owslib.util import openURL
 
 try:
@@ -73,6 +74,13 @@ class WebCoverageService_1_1_0(WCSBase):
             err_message = str(se.text).strip()
             raise ServiceException(err_message, xml)
 
+        with span('WCS.build'):
+            self._buildMetadata()
+
+        WCSBase.__init__(self)
+
+    def _buildMetadata(self):
+        """Set up capabilities metadata objects."""
         # serviceIdentification metadata
         elem = self._capabilities.find('owcs:ServiceIdentification', self.ns)
         self.identification = ServiceIdentification(elem, self.ns, self.version)
@@ -96,9 +104,8 @@ class WebCoverageService_1_1_0(WCSBase):
                 self.contents = dict([(x.id, x) for x in cm])
                 break
 
-        WCSBase.__init__(self)
-
     # TO DO: Handle rest of the  WCS 1.1.0 keyword parameters e.g. GridCRS etc.
+    @instrumented('WCS.GetCoverage')
     def getCoverage(self, identifier=None, bbox=None, time=None, format=None, store=False, rangesubset=None,
                     gridbaseCRS=None, gridtype=None, gridCS=None, gridorigin=None, gridoffsets=None, method='Get',
                     **kwargs):
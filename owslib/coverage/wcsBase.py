@@ -16,14 +16,19 @@ try:
 except ImportError:
     from urllib.parse import urlencode
 from owslib.etree import etree
-import cgi
+from six.moves.urllib.parse import parse_qsl
 import abc
 import os
 import re
 import ast
+import threading
+import time
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-from owslib.util import openURL, testXMLValue
+from owslib.instrumentation import instrumented, span
+from owslib.util import openURL, testXMLValue, log
 
 class ServiceException(Exception):
     """WCS ServiceException
@@ -41,6 +46,58 @@ class ServiceException(Exception):
         return repr(self.message)
 
 
+class DescribeCoverageCache(object):
+    """Thread-safe store of DescribeCoverage documents shared by all WCS service objects.
+
+    Entries are keyed by (service url, version, updateSequence, coverage identifier), so a
+    capabilities document with a new updateSequence never picks up stale descriptions.
+    Without an updateSequence there is no such signal, so those entries expire ttl seconds
+    after they were stored.  Beyond max_entries the least recently used entries are evicted.
+    """
+
+    def __init__(self, max_entries=1024, ttl=3600, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._store = OrderedDict()    # key -> (expiry time or None, document)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] <= self.clock():
+                del self._store[key]
+                return None
+            # most recently used last
+            self._store[key] = self._store.pop(key)
+            return entry[1]
+
+    def put(self, key, value):
+        expiry = self.clock() + self.ttl if key[2] is None else None
+        with self._lock:
+            self._store.pop(key, None)
+            self._store[key] = (expiry, value)
+            while len(self._store) > self.max_entries:
+                self._store.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._store)
+
+
+# cache for DescribeCoverage responses, shared across service instances
+describe_coverage_cache = DescribeCoverageCache()
+
+
 class WCSBase(object):
     """
     Base class to be subclassed by version dependent WCS classes. Provides 'high-level' version independent methods
@@ -80,15 +137,78 @@ class WCSBase(object):
         else:
             raise KeyError("No content named %s" % name)
 
+    def _describeCoverageKey(self, identifier):
+        return (self.url, self.version, self.updateSequence, identifier)
+
     def getDescribeCoverage(self, identifier):
         """
-        returns a describe coverage document - checks the internal cache to see if it has been fetched before
+        returns a describe coverage document - checks the internal cache and the shared
+        describe_coverage_cache to see if it has been fetched before
         """
         if identifier not in self._describeCoverage.keys():
-            reader = DescribeCoverageReader(self.version, identifier, self.cookies)
-            self._describeCoverage[identifier] = reader.read(self.url)
+            key = self._describeCoverageKey(identifier)
+            tree = describe_coverage_cache.get(key)
+            if tree is None:
+                reader = DescribeCoverageReader(self.version, identifier, self.cookies)
+                tree = reader.read(self.url)
+                describe_coverage_cache.put(key, tree)
+            self._describeCoverage[identifier] = tree
         return self._describeCoverage[identifier]
 
+    def describeCoverages(self, identifiers=None, batch=True, max_workers=4, timeout=30):
+        """
+        prefetch DescribeCoverage documents for many coverages at once and store them in the caches
+
+        @type identifiers: list
+        @param identifiers: coverage identifiers, defaults to all coverages in contents
+        @type batch: bool
+        @param batch: request all missing coverages as one comma separated DescribeCoverage request first
+        @type max_workers: int
+        @param max_workers: number of concurrent requests used when a batch request is not supported
+        @rtype: dict
+        @return: describe coverage documents keyed by identifier
+        """
+        if identifiers is None:
+            identifiers = list(self.contents.keys())
+
+        result = {}
+        missing = []
+        for identifier in identifiers:
+            tree = self._describeCoverage.get(identifier)
+            if tree is None:
+                tree = describe_coverage_cache.get(self._describeCoverageKey(identifier))
+            if tree is None:
+                missing.append(identifier)
+            else:
+                result[identifier] = tree
+
+        if batch and len(missing) > 1:
+            reader = DescribeCoverageReader(self.version, ','.join(missing), self.cookies)
+            try:
+                descriptions = splitDescribeCoverage(reader.read(self.url, timeout=timeout), self.ns, self.version)
+            except Exception as err:
+                log.debug('WCS %s DEBUG: batch DescribeCoverage failed, falling back to single requests: %s'
+                          % (self.version, err))
+                descriptions = {}
+            for identifier in missing:
+                if identifier in descriptions:
+                    result[identifier] = descriptions[identifier]
+                    describe_coverage_cache.put(self._describeCoverageKey(identifier), descriptions[identifier])
+            missing = [identifier for identifier in missing if identifier not in descriptions]
+
+        def fetch(identifier):
+            reader = DescribeCoverageReader(self.version, identifier, self.cookies)
+            return identifier, reader.read(self.url, timeout=timeout)
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+                for identifier, tree in executor.map(fetch, missing):
+                    result[identifier] = tree
+                    describe_coverage_cache.put(self._describeCoverageKey(identifier), tree)
+
+        self._describeCoverage.update(result)
+        return result
+
     @abc.abstractmethod
     def getCoverage(self):
         raise NotImplementedError
@@ -151,7 +271,7 @@ class WCSCapabilitiesReader(object):
         """
         qs = []
         if service_url.find('?') != -1:
-            qs = cgi.parse_qsl(service_url.split('?')[1])
+            qs = parse_qsl(service_url.split('?')[1])
 
         params = [x[0] for x in qs]
 
@@ -165,6 +285,7 @@ class WCSCapabilitiesReader(object):
         urlqs = urlencode(tuple(qs))
         return service_url.split('?')[0] + '?' + urlqs
 
+    @instrumented('WCS.GetCapabilities')
     def read(self, service_url, timeout=30):
         """Get and parse a WCS capabilities document, returning an
         elementtree tree
@@ -177,7 +298,8 @@ class WCSCapabilitiesReader(object):
         """
         request = self.capabilities_url(service_url)
         u = openURL(request, timeout=timeout, cookies=self.cookies)
-        return etree.fromstring(u.read())
+        with span('WCS.parse'):
+            return etree.fromstring(u.read())
 
     def readString(self, st):
         """Parse a WCS capabilities document, returning an
@@ -210,7 +332,7 @@ class DescribeCoverageReader(object):
         """
         qs = []
         if service_url.find('?') != -1:
-            qs = cgi.parse_qsl(service_url.split('?')[1])
+            qs = parse_qsl(service_url.split('?')[1])
 
         params = [x[0] for x in qs]
 
@@ -234,6 +356,7 @@ class DescribeCoverageReader(object):
         urlqs = urlencode(tuple(qs))
         return service_url.split('?')[0] + '?' + urlqs
 
+    @instrumented('WCS.DescribeCoverage')
     def read(self, service_url, timeout=30):
         """Get and parse a Describe Coverage document, returning an
         elementtree tree
@@ -249,6 +372,31 @@ class DescribeCoverageReader(object):
         return etree.fromstring(u.read())
 
 
+def splitDescribeCoverage(tree, nmSpc, version):
+    """
+    split a DescribeCoverage document describing several coverages into one document per coverage
+
+    @type tree: elementtree tree
+    @param tree: DescribeCoverage response
+    @rtype: dict
+    @return: single coverage DescribeCoverage documents keyed by identifier
+    """
+    if version == '1.0.0':
+        member, idpath = 'wcs:CoverageOffering', 'wcs:name'
+    else:
+        member, idpath = 'wcs:CoverageDescription', 'wcs:Identifier'
+
+    descriptions = {}
+    for elem in tree.findall(member, nmSpc):
+        identifier = testXMLValue(elem.find(idpath, nmSpc))
+        if identifier is None:
+            continue
+        root = etree.Element(tree.tag, dict(tree.attrib))
+        root.append(elem)
+        descriptions[identifier] = root
+    return descriptions
+
+
 class ServiceIdentification(object):
     """
     Abstraction for WCS ServiceIdentification Metadata
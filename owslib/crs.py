@@ -7,10 +7,22 @@
 # Contact email: tomkralidis@gmail.com
 # =============================================================================
 
-""" API for OGC CRS constructs. """
+""" API for OGC CRS constructs.
+
+The axis order of a CRS is looked up in a table of 'AUTHORITY:code' keys.
+Missing entries are resolved once from the pyproj CRS database, for any
+authority pyproj knows; the hardcoded EPSG list below is the fallback for
+codes pyproj cannot resolve.  The table can be filled for a whole authority
+with build_axisorder_table() and kept with save_axisorder_table(), so
+later sessions load it with load_axisorder_table() without touching
+pyproj.  set_axisorder() overrides the order of a code.
+"""
 
 from __future__ import (absolute_import, division, print_function)
 
+import json
+import threading
+
 # list of URN codes for EPSG in which axis order
 # of coordinates are y,x (e.g. lat, long)
 axisorder_yx = frozenset([
@@ -1719,6 +1731,103 @@ axisorder_yx = frozenset([
     31700
 ])
 
+# 'AUTHORITY:code' -> 'xy' or 'yx'
+axisorder_table = {}
+# 'AUTHORITY:code' -> 'xy' or 'yx', set through set_axisorder, wins over the table
+axisorder_overrides = {}
+
+_table_lock = threading.Lock()
+
+
+def _key(authority, code):
+    return '%s:%s' % ((authority or 'EPSG').upper(), code)
+
+
+def _resolve_axisorder(authority, code):
+    """Axis order of a CRS from the pyproj database, None if pyproj does not know it"""
+    try:
+        import pyproj
+        crs = pyproj.CRS.from_authority((authority or 'EPSG').upper(), str(code))
+    except Exception:
+        return None
+    if crs.axis_info and crs.axis_info[0].direction in ('north', 'south'):
+        return 'yx'
+    return 'xy'
+
+
+def get_axisorder(authority, code):
+    """
+    Axis order ('xy' or 'yx') of the authority:code CRS, EPSG when
+    authority is None.  Overrides come first, then the table; codes missing
+    from it are resolved from pyproj and added to it.
+    """
+    key = _key(authority, code)
+    order = axisorder_overrides.get(key) or axisorder_table.get(key)
+    if order is None:
+        order = _resolve_axisorder(authority, code)
+        if order is None:
+            legacy = (authority or 'EPSG').upper() == 'EPSG' and code in axisorder_yx
+            order = 'yx' if legacy else 'xy'
+        axisorder_table[key] = order
+    return order
+
+
+def set_axisorder(authority, code, axisorder):
+    """
+    Override the axis order of the authority:code CRS, or remove the
+    override with axisorder=None.  Crs objects built afterwards use it.
+    """
+    key = _key(authority, code)
+    if axisorder is None:
+        axisorder_overrides.pop(key, None)
+    elif axisorder not in ('xy', 'yx'):
+        raise ValueError("axisorder must be 'xy' or 'yx', not %r" % axisorder)
+    else:
+        axisorder_overrides[key] = axisorder
+    clear_cache()
+
+
+def build_axisorder_table(authority='EPSG'):
+    """
+    Resolve the axis order of every CRS of authority in the pyproj database
+    into the table (a second or two for EPSG).  Returns the number of codes.
+    """
+    import pyproj
+    codes = pyproj.get_codes(authority, 'CRS')
+    table = {}
+    for code in codes:
+        order = _resolve_axisorder(authority, code)
+        if order is not None:
+            table[_key(authority, code)] = order
+    with _table_lock:
+        axisorder_table.update(table)
+    return len(table)
+
+
+def save_axisorder_table(path):
+    """Write the table to path, as JSON"""
+    with _table_lock:
+        table = dict(axisorder_table)
+    with open(path, 'w') as f:
+        json.dump(table, f, sort_keys=True, separators=(',', ':'))
+
+
+def load_axisorder_table(path):
+    """Add the entries of a table written by save_axisorder_table"""
+    with open(path) as f:
+        table = json.load(f)
+    with _table_lock:
+        axisorder_table.update(table)
+    clear_cache()
+    return len(table)
+
+
+# number of distinct (crs string, axisorder) instances kept before the registry is emptied
+CACHE_SIZE = 4096
+
+_registry = {}
+
+
 class Crs(object):
     """Initialize a CRS construct
 
@@ -1730,68 +1839,122 @@ class Crs(object):
           * urn:ogc:def:crs:EPSG::4326
           * urn:ogc:def:crs:EPSG:4326
         :param string axisorder: Force / override axisorder ('xy' or 'yx')
+
+        Instances are immutable and shared: constructing a Crs from a string
+        seen before returns the same object, with its code, urn and uri
+        strings computed once.
     """
+
+    __slots__ = ('id', 'naming_authority', 'category', 'type', 'authority', 'version', 'code',
+                 'axisorder', 'encoding', '_axisorder', '_code', '_urn', '_uri1', '_uri2', '_hash')
+
+    def __new__(cls, crs, axisorder=None):
+        key = (cls, crs, axisorder)
+        try:
+            return _registry[key]
+        except KeyError:
+            pass
+        except TypeError:   # unhashable, let the parser complain
+            key = None
+
+        self = object.__new__(cls)
+        self._parse(crs, axisorder)
+        if key is not None:
+            if len(_registry) >= CACHE_SIZE:
+                _registry.clear()
+            self = _registry.setdefault(key, self)
+        return self
+
     def __init__(self, crs, axisorder=None):
-        self.id = crs
-        self.naming_authority = None
-        self.category = None
-        self.type = None
-        self.authority = None
-        self.version = None
-        self.code = -1
-        self.axisorder = 'xy'
-        self.encoding = "code"
-
-        if axisorder is not None:  # forced axisorder
-            self.axisorder = axisorder
-
-        values = self.id.split(':')
-
-        if self.id.find('/def/crs/') != -1: # URI Style 1
-            self.encoding = "uri"
-            vals = self.id.split('/')
-            self.authority = vals[5].upper()
-            self.code = int(vals[-1])
-        elif self.id.find('#') != -1:  # URI Style 2
-            self.encoding = "uri"
-            vals = self.id.split('#')
-            self.authority = vals[0].split('/')[-1].split('.')[0].upper()
-            self.code = int(vals[-1])
+        # parsed once, in __new__
+        pass
+
+    def _parse(self, crs, axisorder):
+        init = object.__setattr__
+        naming_authority = None
+        category = None
+        type = None
+        authority = None
+        version = None
+        code = -1
+        encoding = "code"
+
+        values = crs.split(':')
+
+        if crs.find('/def/crs/') != -1: # URI Style 1
+            encoding = "uri"
+            vals = crs.split('/')
+            authority = vals[5].upper()
+            code = int(vals[-1])
+        elif crs.find('#') != -1:  # URI Style 2
+            encoding = "uri"
+            vals = crs.split('#')
+            authority = vals[0].split('/')[-1].split('.')[0].upper()
+            code = int(vals[-1])
         elif len(values) > 2:  # it's a URN style
-            self.naming_authority = values[1]
-            self.encoding = "urn"
+            naming_authority = values[1]
+            encoding = "urn"
 
             if len(values) == 3:  # bogus
                 pass
             elif len(values) == 4:
-                self.type = values[2]
+                type = values[2]
             else:
-                self.category = values[2]
-                self.type = values[3]
-                self.authority = values[4].upper()
+                category = values[2]
+                type = values[3]
+                authority = values[4].upper()
 
             if len(values) == 7:  # version, even if empty, is included
                 if values[5]:
-                    self.version = values[5]
+                    version = values[5]
 
             # code is always the last value
             try:
-                self.code = int(values[-1])
+                code = int(values[-1])
             except:
-                self.code = values[-1]
+                code = values[-1]
 
         elif len(values) == 2:  # it's an authority:code code
-            self.encoding = "code"
-            self.authority = values[0].upper()
-            self.code = int(values[1])
+            encoding = "code"
+            authority = values[0].upper()
+            code = int(values[1])
 
         # if the user has not forced the axisorder,
-        # scan the list of codes that have an axis ordering of
-        # yx and set axis order accordingly
+        # look up the axis order of the code
         if axisorder is None:
-            if self.code in axisorder_yx:
-                self.axisorder = 'yx'
+            init(self, 'axisorder', get_axisorder(authority, code) if code not in (None, -1, '') else 'xy')
+        else:  # forced axisorder
+            init(self, 'axisorder', axisorder)
+
+        for name, value in (('id', crs), ('naming_authority', naming_authority), ('category', category),
+                            ('type', type), ('authority', authority), ('version', version), ('code', code),
+                            ('encoding', encoding), ('_axisorder', axisorder)):
+            init(self, name, value)
+
+        init(self, '_code', '%s:%s' % (authority, code) if authority is not None and code is not None else None)
+        init(self, '_urn', 'urn:%s:def:crs:%s:%s:%s' % (
+                               (naming_authority and naming_authority or "ogc"),
+                               (authority or ""),
+                               (version or ""),
+                               (code or "")))
+        init(self, '_uri1', 'http://www.opengis.net/def/crs/EPSG/0/%s' % code)
+        init(self, '_uri2', 'http://www.opengis.net/gml/srs/epsg.xml#%s' % code)
+        init(self, '_hash', hash(self._urn))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Crs objects are immutable and shared, create a new one instead')
+
+    __delattr__ = __setattr__
+
+    def __reduce__(self):
+        # unpickled instances are interned too
+        return (self.__class__, (self.id, self._axisorder))
 
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def getcode(self):
         """Create for example "EPSG:4326" string and return back
@@ -1799,9 +1962,7 @@ class Crs(object):
         :returns: String code formated in "authority:code"
         """
 
-        if self.authority is not None and self.code is not None:
-            return '%s:%s' % (self.authority, self.code)
-        return None
+        return self._code
 
     def getcodeurn(self):
         """Create for example "urn:ogc:def:crs:EPSG::4326" string and return back
@@ -1809,11 +1970,7 @@ class Crs(object):
         :returns: String code formated in "urn:ogc:def:authority:code"
         """
 
-        return 'urn:%s:def:crs:%s:%s:%s' % (
-                    (self.naming_authority and self.naming_authority or "ogc"),
-                                    (self.authority or ""),
-                                    (self.version or ""),
-                                    (self.code or ""))
+        return self._urn
 
     def getcodeuri1(self):
         """Create for example "http://www.opengis.net/def/crs/EPSG/0/4326"
@@ -1822,7 +1979,7 @@ class Crs(object):
         :returns: String code formated in "http://www.opengis.net/def/crs/EPSG/0/code"
         """
 
-        return 'http://www.opengis.net/def/crs/EPSG/0/%s' % self.code
+        return self._uri1
 
     def getcodeuri2(self):
         """Create for example "http://www.opengis.net/gml/srs/epsg.xml#4326"
@@ -1831,16 +1988,26 @@ class Crs(object):
         :returns: String code formated in "http://www.opengis.net/gml/srs/epsg.xml#code"
         """
 
-        return 'http://www.opengis.net/gml/srs/epsg.xml#%s' % self.code
+        return self._uri2
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, self.__class__):
-            return self.getcodeurn() == other.getcodeurn()
+            return self._hash == other._hash and self._urn == other._urn
         else:
             return False
 
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
 
     def __repr__(self):
-        return self.getcodeurn()
+        return self._urn
+
+
+def clear_cache():
+    """Empty the registry of shared Crs instances"""
+    _registry.clear()
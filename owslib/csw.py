@@ -24,16 +24,13 @@ try:                    # Python 3
 except ImportError:     # Python 2
     from urllib import urlencode
 
+from owslib.instrumentation import instrumented, span
 from owslib.util import OrderedDict
 
 from owslib.etree import etree
 from owslib import fes
 from owslib import util
 from owslib import ows
-from owslib.iso import MD_Metadata
-from owslib.fgdc import Metadata
-from owslib.dif import DIF
-from owslib.gm03 import GM03
 from owslib.namespaces import Namespaces
 from owslib.util import cleanup_namespaces, bind_url, add_namespaces, openURL
 
@@ -85,38 +82,45 @@ class CatalogueServiceWeb(object):
 
             self.request = urlencode(data)
     
-            self._invoke()
-    
+            with span('CSW.GetCapabilities'):
+                self._invoke()
+
             if self.exceptionreport is None:
-                self.updateSequence = self._exml.getroot().attrib.get('updateSequence')
+                with span('CSW.build'):
+                    self._parsecapabilities()
+
+    def _parsecapabilities(self):
+        """ build the capabilities metadata from the GetCapabilities response in self._exml """
+
+        self.updateSequence = self._exml.getroot().attrib.get('updateSequence')
+
+        # ServiceIdentification
+        val = self._exml.find(util.nspath_eval('ows:ServiceIdentification', namespaces))
+        if val is not None:
+          self.identification = ows.ServiceIdentification(val,self.owscommon.namespace)
+        else:
+          self.identification = None
+        # ServiceProvider
+        val = self._exml.find(util.nspath_eval('ows:ServiceProvider', namespaces))
+        if val is not None:
+            self.provider = ows.ServiceProvider(val,self.owscommon.namespace)
+        else:
+          self.provider = None
+        # ServiceOperations metadata
+        self.operations = []
+        for elem in self._exml.findall(util.nspath_eval('ows:OperationsMetadata/ows:Operation', namespaces)):
+            self.operations.append(ows.OperationsMetadata(elem, self.owscommon.namespace))
+        self.constraints = {}
+        for elem in self._exml.findall(util.nspath_eval('ows:OperationsMetadata/ows:Constraint', namespaces)):
+            self.constraints[elem.attrib['name']] = ows.Constraint(elem, self.owscommon.namespace)
+        self.parameters = {}
+        for elem in self._exml.findall(util.nspath_eval('ows:OperationsMetadata/ows:Parameter', namespaces)):
+            self.parameters[elem.attrib['name']] = ows.Parameter(elem, self.owscommon.namespace)
+
+        # FilterCapabilities
+        val = self._exml.find(util.nspath_eval('ogc:Filter_Capabilities', namespaces))
+        self.filters = fes.FilterCapabilities(val)
 
-                # ServiceIdentification
-                val = self._exml.find(util.nspath_eval('ows:ServiceIdentification', namespaces))
-                if val is not None:
-                  self.identification = ows.ServiceIdentification(val,self.owscommon.namespace)
-                else:
-                  self.identification = None
-                # ServiceProvider
-                val = self._exml.find(util.nspath_eval('ows:ServiceProvider', namespaces))
-                if val is not None:
-                    self.provider = ows.ServiceProvider(val,self.owscommon.namespace)
-                else:
-                  self.provider = None
-                # ServiceOperations metadata 
-                self.operations = []
-                for elem in self._exml.findall(util.nspath_eval('ows:OperationsMetadata/ows:Operation', namespaces)):
-                    self.operations.append(ows.OperationsMetadata(elem, self.owscommon.namespace))
-                self.constraints = {}
-                for elem in self._exml.findall(util.nspath_eval('ows:OperationsMetadata/ows:Constraint', namespaces)):
-                    self.constraints[elem.attrib['name']] = ows.Constraint(elem, self.owscommon.namespace)
-                self.parameters = {}
-                for elem in self._exml.findall(util.nspath_eval('ows:OperationsMetadata/ows:Parameter', namespaces)):
-                    self.parameters[elem.attrib['name']] = ows.Parameter(elem, self.owscommon.namespace)
-        
-                # FilterCapabilities
-                val = self._exml.find(util.nspath_eval('ogc:Filter_Capabilities', namespaces))
-                self.filters = fes.FilterCapabilities(val)
- 
     def describerecord(self, typename='csw:Record', format=outputformat):
         """
 
@@ -188,6 +192,7 @@ class CatalogueServiceWeb(object):
             for f in self._exml.findall(util.nspath_eval('csw:DomainValues/csw:ListOfValues/csw:Value', namespaces)):
                 self.results['values'].append(util.testXMLValue(f))
 
+    @instrumented('CSW.GetRecords')
     def getrecords(self, qtype=None, keywords=[], typenames='csw:Record', propertyname='csw:AnyText', bbox=None, esn='summary', sortby=None, outputschema=namespaces['csw'], format=outputformat, startposition=0, maxrecords=10, cql=None, xml=None, resulttype='results'):
         """
 
@@ -270,6 +275,7 @@ class CatalogueServiceWeb(object):
 
             self._parserecords(outputschema, esn)
 
+    @instrumented('CSW.GetRecordById')
     def getrecordbyid(self, id=[], esn='full', outputschema=namespaces['csw'], format=outputformat):
         """
 
@@ -285,6 +291,18 @@ class CatalogueServiceWeb(object):
 
         """
 
+        self._buildgetrecordbyid(id, esn, outputschema, format)
+
+        self._invoke('getrecordbyid')
+
+        if self.exceptionreport is None:
+            self.results = {}
+            self.records = OrderedDict()
+            self._parserecords(outputschema, esn)
+
+    def _buildgetrecordbyid(self, id, esn, outputschema, format):
+        """ set self.request to the GetRecordById request of getrecordbyid """
+
         # construct request
         data = {
             'service': self.service,
@@ -298,13 +316,7 @@ class CatalogueServiceWeb(object):
 
         self.request = urlencode(data)
 
-        self._invoke()
-
-        if self.exceptionreport is None:
-            self.results = {}
-            self.records = OrderedDict()
-            self._parserecords(outputschema, esn)
-
+    @instrumented('CSW.GetRecords')
     def getrecords2(self, constraints=[], sortby=None, typenames='csw:Record', esn='summary', outputschema=namespaces['csw'], format=outputformat, startposition=0, maxrecords=10, cql=None, xml=None, resulttype='results'):
         """
 
@@ -327,6 +339,18 @@ class CatalogueServiceWeb(object):
 
         """
 
+        outputschema, esn = self._buildgetrecords2(constraints, sortby, typenames, esn, outputschema, format,
+                                                   startposition, maxrecords, cql, xml, resulttype)
+
+        self._invoke('getrecords')
+
+        if self.exceptionreport is None:
+            self._parsesearchresults(outputschema, esn)
+
+    def _buildgetrecords2(self, constraints, sortby, typenames, esn, outputschema, format, startposition,
+                          maxrecords, cql, xml, resulttype):
+        """ set self.request to the GetRecords request of getrecords2, return its (outputschema, esn) """
+
         if xml is not None:
             self.request = etree.fromstring(xml)
             val = self.request.find(util.nspath_eval('csw:Query/csw:ElementSetName', namespaces))
@@ -373,30 +397,32 @@ class CatalogueServiceWeb(object):
 
             self.request = node0
 
-        self._invoke()
- 
-        if self.exceptionreport is None:
-            self.results = {}
-    
-            # process search results attributes
-            val = self._exml.find(util.nspath_eval('csw:SearchResults', namespaces)).attrib.get('numberOfRecordsMatched')
-            self.results['matches'] = int(util.testXMLValue(val, True))
-            val = self._exml.find(util.nspath_eval('csw:SearchResults', namespaces)).attrib.get('numberOfRecordsReturned')
-            self.results['returned'] = int(util.testXMLValue(val, True))
-            val = self._exml.find(util.nspath_eval('csw:SearchResults', namespaces)).attrib.get('nextRecord')
-            if val is not None:
-                 self.results['nextrecord'] = int(util.testXMLValue(val, True))
-            else:
-                warnings.warn("""CSW Server did not supply a nextRecord value (it is optional), so the client
-                should page through the results in another way.""")
-                # For more info, see:
-                # https://github.com/geopython/OWSLib/issues/100
-                self.results['nextrecord'] = None
+        return outputschema, esn
 
-            # process list of matching records
-            self.records = OrderedDict()
+    def _parsesearchresults(self, outputschema, esn):
+        """ set self.results and self.records from the GetRecords response in self._exml """
 
-            self._parserecords(outputschema, esn)
+        self.results = {}
+
+        # process search results attributes
+        val = self._exml.find(util.nspath_eval('csw:SearchResults', namespaces)).attrib.get('numberOfRecordsMatched')
+        self.results['matches'] = int(util.testXMLValue(val, True))
+        val = self._exml.find(util.nspath_eval('csw:SearchResults', namespaces)).attrib.get('numberOfRecordsReturned')
+        self.results['returned'] = int(util.testXMLValue(val, True))
+        val = self._exml.find(util.nspath_eval('csw:SearchResults', namespaces)).attrib.get('nextRecord')
+        if val is not None:
+             self.results['nextrecord'] = int(util.testXMLValue(val, True))
+        else:
+            warnings.warn("""CSW Server did not supply a nextRecord value (it is optional), so the client
+            should page through the results in another way.""")
+            # For more info, see:
+            # https://github.com/geopython/OWSLib/issues/100
+            self.results['nextrecord'] = None
+
+        # process list of matching records
+        self.records = OrderedDict()
+
+        self._parserecords(outputschema, esn)
 
     def transaction(self, ttype=None, typename='csw:Record', record=None, propertyname=None, propertyvalue=None, bbox=None, keywords=[], cql=None, identifier=None):
         """
@@ -543,21 +569,25 @@ class CatalogueServiceWeb(object):
 
     def _parserecords(self, outputschema, esn):
         if outputschema == namespaces['gmd']: # iso 19139
+            from owslib.iso import MD_Metadata
             for i in self._exml.findall('.//'+util.nspath_eval('gmd:MD_Metadata', namespaces)) or self._exml.findall('.//'+util.nspath_eval('gmi:MI_Metadata', namespaces)):
                 val = i.find(util.nspath_eval('gmd:fileIdentifier/gco:CharacterString', namespaces))
                 identifier = self._setidentifierkey(util.testXMLValue(val))
                 self.records[identifier] = MD_Metadata(i)
         elif outputschema == namespaces['fgdc']: # fgdc csdgm
+            from owslib.fgdc import Metadata
             for i in self._exml.findall('.//metadata'):
                 val = i.find('idinfo/datasetid')
                 identifier = self._setidentifierkey(util.testXMLValue(val))
                 self.records[identifier] = Metadata(i)
         elif outputschema == namespaces['dif']: # nasa dif
+            from owslib.dif import DIF
             for i in self._exml.findall('.//'+util.nspath_eval('dif:DIF', namespaces)):
                 val = i.find(util.nspath_eval('dif:Entry_ID', namespaces))
                 identifier = self._setidentifierkey(util.testXMLValue(val))
                 self.records[identifier] = DIF(i)
         elif outputschema == namespaces['gm03']: # GM03
+            from owslib.gm03 import GM03
             for i in self._exml.findall('.//'+util.nspath_eval('gm03:TRANSFER', namespaces)):
                 val = i.find(util.nspath_eval('gm03:fileIdentifier', namespaces))
                 identifier = self._setidentifierkey(util.testXMLValue(val))
@@ -617,9 +647,23 @@ class CatalogueServiceWeb(object):
                 flt = fes.FilterRequest()
                 node0.append(flt.set(qtype=qtype, keywords=keywords, propertyname=propertyname,bbox=bbox))
     
-    def _invoke(self):
+    def _invoke(self, operation=None):
         # do HTTP request
 
+        request_url = self._requesturl(operation or inspect.stack()[1][3])
+
+        if isinstance(self.request, six.string_types):  # GET KVP
+            self.request = '%s%s' % (bind_url(request_url), self.request)
+            self.response = openURL(self.request, None, 'Get', username=self.username, password=self.password, timeout=self.timeout).read()
+        else:
+            self._serializerequest()
+            self.response = util.http_post(request_url, self.request, self.lang, self.timeout, self.username, self.password)
+
+        self._parseresponse()
+
+    def _requesturl(self, caller):
+        """ URL of the operation caller for self.request, from the capabilities when known """
+
         request_url = self.url
 
         # Get correct URL based on Operation list.
@@ -627,7 +671,6 @@ class CatalogueServiceWeb(object):
         # If skip_caps=True, then self.operations has not been set, so use
         # default URL.
         if hasattr(self, 'operations'):
-            caller = inspect.stack()[1][3]
             if caller == 'getrecords2': caller = 'getrecords'
             try:
                 op = self.get_operation_by_name(caller)
@@ -653,27 +696,30 @@ class CatalogueServiceWeb(object):
             except:  # no such luck, just go with request_url
                 pass
 
-        if isinstance(self.request, six.string_types):  # GET KVP
-            self.request = '%s%s' % (bind_url(request_url), self.request)
-            self.response = openURL(self.request, None, 'Get', username=self.username, password=self.password, timeout=self.timeout).read()
-        else:
-            self.request = cleanup_namespaces(self.request)
-            # Add any namespaces used in the "typeNames" attribute of the
-            # csw:Query element to the query's xml namespaces.
-            for query in self.request.findall(util.nspath_eval('csw:Query', namespaces)):
-                ns = query.get("typeNames", None)
-                if ns is not None:
-                    # Pull out "gmd" from something like "gmd:MD_Metadata" from the list
-                    # of typenames
-                    ns_keys = [x.split(':')[0] for x in ns.split(' ')]
-                    self.request = add_namespaces(self.request, ns_keys)
-
-            self.request = util.element_to_string(self.request, encoding='utf-8')
+        return request_url
 
-            self.response = util.http_post(request_url, self.request, self.lang, self.timeout, self.username, self.password)
+    def _serializerequest(self):
+        """ replace the request element in self.request with the XML document to POST """
+
+        self.request = cleanup_namespaces(self.request)
+        # Add any namespaces used in the "typeNames" attribute of the
+        # csw:Query element to the query's xml namespaces.
+        for query in self.request.findall(util.nspath_eval('csw:Query', namespaces)):
+            ns = query.get("typeNames", None)
+            if ns is not None:
+                # Pull out "gmd" from something like "gmd:MD_Metadata" from the list
+                # of typenames
+                ns_keys = [x.split(':')[0] for x in ns.split(' ')]
+                self.request = add_namespaces(self.request, ns_keys)
+
+        self.request = util.element_to_string(self.request, encoding='utf-8')
+
+    def _parseresponse(self):
+        """ parse self.response into self._exml, raising exception reports """
 
         # parse result see if it's XML
-        self._exml = etree.parse(BytesIO(self.response))
+        with span('CSW.parse'):
+            self._exml = etree.parse(BytesIO(self.response))
 
         # it's XML.  Attempt to decipher whether the XML response is CSW-ish """
         valid_xpaths = [
@@ -0,0 +1,190 @@
+# -*- coding: ISO-8859-15 -*-
+# =============================================================================
+# OWSLib. Copyright (C) 2005 Sean C. Gillies
+#
+# Contact email: sgillies@frii.com
+# =============================================================================
+
+"""
+Date and time parsing shared by the OWSLib parsers.
+
+Strict ISO-8601 strings (the overwhelming majority in OGC responses) are
+handled by a precompiled regular expression; anything else falls back to
+dateutil.  Results are cached, since documents repeat the same positions
+(begin/end times, result times) over and over.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import re
+from datetime import datetime
+from dateutil import parser
+from dateutil.tz import tzutc, tzoffset
+
+from owslib.lazy import LazyModule
+
+# numpy is optional, and imported on first use
+np = LazyModule('numpy', optional=True)
+
+ISO8601 = re.compile(
+    r'^\s*(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d+))?)?)?'
+    r'\s*(Z|[+-]\d{2}(?::?\d{2})?)?\s*$')
+
+# strings NumPy converts to datetime64[ns] as they are: naive or UTC ('Z' is
+# stripped first); the years are checked against the datetime64[ns] range,
+# which NumPy wraps around silently
+NUMPY_DATETIME = re.compile(r'(\d{4})-\d{2}-\d{2}(?:T\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?Z?$')
+NUMPY_YEARS = (1678, 2261)
+
+UTC = tzutc()
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# number of distinct strings kept by each cache before it is emptied
+CACHE_SIZE = 4096
+
+_datetime_cache = {}
+_epoch_cache = {}
+
+
+def _days_from_civil(y, m, d):
+    """Days since 1970-01-01 of a proleptic Gregorian date"""
+    y -= m <= 2
+    era = (y if y >= 0 else y - 399) // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _offset_seconds(tz):
+    """Offset in seconds of a Z, +hh, +hhmm or +hh:mm designator"""
+    if tz == 'Z':
+        return 0
+    seconds = int(tz[1:3]) * 3600 + (int(tz[-2:]) * 60 if len(tz) > 3 else 0)
+    return seconds if tz[0] == '+' else -seconds
+
+
+def _remember(cache, key, value):
+    if len(cache) >= CACHE_SIZE:
+        cache.clear()
+    cache[key] = value
+    return value
+
+
+def parse_datetime(value):
+    """
+    Parse a date time string into a datetime, like dateutil.parser.parse.
+
+    Strings with a Z designator or a zero offset are returned with a tzutc
+    timezone, other offsets with a tzoffset and strings without designator
+    as naive datetimes.  Fractions beyond microseconds are truncated.
+    Raises ValueError (or dateutil's own errors) for unparseable strings.
+    """
+    try:
+        return _datetime_cache[value]
+    except KeyError:
+        pass
+    except TypeError:   # unhashable, let dateutil complain
+        return parser.parse(value)
+
+    match = ISO8601.match(value) if value is not None else None
+    if match is None:
+        return _remember(_datetime_cache, value, parser.parse(value))
+
+    year, month, day, hour, minute, second, fraction, tz = match.groups()
+    tzinfo = None
+    if tz is not None:
+        offset = _offset_seconds(tz)
+        tzinfo = UTC if offset == 0 else tzoffset(None, offset)
+    microsecond = int(fraction[:6].ljust(6, '0')) if fraction else 0
+    dt = datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0),
+                  int(second or 0), microsecond, tzinfo)
+    return _remember(_datetime_cache, value, dt)
+
+
+def parse_epoch_ns(value, utc=True):
+    """
+    Parse a date time string into nanoseconds since 1970-01-01.
+
+    Returns a (nanoseconds, aware) tuple, aware telling whether the string
+    carried a timezone.  With utc=True offsets are applied so the result is
+    UTC; with utc=False the wall clock time is kept.  Naive times are
+    always taken as they are.
+    """
+    key = (value, utc)
+    try:
+        return _epoch_cache[key]
+    except KeyError:
+        pass
+
+    match = ISO8601.match(value) if value is not None else None
+    if match is None:
+        dt = parser.parse(value)
+        aware = dt.tzinfo is not None
+        if not aware or not utc:
+            dt = dt.replace(tzinfo=UTC)
+        delta = dt - EPOCH
+        ns = ((delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds) * 1000
+        return _remember(_epoch_cache, key, (ns, aware))
+
+    year, month, day, hour, minute, second, fraction, tz = match.groups()
+    seconds = (_days_from_civil(int(year), int(month), int(day)) * 86400 +
+               int(hour or 0) * 3600 + int(minute or 0) * 60 + int(second or 0))
+    if tz is not None and utc:
+        seconds -= _offset_seconds(tz)
+    ns = seconds * 1000000000
+    if fraction:
+        ns += int(fraction[:9].ljust(9, '0'))
+    return _remember(_epoch_cache, key, (ns, tz is not None))
+
+
+def _numpy_convertible(value):
+    match = NUMPY_DATETIME.match(value)
+    return match is not None and NUMPY_YEARS[0] <= int(match.group(1)) <= NUMPY_YEARS[1]
+
+
+def parse_datetime_array(values, utc=True):
+    """
+    Parse a sequence of date time strings into a datetime64[ns] array.
+
+    None, and times outside the datetime64[ns] range (about 1678 to
+    2262), become NaT.  Offsets are applied with utc=True, dropped (keeping
+    the wall clock time) otherwise.  Arrays of naive or UTC ISO-8601
+    strings within 1678-2261 are converted by NumPy in one go; anything
+    else goes string by string through parse_epoch_ns.  Without NumPy a list of datetimes is returned.
+    """
+    if not np:
+        dates = []
+        for value in values:
+            if value is None:
+                dates.append(None)
+                continue
+            dt = parse_datetime(value)
+            if dt.tzinfo is not None:
+                if utc:
+                    dt = dt.astimezone(UTC)
+                dt = dt.replace(tzinfo=None)
+            dates.append(dt)
+        return dates
+
+    values = list(values)
+    if all(value is None or _numpy_convertible(value) for value in values):
+        try:
+            strings = [v[:-1] if v is not None and v.endswith('Z') else v for v in values]
+            return np.array(strings, dtype='datetime64[ns]')
+        except ValueError:
+            pass
+
+    ns = np.empty(len(values), dtype='int64')
+    nat, largest = np.iinfo('int64').min, np.iinfo('int64').max
+    for i, value in enumerate(values):
+        epoch_ns = nat if value is None else parse_epoch_ns(value, utc)[0]
+        ns[i] = epoch_ns if nat < epoch_ns <= largest else nat
+    return ns.view('datetime64[ns]')
+
+
+def clear_cache():
+    """Empty the parse caches"""
+    _datetime_cache.clear()
+    _epoch_cache.clear()
@@ -1,5 +1,6 @@
-import cgi
+from six.moves.urllib.parse import parse_qsl
 from owslib.etree import etree
+from owslib.instrumentation import instrumented, span
 from owslib.util import openURL
 
 try:
@@ -25,7 +26,7 @@ class WFSCapabilitiesReader(object):
         """
         qs = []
         if service_url.find('?') != -1:
-            qs = cgi.parse_qsl(service_url.split('?')[1])
+            qs = parse_qsl(service_url.split('?')[1])
 
         params = [x[0] for x in qs]
 
@@ -39,6 +40,7 @@ class WFSCapabilitiesReader(object):
         urlqs = urlencode(tuple(qs))
         return service_url.split('?')[0] + '?' + urlqs
 
+    @instrumented('WFS.GetCapabilities')
     def read(self, url, timeout=30):
         """Get and parse a WFS capabilities document, returning an
         instance of WFSCapabilitiesInfoset
@@ -53,7 +55,8 @@ class WFSCapabilitiesReader(object):
         request = self.capabilities_url(url)
         u = openURL(request, timeout=timeout,
                     username=self.username, password=self.password)
-        return etree.fromstring(u.read())
+        with span('WFS.parse'):
+            return etree.fromstring(u.read())
 
     def readString(self, st):
         """Parse a WFS capabilities document, returning an
@@ -9,7 +9,8 @@ Set of functions, which are suitable for DescribeFeatureType parsing and
 generating layer schema description compatible with `fiona`
 """
 
-import cgi, sys
+import sys
+from six.moves.urllib.parse import parse_qsl
 from owslib.util import openURL
 try:
     from urllib import urlencode
@@ -127,7 +128,7 @@ def _get_describefeaturetype_url(url, version, typename):
 
     query_string = []
     if url.find('?') != -1:
-        query_string = cgi.parse_qsl(url.split('?')[1])
+        query_string = parse_qsl(url.split('?')[1])
 
     params = [x[0] for x in query_string]
 
@@ -14,17 +14,16 @@ try:
     from urllib import urlencode
 except ImportError:
     from urllib.parse import urlencode
+from owslib.instrumentation import instrumented, span
 from owslib.util import openURL, testXMLValue, extract_xml_list, ServiceException, xmltag_split
 from owslib.etree import etree
-from owslib.fgdc import Metadata
-from owslib.iso import MD_Metadata
 from owslib.crs import Crs
+from owslib.reproject import transform_points
 from owslib.namespaces import Namespaces
 from owslib.util import log
 from owslib.feature.schema import get_schema
 from owslib.feature.common import WFSCapabilitiesReader
 
-import pyproj
 
 n = Namespaces()
 WFS_NAMESPACE = n.get_namespace("wfs")
@@ -99,7 +98,8 @@ class WebFeatureService_1_0_0(object):
             self._capabilities = reader.readString(xml)
         else:
             self._capabilities = reader.read(self.url)
-        self._buildMetadata(parse_remote_metadata)
+        with span('WFS.build'):
+            self._buildMetadata(parse_remote_metadata)
 
 
     def _buildMetadata(self, parse_remote_metadata=False):
@@ -159,6 +159,7 @@ class WebFeatureService_1_0_0(object):
 
         return StringIO(strval.decode())
 
+    @instrumented('WFS.GetFeature')
     def getfeature(self, typename=None, filter=None, bbox=None, featureid=None,
                    featureversion=None, propertyname='*', maxfeatures=None,
                    srsname=None, outputFormat=None, method='{http://www.opengis.net/wfs}Get',
@@ -330,17 +331,12 @@ class ContentMetadata:
         self.boundingBoxWGS84 = None
 
         if b is not None and srs is not None:
-            wgs84 = pyproj.Proj(init="epsg:4326")
             try:
-                src_srs = pyproj.Proj(init=srs.text)
-                mincorner = pyproj.transform(src_srs, wgs84, b.attrib['minx'],
-                        b.attrib['miny'])
-                maxcorner = pyproj.transform(src_srs, wgs84, b.attrib['maxx'],
-                        b.attrib['maxy'])
-
-                self.boundingBoxWGS84 = (mincorner[0], mincorner[1],
-                        maxcorner[0], maxcorner[1])
-            except RuntimeError as e:
+                # the corners only, as published before; reproject.transform_bbox encloses the edges too
+                minx, miny, maxx, maxy = self.boundingBox[:4]
+                xs, ys = transform_points(srs.text, 'EPSG:4326', [minx, maxx], [miny, maxy])
+                self.boundingBoxWGS84 = (float(xs[0]), float(ys[0]), float(xs[1]), float(ys[1]))
+            except (RuntimeError, ValueError):
                 pass
 
         # crs options
@@ -373,8 +369,10 @@ class ContentMetadata:
                     doc = etree.parse(content)
                     if metadataUrl['type'] is not None:
                         if metadataUrl['type'] == 'FGDC':
+                            from owslib.fgdc import Metadata
                             metadataUrl['metadata'] = Metadata(doc)
                         if metadataUrl['type'] == 'TC211':
+                            from owslib.iso import MD_Metadata
                             metadataUrl['metadata'] = MD_Metadata(doc)
                 except Exception:
                     metadataUrl['metadata'] = None
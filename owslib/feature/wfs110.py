@@ -15,10 +15,9 @@ try:
     from urllib import urlencode
 except ImportError:
     from urllib.parse import urlencode
+from owslib.instrumentation import instrumented, span
 from owslib.util import openURL, testXMLValue, nspath_eval, ServiceException
 from owslib.etree import etree
-from owslib.fgdc import Metadata
-from owslib.iso import MD_Metadata
 from owslib.ows import *
 from owslib.fes import *
 from owslib.crs import Crs
@@ -81,7 +80,8 @@ class WebFeatureService_1_1_0(WebFeatureService_):
             self._capabilities = reader.readString(xml)
         else:
             self._capabilities = reader.read(self.url)
-        self._buildMetadata(parse_remote_metadata)
+        with span('WFS.build'):
+            self._buildMetadata(parse_remote_metadata)
 
     def _buildMetadata(self, parse_remote_metadata=False):
         '''set up capabilities metadata objects: '''
@@ -148,6 +148,7 @@ class WebFeatureService_1_1_0(WebFeatureService_):
 
         return StringIO(strval.decode())
 
+    @instrumented('WFS.GetFeature')
     def getfeature(self, typename=None, filter=None, bbox=None, featureid=None,
                    featureversion=None, propertyname='*', maxfeatures=None,
                    srsname=None, outputFormat=None, method='Get',
@@ -333,8 +334,10 @@ class ContentMetadata:
                     doc = etree.parse(content)
                     if metadataUrl['type'] is not None:
                         if metadataUrl['type'] == 'FGDC':
+                            from owslib.fgdc import Metadata
                             metadataUrl['metadata'] = Metadata(doc)
                         if metadataUrl['type'] in ['TC211', '19115', '19139']:
+                            from owslib.iso import MD_Metadata
                             metadataUrl['metadata'] = MD_Metadata(doc)
                 except Exception:
                     metadataUrl['metadata'] = None
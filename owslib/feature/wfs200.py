@@ -11,6 +11,7 @@ from __future__ import (absolute_import, division, print_function)
 #owslib imports:
 from owslib.ows import ServiceIdentification, ServiceProvider, OperationsMetadata
 from owslib.etree import etree
+from owslib.instrumentation import instrumented, span
 from owslib.util import nspath, testXMLValue, openURL
 from owslib.crs import Crs
 from owslib.feature import WebFeatureService_
@@ -89,7 +90,8 @@ class WebFeatureService_2_0_0(WebFeatureService_):
             self._capabilities = reader.readString(xml)
         else:
             self._capabilities = reader.read(self.url)
-        self._buildMetadata(parse_remote_metadata)
+        with span('WFS.build'):
+            self._buildMetadata(parse_remote_metadata)
 
     def _buildMetadata(self, parse_remote_metadata=False):
         '''set up capabilities metadata objects: '''
@@ -167,6 +169,7 @@ class WebFeatureService_2_0_0(WebFeatureService_):
 
         return StringIO(strval.decode())
 
+    @instrumented('WFS.GetFeature')
     def getfeature(self, typename=None, filter=None, bbox=None, featureid=None,
                    featureversion=None, propertyname=None, maxfeatures=None,storedQueryID=None, storedQueryParams=None,
                    method='Get', outputFormat=None, startindex=None):
@@ -426,8 +429,10 @@ class ContentMetadata:
                     content = openURL(metadataUrl['url'], timeout=timeout)
                     doc = etree.parse(content)
                     try:  # FGDC
+                        from owslib.fgdc import Metadata
                         metadataUrl['metadata'] = Metadata(doc)
                     except:  # ISO
+                        from owslib.iso import MD_Metadata
                         metadataUrl['metadata'] = MD_Metadata(doc)
                 except Exception:
                     metadataUrl['metadata'] = None
@@ -0,0 +1,306 @@
+# -*- coding: ISO-8859-15 -*-
+# =============================================================================
+# OWSLib. Copyright (C) 2005 Sean C. Gillies
+#
+# Contact email: sgillies@frii.com
+# =============================================================================
+
+"""
+Instrumentation of OWSLib requests, capabilities parsing and service operations.
+
+Code paths of interest run inside spans: openURL ('http'), capabilities
+readers ('WMS.GetCapabilities', ...), the XML parsing within them
+('WMS.parse', ...), the construction of service objects from the parsed
+capabilities ('WMS.build', ...) and service operations ('WMS.GetMap',
+'WFS.GetFeature', ...).  A span records its name, its parent, its duration
+and attributes such as url, status, bytes transferred, ttfb (time to the
+response headers, in seconds) and cache_hit.  Hooks, callables taking the
+span, are called when a span ends:
+
+    from owslib import instrumentation
+    instrumentation.add_hook(lambda span: print(span.name, span.duration))
+
+Without hooks, span() returns a shared object doing nothing, so the
+instrumentation costs one list check per call.
+PrometheusMetrics is a hook aggregating spans into counters and histograms,
+rendered in the Prometheus text exposition format.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import functools
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+timer = getattr(time, 'perf_counter', time.time)
+
+_hooks = []
+_local = threading.local()
+
+
+def add_hook(hook):
+    """Call hook(span) when each span ends"""
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """Stop calling hook, a no-op if it was not added"""
+    try:
+        _hooks.remove(hook)
+    except ValueError:
+        pass
+
+
+def enabled():
+    """True if a hook is installed"""
+    return bool(_hooks)
+
+
+class Span(object):
+    """A timed section of work, the context manager returned by span()"""
+
+    __slots__ = ('name', 'attributes', 'parent', 'start', 'end', 'error')
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.parent = None
+        self.start = self.end = None
+        self.error = None
+
+    @property
+    def duration(self):
+        """Seconds between entering and leaving the span"""
+        if self.start is None or self.end is None:
+            return None
+        return self.end - self.start
+
+    def annotate(self, **attributes):
+        """Add or replace attributes"""
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self)
+        self.start = timer()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.end = timer()
+        if exc_value is not None:
+            self.error = exc_value
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        for hook in list(_hooks):
+            try:
+                hook(self)
+            except Exception as err:
+                log.warning('Instrumentation hook %r failed: %s' % (hook, err))
+        return False
+
+    def __repr__(self):
+        return '<Span %s %r>' % (self.name, self.attributes)
+
+
+class _NoSpan(object):
+    """Stands in for Span when no hook is installed"""
+
+    __slots__ = ()
+    name = None
+    attributes = {}
+    parent = None
+    duration = None
+
+    def annotate(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_nospan = _NoSpan()
+
+
+def _stack():
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def span(name, **attributes):
+    """Context manager timing the enclosed block as a span called name"""
+    if not _hooks:
+        return _nospan
+    return Span(name, attributes)
+
+
+def current_span():
+    """Innermost span entered in this thread, None outside spans"""
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def annotate(**attributes):
+    """Add attributes to the innermost span of this thread, if any"""
+    if _hooks:
+        current = current_span()
+        if current is not None:
+            current.attributes.update(attributes)
+
+
+def instrumented(name):
+    """Decorator running each call of the decorated function in a span called name"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return func(*args, **kwargs)
+            with Span(name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# upper bounds (seconds) of the duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# upper bounds (bytes) of the response size histogram buckets
+SIZE_BUCKETS = (1024, 10240, 102400, 1048576, 10485760, 104857600)
+
+
+class Histogram(object):
+    """Cumulative histogram with fixed bucket bounds"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)   # last one is +Inf
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def cumulative(self):
+        """(upper bound, count of observations <= bound) pairs, ending with '+Inf'"""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+def _labels(labels):
+    return ','.join('%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                    for k, v in labels)
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+class PrometheusMetrics(object):
+    """
+    Hook aggregating spans into Prometheus style metrics, labelled by span name:
+
+    - owslib_spans_total{span,status}: counter of spans, status is the HTTP
+      status, 'error' for spans that raised, 'ok' otherwise
+    - owslib_span_duration_seconds{span}: histogram of span durations
+    - owslib_ttfb_seconds{span}: histogram of times to the response headers
+    - owslib_response_bytes{span}: histogram of bytes transferred
+    - owslib_cache_total{span,result}: counter of cache hits and misses
+
+    Install with add_hook(metrics), expose render() on a /metrics endpoint.
+    """
+
+    def __init__(self, prefix='owslib', duration_buckets=DURATION_BUCKETS, size_buckets=SIZE_BUCKETS):
+        self.prefix = prefix
+        self.duration_buckets = duration_buckets
+        self.size_buckets = size_buckets
+        self.counters = {}     # (metric, labels) -> value
+        self.histograms = {}   # (metric, labels) -> Histogram
+        self._lock = threading.Lock()
+
+    def __call__(self, span):
+        attributes = span.attributes
+        if span.error is not None:
+            status = 'error'
+        else:
+            status = attributes.get('status', 'ok')
+        name = (('span', span.name),)
+        with self._lock:
+            self._inc('spans_total', name + (('status', status),))
+            self._observe('span_duration_seconds', name, span.duration, self.duration_buckets)
+            if attributes.get('ttfb') is not None:
+                self._observe('ttfb_seconds', name, attributes['ttfb'], self.duration_buckets)
+            if attributes.get('bytes') is not None:
+                self._observe('response_bytes', name, attributes['bytes'], self.size_buckets)
+            if attributes.get('cache_hit') is not None:
+                self._inc('cache_total', name + (('result', 'hit' if attributes['cache_hit'] else 'miss'),))
+
+    def _inc(self, metric, labels):
+        key = (metric, tuple(sorted(labels)))
+        self.counters[key] = self.counters.get(key, 0) + 1
+
+    def _observe(self, metric, labels, value, buckets):
+        key = (metric, tuple(sorted(labels)))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(buckets)
+        histogram.observe(value)
+
+    def counter(self, metric, **labels):
+        """Value of a counter, 0 if never incremented"""
+        return self.counters.get((metric, tuple(sorted(labels.items()))), 0)
+
+    def histogram(self, metric, **labels):
+        """Histogram of a metric, None if nothing was observed"""
+        return self.histograms.get((metric, tuple(sorted(labels.items()))))
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def render(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted((k, (h.cumulative(), h.sum, h.count)) for k, h in self.histograms.items())
+        typed = set()
+        for (metric, labels), value in counters:
+            full = '%s_%s' % (self.prefix, metric)
+            if full not in typed:
+                typed.add(full)
+                lines.append('# TYPE %s counter' % full)
+            lines.append('%s{%s} %s' % (full, _labels(labels), _number(value)))
+        for (metric, labels), (buckets, total, count) in histograms:
+            full = '%s_%s' % (self.prefix, metric)
+            if full not in typed:
+                typed.add(full)
+                lines.append('# TYPE %s histogram' % full)
+            for bound, cumulative in buckets:
+                lines.append('%s_bucket{%s} %d' % (full, _labels(labels + (('le', bound),)), cumulative))
+            lines.append('%s_sum{%s} %s' % (full, _labels(labels), _number(total)))
+            lines.append('%s_count{%s} %d' % (full, _labels(labels), count))
+        return '\n'.join(lines) + '\n'
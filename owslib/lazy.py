@@ -0,0 +1,63 @@
+# -*- coding: ISO-8859-15 -*-
+# =============================================================================
+# OWSLib. Copyright (C) 2005 Sean C. Gillies
+#
+# Contact email: sgillies@frii.com
+# =============================================================================
+
+"""
+Modules imported on first use, to keep `import owslib.<service>` cheap.
+
+    np = LazyModule('numpy', optional=True)
+
+stands in for numpy until one of its attributes is used.  An optional
+module that is not installed makes the stand-in false, so `if np:`
+replaces the `np is not None` test of a try/except ImportError.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import importlib
+
+_missing = object()
+
+
+class LazyModule(object):
+    """Stands in for the module name, imported when an attribute is first looked up"""
+
+    def __init__(self, name, optional=False):
+        self.__dict__['_name'] = name
+        self.__dict__['_optional'] = optional
+        self.__dict__['_module'] = _missing
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is _missing:
+            try:
+                module = importlib.import_module(self._name)
+            except ImportError:
+                if not self._optional:
+                    raise
+                module = None
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        module = self._load()
+        if module is None:
+            raise AttributeError("optional module %s is not installed" % self._name)
+        return getattr(module, attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __bool__(self):
+        return self._load() is not None
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        module = self.__dict__['_module']
+        if module is _missing:
+            return '<lazy module %s>' % self._name
+        return repr(module)
@@ -1,12 +1,13 @@
 from __future__ import (absolute_import, division, print_function)
 
-import cgi
+from six.moves.urllib.parse import parse_qsl
 try:                    # Python 3
     from urllib.parse import urlencode
 except ImportError:     # Python 2
     from urllib import urlencode
 
 from owslib.etree import etree
+from owslib.instrumentation import instrumented, span
 from owslib.util import openURL, strip_bom
 
 
@@ -39,7 +40,7 @@ class WMSCapabilitiesReader(object):
         """
         qs = []
         if service_url.find('?') != -1:
-            qs = cgi.parse_qsl(service_url.split('?')[1])
+            qs = parse_qsl(service_url.split('?')[1])
 
         params = [x[0] for x in qs]
 
@@ -53,6 +54,7 @@ class WMSCapabilitiesReader(object):
         urlqs = urlencode(tuple(qs))
         return service_url.split('?')[0] + '?' + urlqs
 
+    @instrumented('WMS.GetCapabilities')
     def read(self, service_url, timeout=30):
         """Get and parse a WMS capabilities document, returning an
         elementtree instance
@@ -71,7 +73,8 @@ class WMSCapabilitiesReader(object):
                     headers=self.headers)
 
         raw_text = strip_bom(u.read())
-        return etree.fromstring(raw_text)
+        with span('WMS.parse'):
+            return etree.fromstring(raw_text)
 
     def readString(self, st):
         """Parse a WMS capabilities document, returning an elementtree instance.
@@ -17,7 +17,6 @@ Currently supports only version 1.1.1 of the WMS protocol.
 
 from __future__ import (absolute_import, division, print_function)
 
-import cgi
 try:                    # Python 3
     from urllib.parse import urlencode
 except ImportError:     # Python 2
@@ -28,12 +27,12 @@ import warnings
 import six
 
 from owslib.etree import etree
+from owslib.instrumentation import instrumented, span
 from owslib.util import (openURL, testXMLValue, extract_xml_list,
                          xmltag_split, OrderedDict, ServiceException,
                          bind_url)
-from owslib.fgdc import Metadata
-from owslib.iso import MD_Metadata
 from owslib.map.common import WMSCapabilitiesReader
+from owslib.reproject import transform_bbox
 
 
 class CapabilitiesError(Exception):
@@ -89,7 +88,8 @@ class WebMapService_1_1_1(object):
             raise ServiceException(err_message)
 
         # build metadata objects
-        self._buildMetadata(parse_remote_metadata)
+        with span('WMS.build'):
+            self._buildMetadata(parse_remote_metadata)
 
     def _buildMetadata(self, parse_remote_metadata=False):
         """Set up capabilities metadata objects."""
@@ -160,7 +160,7 @@ class WebMapService_1_1_1(object):
 
     def __build_getmap_request(self, layers=None, styles=None, srs=None, bbox=None,
                format=None, size=None, time=None, transparent=False,
-               bgcolor=None, exceptions=None, **kwargs):
+               bgcolor='#FFFFFF', exceptions='application/vnd.ogc.se_xml', **kwargs):
 
         request = {'service': 'WMS', 'version': self.version, 'request': 'GetMap'}
 
@@ -192,12 +192,14 @@ class WebMapService_1_1_1(object):
                 request[kw]=kwargs[kw]
         return request
 
+    @instrumented('WMS.GetMap')
     def getmap(self, layers=None, styles=None, srs=None, bbox=None,
                format=None, size=None, time=None, transparent=False,
                bgcolor='#FFFFFF',
                exceptions='application/vnd.ogc.se_xml',
                method='Get',
                timeout=None,
+               bbox_crs=None,
                **kwargs
                ):
         """Request and return an image from the WMS as a file-like object.
@@ -213,6 +215,9 @@ class WebMapService_1_1_1(object):
             A spatial reference system identifier.
         bbox : tuple
             (left, bottom, right, top) in srs units.
+        bbox_crs : string or Crs
+            Optional. Spatial reference system of bbox, when it is not srs:
+            the bbox is reprojected to srs (easting first in both).
         format : string
             Output image format such as 'image/jpeg'.
         size : tuple
@@ -241,13 +246,9 @@ class WebMapService_1_1_1(object):
             out.close()
 
         """
-        try:
-            base_url = next((m.get('url') for m in self.getOperationByName('GetMap').methods if m.get('type').lower() == method.lower()))
-        except StopIteration:
-            base_url = self.url
-        request = {'version': self.version, 'request': 'GetMap'}
-
-        request = self.__build_getmap_request(
+        base_url, data = self._getmap_url(
+            method=method,
+            bbox_crs=bbox_crs,
             layers=layers,
             styles=styles,
             srs=srs,
@@ -260,12 +261,26 @@ class WebMapService_1_1_1(object):
             exceptions=exceptions,
             **kwargs)
 
-        data = urlencode(request)
-
         self.request = bind_url(base_url) + data
 
         u = openURL(base_url, data, method, username=self.username, password=self.password, timeout=timeout or self.timeout)
 
+        return self._check_getmap_response(u)
+
+    def _getmap_url(self, method='Get', bbox_crs=None, **kwargs):
+        """(base url, query string) of a GetMap request, kwargs are those of getmap"""
+        try:
+            base_url = next((m.get('url') for m in self.getOperationByName('GetMap').methods if m.get('type').lower() == method.lower()))
+        except StopIteration:
+            base_url = self.url
+
+        if bbox_crs is not None:
+            kwargs['bbox'] = transform_bbox(bbox_crs, kwargs['srs'], kwargs['bbox'])
+
+        return base_url, urlencode(self.__build_getmap_request(**kwargs))
+
+    def _check_getmap_response(self, u):
+        """Raise the service exception reported by GetMap response u, return u otherwise"""
         # check for service exceptions, and return
         if u.info()['Content-Type'].split(';')[0] in ['application/vnd.ogc.se_xml']:
             se_xml = u.read()
@@ -274,6 +289,7 @@ class WebMapService_1_1_1(object):
             raise ServiceException(err_message)
         return u
 
+    @instrumented('WMS.GetFeatureInfo')
     def getfeatureinfo(self,
                        layers=None,
                        styles=None,
@@ -574,8 +590,10 @@ class ContentMetadata:
                     doc = etree.parse(content)
                     if metadataUrl['type'] is not None:
                         if metadataUrl['type'] == 'FGDC':
+                            from owslib.fgdc import Metadata
                             metadataUrl['metadata'] = Metadata(doc)
                         if metadataUrl['type'] == 'TC211':
+                            from owslib.iso import MD_Metadata
                             metadataUrl['metadata'] = MD_Metadata(doc)
                 except Exception:
                     metadataUrl['metadata'] = None
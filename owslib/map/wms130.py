@@ -23,13 +23,13 @@ except ImportError:     # Python 2
 import warnings
 import six
 from owslib.etree import etree
+from owslib.instrumentation import instrumented, span
 from owslib.util import (openURL, ServiceException, testXMLValue,
                          extract_xml_list, xmltag_split, OrderedDict, nspath,
                          bind_url)
 from owslib.util import nspath
-from owslib.fgdc import Metadata
-from owslib.iso import MD_Metadata
 from owslib.crs import Crs
+from owslib.reproject import transform_bbox
 from owslib.namespaces import Namespaces
 from owslib.map.common import WMSCapabilitiesReader
 
@@ -82,7 +82,8 @@ class WebMapService_1_3_0(object):
             raise ServiceException(err_message)
 
         # build metadata objects
-        self._buildMetadata(parse_remote_metadata)
+        with span('WMS.build'):
+            self._buildMetadata(parse_remote_metadata)
 
     def _buildMetadata(self, parse_remote_metadata=False):
         '''set up capabilities metadata objects:'''
@@ -152,7 +153,7 @@ class WebMapService_1_3_0(object):
     def __build_getmap_request(self, layers=None, styles=None, srs=None, bbox=None,
                format=None, size=None, time=None, dimensions={},
                elevation=None, transparent=False,
-               bgcolor=None, exceptions=None, **kwargs):
+               bgcolor='#FFFFFF', exceptions='XML', **kwargs):
 
         request = {'service': 'WMS', 'version': self.version, 'request': 'GetMap'}
 
@@ -202,6 +203,7 @@ class WebMapService_1_3_0(object):
                 request[kw]=kwargs[kw]
         return request
 
+    @instrumented('WMS.GetMap')
     def getmap(self, layers=None,
                styles=None,
                srs=None,
@@ -216,6 +218,7 @@ class WebMapService_1_3_0(object):
                exceptions='XML',
                method='Get',
                timeout=None,
+               bbox_crs=None,
                **kwargs
                ):
         """Request and return an image from the WMS as a file-like object.
@@ -239,6 +242,9 @@ class WebMapService_1_3_0(object):
 
             CRS:84: (long, lat)
             EPSG:4326: (lat, long)
+        bbox_crs : string or Crs
+            Optional. Spatial reference system of bbox, when it is not srs:
+            the bbox is reprojected to srs (easting first in both).
         format : string
             Output image format such as 'image/jpeg'.
         size : tuple
@@ -277,14 +283,9 @@ class WebMapService_1_3_0(object):
 
         """
 
-        try:
-            base_url = next((m.get('url') for m in
-                            self.getOperationByName('GetMap').methods if
-                            m.get('type').lower() == method.lower()))
-        except StopIteration:
-            base_url = self.url
-
-        request = self.__build_getmap_request(
+        base_url, data = self._getmap_url(
+            method=method,
+            bbox_crs=bbox_crs,
             layers=layers,
             styles=styles,
             srs=srs,
@@ -299,8 +300,6 @@ class WebMapService_1_3_0(object):
             exceptions=exceptions,
             **kwargs)
 
-        data = urlencode(request)
-
         self.request = bind_url(base_url) + data
 
         u = openURL(base_url,
@@ -310,6 +309,24 @@ class WebMapService_1_3_0(object):
                     password=self.password,
                     timeout=timeout or self.timeout)
 
+        return self._check_getmap_response(u)
+
+    def _getmap_url(self, method='Get', bbox_crs=None, **kwargs):
+        """(base url, query string) of a GetMap request, kwargs are those of getmap"""
+        try:
+            base_url = next((m.get('url') for m in
+                            self.getOperationByName('GetMap').methods if
+                            m.get('type').lower() == method.lower()))
+        except StopIteration:
+            base_url = self.url
+
+        if bbox_crs is not None:
+            kwargs['bbox'] = transform_bbox(bbox_crs, kwargs['srs'], kwargs['bbox'])
+
+        return base_url, urlencode(self.__build_getmap_request(**kwargs))
+
+    def _check_getmap_response(self, u):
+        """Raise the service exception reported by GetMap response u, return u otherwise"""
         # need to handle casing in the header keys
         headers = {}
         for k, v in six.iteritems(u.info()):
@@ -323,6 +340,7 @@ class WebMapService_1_3_0(object):
             raise ServiceException(err_message)
         return u
 
+    @instrumented('WMS.GetFeatureInfo')
     def getfeatureinfo(self, layers=None,
                        styles=None,
                        srs=None,
@@ -644,8 +662,10 @@ class ContentMetadata(object):
                     doc = etree.parse(content)
                     if metadataUrl['type'] is not None:
                         if metadataUrl['type'] == 'FGDC':
+                            from owslib.fgdc import Metadata
                             metadataUrl['metadata'] = Metadata(doc)
                         if metadataUrl['type'] == 'TC211':
+                            from owslib.iso import MD_Metadata
                             metadataUrl['metadata'] = MD_Metadata(doc)
                 except Exception:
                     metadataUrl['metadata'] = None
@@ -0,0 +1,168 @@
+# -*- coding: ISO-8859-15 -*-
+# =============================================================================
+# OWSLib. Copyright (C) 2005 Sean C. Gillies
+#
+# Contact email: sgillies@frii.com
+# =============================================================================
+
+"""
+Reprojection of coordinates and bounding boxes between Crs objects.
+
+pyproj transformers are expensive to create and cheap to use, so they are
+kept in a least recently used cache keyed by the (source, target) Crs
+pair.  Coordinates are taken easting first, as OWSLib bounding boxes are,
+unless native=True, in which case they follow the axisorder of their Crs.
+All functions accept sequences or NumPy arrays and transform them in one
+call to PROJ.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import threading
+from collections import OrderedDict
+
+from owslib.crs import Crs
+from owslib.lazy import LazyModule
+
+# imported on first use, numpy is optional
+pyproj = LazyModule('pyproj')
+np = LazyModule('numpy', optional=True)
+
+# number of (source, target) transformers kept
+CACHE_SIZE = 64
+
+# points per bbox edge used to find the extent of a reprojected bbox
+DENSIFY = 21
+
+_transformers = OrderedDict()
+_lock = threading.Lock()
+
+
+def as_crs(crs):
+    """Crs object of a Crs or CRS string"""
+    return crs if isinstance(crs, Crs) else Crs(crs)
+
+
+def _proj_definition(crs):
+    """String identifying crs for pyproj"""
+    if crs.authority is not None and crs.code not in (None, -1, ''):
+        return crs.getcode()   # e.g. EPSG:4326, OGC:CRS84
+    return crs.id
+
+
+def get_transformer(source, target):
+    """
+    pyproj Transformer from source to target (Crs objects or CRS strings),
+    easting first on both sides.  Transformers are cached.
+    """
+    key = (as_crs(source), as_crs(target))
+    with _lock:
+        try:
+            transformer = _transformers.pop(key)
+            _transformers[key] = transformer   # most recently used last
+            return transformer
+        except KeyError:
+            pass
+
+    transformer = pyproj.Transformer.from_crs(_proj_definition(key[0]), _proj_definition(key[1]), always_xy=True)
+    with _lock:
+        _transformers[key] = transformer
+        while len(_transformers) > CACHE_SIZE:
+            _transformers.popitem(last=False)
+    return transformer
+
+
+def clear_cache():
+    """Drop the cached transformers"""
+    with _lock:
+        _transformers.clear()
+
+
+def transform_points(source, target, x, y, native=False):
+    """
+    Reproject points given as sequences or arrays of x and y coordinates.
+    Returns the (x, y) coordinates in target, arrays when the input were.
+    With native=True, x and y are the first and second axis of source and
+    the results the first and second axis of target.
+    """
+    source, target = as_crs(source), as_crs(target)
+    if native and source.axisorder == 'yx':
+        x, y = y, x
+    if source == target:
+        tx, ty = x, y
+    else:
+        tx, ty = get_transformer(source, target).transform(x, y)
+    if native and target.axisorder == 'yx':
+        tx, ty = ty, tx
+    return tx, ty
+
+
+def _edges(bbox, densify):
+    """x and y of densify points along each edge of a (minx, miny, maxx, maxy) bbox"""
+    minx, miny, maxx, maxy = bbox
+    steps = [i / (densify - 1) for i in range(densify)] if densify > 1 else [0.0]
+    xs = [minx + (maxx - minx) * t for t in steps]
+    ys = [miny + (maxy - miny) * t for t in steps]
+    return (xs + [maxx] * len(ys) + xs[::-1] + [minx] * len(ys),
+            [miny] * len(xs) + ys + [maxy] * len(xs) + ys[::-1])
+
+
+def _swap(bbox):
+    return (bbox[1], bbox[0], bbox[3], bbox[2])
+
+
+def transform_bboxes(source, target, bboxes, densify=DENSIFY, native=False):
+    """
+    Reproject (minx, miny, maxx, maxy) bboxes, a sequence of them or an
+    (n, 4) array: each edge is densified to densify points so the result
+    encloses the reprojected shape, not only its corners.  Returns an
+    (n, 4) array with NumPy, a list of tuples otherwise.  Points that cannot
+    be reprojected (outside the domain of target) are left out.
+    """
+    source, target = as_crs(source), as_crs(target)
+    if not np:
+        return [transform_bbox(source, target, bbox, densify, native) for bbox in bboxes]
+
+    boxes = np.asarray(bboxes, dtype='float64').reshape(-1, 4)
+    if native and source.axisorder == 'yx':
+        boxes = boxes[:, [1, 0, 3, 2]]
+    if source == target:
+        result = boxes.copy()
+    else:
+        steps = np.linspace(0.0, 1.0, densify) if densify > 1 else np.zeros(1)
+        minx, miny, maxx, maxy = (boxes[:, i:i + 1] for i in range(4))
+        along_x = minx + (maxx - minx) * steps
+        along_y = miny + (maxy - miny) * steps
+        ones = np.ones_like(steps)
+        xs = np.hstack([along_x, maxx * ones, along_x, minx * ones])
+        ys = np.hstack([miny * ones, along_y, maxy * ones, along_y])
+        tx, ty = get_transformer(source, target).transform(xs, ys)
+        tx = np.where(np.isfinite(tx), tx, np.nan)
+        ty = np.where(np.isfinite(ty), ty, np.nan)
+        result = np.column_stack([np.nanmin(tx, axis=1), np.nanmin(ty, axis=1),
+                                  np.nanmax(tx, axis=1), np.nanmax(ty, axis=1)])
+    if native and target.axisorder == 'yx':
+        result = result[:, [1, 0, 3, 2]]
+    return result
+
+
+def transform_bbox(source, target, bbox, densify=DENSIFY, native=False):
+    """
+    Reproject one (minx, miny, maxx, maxy) bbox, see transform_bboxes.
+    Returns a tuple of floats.
+    """
+    source, target = as_crs(source), as_crs(target)
+    if np:
+        return tuple(float(v) for v in transform_bboxes(source, target, [bbox[:4]], densify, native)[0])
+
+    bbox = tuple(bbox[:4])
+    if native and source.axisorder == 'yx':
+        bbox = _swap(bbox)
+    if source != target:
+        tx, ty = get_transformer(source, target).transform(*_edges(bbox, densify))
+        points = [(px, py) for px, py in zip(tx, ty) if abs(px) != float('inf') and abs(py) != float('inf')]
+        bbox = (min(p[0] for p in points), min(p[1] for p in points),
+                max(p[0] for p in points), max(p[1] for p in points))
+    if native and target.axisorder == 'yx':
+        bbox = _swap(bbox)
+    return bbox
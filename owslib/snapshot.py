@@ -0,0 +1,202 @@
+# -*- coding: ISO-8859-15 -*-
+# =============================================================================
+# OWSLib. Copyright (C) 2005 Sean C. Gillies
+#
+# Contact email: sgillies@frii.com
+# =============================================================================
+
+"""
+Snapshots of built service objects (WebMapService, WebMapTileService,
+CatalogueServiceWeb, ...), so that processes which need the same service
+load its metadata model instead of downloading and parsing capabilities.
+
+A snapshot holds the object with its contents, operations, tilematrixsets,
+identification and so on; the element trees it was built from are left
+out, attributes that held them are None after loading.  A small header
+ahead of the object records the capabilities URL with the ETag and
+updateSequence of the document, which current() checks against the
+server with one request, reading no more than the root element.
+
+Example::
+
+    wms = snapshot.cached('/var/cache/owslib/wms.snapshot',
+                          lambda: WebMapService(url, version='1.3.0'))
+
+Snapshots are pickles: only load those written by a trusted process with
+the same OWSLib version.  They include the credentials the service object
+was created with.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import os
+import pickle
+import tempfile
+import time
+
+from six.moves.urllib.parse import urlencode
+
+import owslib
+from owslib.etree import etree
+from owslib.util import bind_url, log, openURL
+
+FORMAT = 1
+
+_replace = getattr(os, 'replace', os.rename)   # Python 2: rename does not replace on Windows
+
+# attributes of the service object holding raw documents, not stored
+_RAW_ATTRIBUTES = ('response',)
+
+
+class SnapshotError(Exception):
+    """The snapshot can not be loaded by this OWSLib"""
+    pass
+
+
+def _is_tree(obj):
+    return etree.iselement(obj) or type(obj).__name__ in ('ElementTree', '_ElementTree')
+
+
+class _Pickler(pickle.Pickler):
+    """Pickler storing element trees as None"""
+
+    def persistent_id(self, obj):
+        if _is_tree(obj):
+            return 'tree'
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def persistent_load(self, pid):
+        return None
+
+
+def capabilities_url(service):
+    """GetCapabilities URL of service"""
+    # the readers of the map services know their own
+    from owslib.map.common import WMSCapabilitiesReader
+    from owslib.map.wms111 import WebMapService_1_1_1
+    from owslib.map.wms130 import WebMapService_1_3_0
+    from owslib.wmts import WebMapTileService, WMTSCapabilitiesReader
+    if isinstance(service, (WebMapService_1_1_1, WebMapService_1_3_0)):
+        return WMSCapabilitiesReader(service.version).capabilities_url(service.url)
+    if isinstance(service, WebMapTileService):
+        return WMTSCapabilitiesReader(service.version).capabilities_url(service.url, service.vendor_kwargs)
+    name = getattr(service, 'service', None) or type(service).__name__
+    return bind_url(service.url) + urlencode((('service', name), ('version', service.version),
+                                              ('request', 'GetCapabilities')))
+
+
+def validators(url, etag=None, username=None, password=None, timeout=30):
+    """
+    (status, ETag, updateSequence) of the capabilities document at url.
+
+    With etag the request is conditional: a server that still has that
+    version answers 304 and (304, etag, None) is returned.  Otherwise the
+    response is read up to the root element only.
+    """
+    headers = {'If-None-Match': etag} if etag else {}
+    response = openURL(url, method='Get', username=username, password=password, timeout=timeout,
+                       headers=headers, stream=True)
+    try:
+        status = response._response.status_code
+        if status == 304:
+            return status, etag, None
+        update_sequence = None
+        for event, elem in etree.iterparse(response.raw(), events=('start',)):
+            update_sequence = elem.get('updateSequence')
+            break
+        return status, response.info().get('ETag'), update_sequence
+    finally:
+        response.close()
+
+
+def _header(service, etag):
+    return {
+        'format': FORMAT,
+        'owslib': owslib.__version__,
+        'class': '%s.%s' % (type(service).__module__, type(service).__name__),
+        'url': capabilities_url(service),
+        'username': getattr(service, 'username', None),
+        'password': getattr(service, 'password', None),
+        'etag': etag,
+        'updateSequence': getattr(service, 'updateSequence', None),
+        'created': time.time(),
+    }
+
+
+def dump(service, f, etag=None):
+    """Write a snapshot of service to the binary file f, with the ETag of its capabilities if known"""
+    raw = dict((name, service.__dict__.pop(name)) for name in _RAW_ATTRIBUTES if name in service.__dict__)
+    try:
+        pickle.dump(_header(service, etag), f, 2)
+        _Pickler(f, 2).dump(service)
+    finally:
+        service.__dict__.update(raw)
+
+
+def read_header(f):
+    """Header of the snapshot in the binary file f, leaving f at the service object"""
+    header = pickle.load(f)
+    if not isinstance(header, dict) or header.get('format') != FORMAT:
+        raise SnapshotError('not an OWSLib snapshot, or one of another format')
+    if header['owslib'] != owslib.__version__:
+        raise SnapshotError('snapshot of OWSLib %s, this is %s' % (header['owslib'], owslib.__version__))
+    return header
+
+
+def load(f):
+    """Service object of the snapshot in the binary file f"""
+    read_header(f)
+    return _Unpickler(f).load()
+
+
+def current(header, timeout=30):
+    """Whether the service of the snapshot header is unchanged on the server"""
+    try:
+        status, etag, update_sequence = validators(header['url'], header['etag'], header['username'],
+                                                   header['password'], timeout)
+    except Exception as err:
+        log.debug('Snapshot of %s not validated: %s', header['url'], err)
+        return False
+    if status == 304:
+        return True
+    if update_sequence is not None and header['updateSequence'] is not None:
+        return update_sequence == header['updateSequence']
+    return etag is not None and etag == header['etag']
+
+
+def cached(path, build, validate=True, timeout=30):
+    """
+    Service object from the snapshot at path, or from build() when there
+    is none, it is of another OWSLib version or (with validate) the
+    server reports other capabilities; the built object is then written
+    to path.  Concurrent writers replace the file atomically.
+    """
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            try:
+                header = read_header(f)
+            except (SnapshotError, pickle.UnpicklingError, EOFError) as err:
+                log.debug('Snapshot %s not used: %s', path, err)
+            else:
+                if not validate or current(header, timeout):
+                    return _Unpickler(f).load()
+
+    service = build()
+    try:
+        etag = validators(capabilities_url(service), username=getattr(service, 'username', None),
+                          password=getattr(service, 'password', None), timeout=timeout)[1]
+    except Exception:
+        etag = None
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            dump(service, f, etag)
+        _replace(temporary, path)
+    except Exception:
+        os.remove(temporary)
+        raise
+    return service
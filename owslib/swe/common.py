@@ -4,13 +4,17 @@ from owslib.util import nspath_eval
 from owslib.namespaces import Namespaces
 from owslib.util import testXMLAttribute, testXMLValue, InfiniteDateTime, NegativeInfiniteDateTime
 
-from dateutil import parser
+from owslib.dateparse import parse_datetime, parse_datetime_array, EPOCH, UTC
 from datetime import timedelta
 
 from owslib.etree import etree
+from owslib.lazy import LazyModule
 
-import inspect
-from sys import modules
+import base64
+import struct
+
+# numpy is optional, and imported on first use
+np = LazyModule('numpy', optional=True)
 
 def get_namespaces():
     ns = Namespaces()
@@ -256,7 +260,7 @@ class QuantityRange(Quantity):
 
 def get_time(value, referenceTime, uom):
     try:
-        value = parser.parse(value)
+        value = parse_datetime(value)
 
     except (AttributeError, ValueError): # Most likely an integer/float using a referenceTime
         try:
@@ -298,7 +302,7 @@ class Time(AbstractSimpleComponent):
         # Attributes
         self.localFrame         = testXMLAttribute(element,"localFrame")                                    # anyURI, optional
         try:
-            self.referenceTime  = parser.parse(testXMLAttribute(element,
+            self.referenceTime  = parse_datetime(testXMLAttribute(element,
                                                                 "referenceTime")
                                                ) # dateTime, optional
         except (AttributeError, ValueError, TypeError):
@@ -321,7 +325,7 @@ class TimeRange(AbstractSimpleComponent):
         # Attributes
         self.localFrame         = testXMLAttribute(element,"localFrame")                                # anyURI, optional
         try:
-            self.referenceTime  = parser.parse(testXMLAttribute(element,"referenceTime"))               # dateTime, optional
+            self.referenceTime  = parse_datetime(testXMLAttribute(element,"referenceTime"))               # dateTime, optional
         except (AttributeError, ValueError, TypeError):
             self.referenceTime  = None
 
@@ -369,7 +373,30 @@ class Item(NamedObject):
     def __init__(self, element):
         super(Item, self).__init__(element)
 
-class DataArray(AbstractDataComponent):
+class EncodedValues(object):
+    ''' Decoding of the values block of DataArray, Matrix and DataStream '''
+    def decode(self, structured=True):
+        '''
+        Decode the values block using elementType and encoding in one pass.
+
+        Returns a NumPy structured array with one field per DataRecord field
+        (or a single field named after elementType for scalar elements), or a
+        dict of columns keyed by field name when structured is False or NumPy
+        is not available.
+        '''
+        if self.values is None or self.encoding is None:
+            return None
+        fields = get_record_fields(self.elementType)
+        columns = self.encoding.decode(self.values, fields)
+        if structured and np:
+            array = np.empty(len(columns[fields[0][0]]) if fields else 0,
+                             dtype=[(name, columns[name].dtype) for name, component in fields])
+            for name, component in fields:
+                array[name] = columns[name]
+            return array
+        return columns
+
+class DataArray(AbstractDataComponent, EncodedValues):
     def __init__(self, element):
         super(DataArray, self).__init__(element)
         self.elementCount   = element.find(nspv("swe20:elementCount/swe20:Count"))      # required
@@ -380,7 +407,7 @@ class DataArray(AbstractDataComponent):
         except:
             self.encoding   = None
 
-class Matrix(AbstractDataComponent):
+class Matrix(AbstractDataComponent, EncodedValues):
     def __init__(self, element):
         super(Matrix, self).__init__(element)
         self.elementCount   = element.find(nspv("swe20:elementCount/swe20:Count"))      # required
@@ -390,7 +417,7 @@ class Matrix(AbstractDataComponent):
         self.referenceFrame = testXMLAttribute(element, "referenceFrame")               # anyURI, required
         self.localFrame     = testXMLAttribute(element, "localFrame")                   # anyURI, optional
 
-class DataStream(AbstractSWEIdentifiable):
+class DataStream(AbstractSWEIdentifiable, EncodedValues):
     def __init__(self, element):
         super(DataStream, self).__init__(element)
         self.elementCount   = element.find(nspv("swe20:elementCount/swe20:Count"))      # optional
@@ -412,21 +439,191 @@ class AbstractEncoding(object):
         elif t == "BinaryEncoding":
             return super(AbstractEncoding, cls).__new__(BinaryEncoding)
 
+def get_record_fields(element_type):
+    ''' Return the (name, component) pairs of the scalar fields described by an elementType '''
+    content = element_type.content if isinstance(element_type, NamedObject) else element_type
+    if isinstance(content, DataRecord):
+        fields = [(f.name, f.content) for f in content.field]
+    else:
+        fields = [(element_type.name or "value", content)]
+    for name, component in fields:
+        if not isinstance(component, (Boolean, Count, Quantity, Time, Category, Text)):
+            raise NotImplementedError("Only DataRecords of scalar components can be decoded, not %s"
+                                      % type(component).__name__)
+    return fields
+
+def is_iso_time(component):
+    ''' True if a Time component holds ISO-8601 positions rather than numbers of uom '''
+    return isinstance(component, Time) and (component.uom is None or "ISO-8601" in component.uom)
+
+_time_units = {"s": 1, "min": 60, "h": 3600, "d": 86400}
+
+def _float(token):
+    return float(token) if token else float("nan")
+
+def _time_column(tokens, component):
+    if is_iso_time(component):
+        tokens = [t or None for t in tokens]
+        if np:
+            try:
+                return parse_datetime_array(tokens)
+            except (ValueError, OverflowError):
+                pass
+        return [get_time(t, None, None) for t in tokens]
+
+    # numeric time, relative to referenceTime when given
+    if np:
+        return _relative_times(np.array([_float(t) for t in tokens], dtype="float64"), component)
+    return _relative_times([_float(t) for t in tokens], component)
+
+def _relative_times(numbers, component):
+    ''' Numeric times as datetimes numbers uom after referenceTime, or the numbers if there is no reference '''
+    scale = _time_units.get((component.uom or "").lower())
+    reference = component.referenceTime
+    if reference is None or scale is None:
+        return numbers
+    if np:
+        if reference.tzinfo is not None:
+            reference = reference.astimezone(UTC)
+        offsets = np.asarray(numbers, dtype="float64") * (scale * 1e9)
+        return np.datetime64(reference.replace(tzinfo=None), "ns") + offsets.astype("timedelta64[ns]")
+    return [None if n != n else reference + timedelta(seconds=n * scale) for n in numbers]
+
+def _missing_column(tokens, component):
+    ''' Column of numeric or boolean tokens some of which are empty: NaN, or None, where empty '''
+    if isinstance(component, Boolean):
+        column = [get_boolean(t) if t else None for t in tokens]
+        return np.array(column, dtype=object) if np else column
+    if np:
+        return np.array([_float(t) for t in tokens], dtype="float64")
+    if isinstance(component, Count):
+        return [int(t) if t else None for t in tokens]
+    return [_float(t) for t in tokens]
+
+def _text_column(tokens, component, decimalSeparator="."):
+    ''' Convert the string tokens of one field to a typed column, empty tokens being missing values '''
+    if isinstance(component, Time):
+        return _time_column(tokens, component)
+    if isinstance(component, (Quantity, Count)) and decimalSeparator != ".":
+        tokens = [t.replace(decimalSeparator, ".") for t in tokens]
+    if isinstance(component, (Quantity, Count, Boolean)) and "" in tokens:
+        return _missing_column(tokens, component)
+    if np:
+        tokens = np.array(tokens, dtype=str)
+        if isinstance(component, Quantity):
+            return tokens.astype("float64")
+        elif isinstance(component, Count):
+            return tokens.astype("int64")
+        elif isinstance(component, Boolean):
+            return np.char.lower(tokens) == "true"
+        return tokens
+    if isinstance(component, Quantity):
+        return [float(t) for t in tokens]
+    elif isinstance(component, Count):
+        return [int(t) for t in tokens]
+    elif isinstance(component, Boolean):
+        return [get_boolean(t) for t in tokens]
+    return tokens
+
 class TextEncoding(AbstractEncoding):
     def __init__(self, element):
         self.tokenSeparator         = testXMLAttribute(element[-1], "tokenSeparator")                           # string,  required
         self.blockSeparator         = testXMLAttribute(element[-1], "blockSeparator")                           # string,  required
         self.decimalSeparator       = testXMLAttribute(element[-1], "decimalSeparator") or "."                  # string,  optional, default="."
-        self.collapseWhiteSpaces    = get_boolean(testXMLAttribute(element[-1], "collapseWhiteSpaces")) or True # boolean, optional, default=True
+        collapse                    = get_boolean(testXMLAttribute(element[-1], "collapseWhiteSpaces"))
+        self.collapseWhiteSpaces    = True if collapse is None else collapse                                    # boolean, optional, default=True
+
+    def tokens(self, values):
+        ''' Split a values block into a flat list of tokens '''
+        text = values.strip() if self.collapseWhiteSpaces else values
+        if self.blockSeparator != self.tokenSeparator:
+            text = text.replace(self.blockSeparator, self.tokenSeparator)
+        if self.collapseWhiteSpaces and self.tokenSeparator.strip() == "":
+            return text.split()
+        tokens = text.split(self.tokenSeparator)
+        if self.collapseWhiteSpaces:
+            tokens = [t.strip() for t in tokens]
+        if tokens and tokens[-1] == "":
+            tokens.pop()    # values block ending with a block separator
+        return tokens
+
+    def decode(self, values, fields):
+        ''' Decode a values block into a dict of typed columns keyed by field name '''
+        tokens = self.tokens(values)
+        width = len(fields)
+        if len(tokens) % width != 0:
+            raise ValueError("%d tokens cannot be split into blocks of %d fields" % (len(tokens), width))
+        columns = {}
+        for i, (name, component) in enumerate(fields):
+            columns[name] = _text_column(tokens[i::width], component, self.decimalSeparator)
+        return columns
 
 class XMLEncoding(AbstractEncoding):
     def __init__(self, element):
         raise NotImplementedError
 
+# binary data types (last segment of the OGC dataType URI) as struct format characters
+binary_data_types = {
+    "signedByte": "b", "unsignedByte": "B",
+    "signedShort": "h", "unsignedShort": "H",
+    "signedInt": "i", "unsignedInt": "I",
+    "signedLong": "q", "unsignedLong": "Q",
+    "float16": "e", "float32": "f", "float": "f",
+    "double": "d", "float64": "d",
+}
+
 class BinaryEncoding(AbstractEncoding):
     def __init__(self, element):
-        raise NotImplementedError
+        encoding                    = element[-1]
+        self.byteOrder              = testXMLAttribute(encoding, "byteOrder")                                   # string,  required
+        self.byteEncoding           = testXMLAttribute(encoding, "byteEncoding")                                # string,  required
+        self.byteLength             = get_int(testXMLAttribute(encoding, "byteLength"))                         # integer, optional
+        self.member                 = []                                                                        # Component, min=1, max=X
+        for member in encoding.findall(nspv("swe20:member")):
+            component = member.find(nspv("swe20:Component"))
+            if component is None:
+                raise NotImplementedError("Only Component members of BinaryEncoding are supported")
+            self.member.append({"ref": testXMLAttribute(component, "ref"),
+                                "dataType": testXMLAttribute(component, "dataType")})
+
+    def struct_format(self):
+        ''' The struct format string of one block '''
+        codes = []
+        for member in self.member:
+            data_type = (member["dataType"] or "").rstrip("/").split("/")[-1]
+            if data_type not in binary_data_types:
+                raise NotImplementedError("Binary data type %s is not supported" % member["dataType"])
+            codes.append(binary_data_types[data_type])
+        return (">" if self.byteOrder == "bigEndian" else "<") + "".join(codes)
+
+    def decode(self, values, fields):
+        ''' Decode a base64 values block into a dict of typed columns keyed by field name '''
+        if self.byteEncoding != "base64":
+            raise NotImplementedError("Only base64 byte encoding is supported in XML documents")
+        if len(self.member) != len(fields):
+            raise ValueError("BinaryEncoding has %d members for %d fields" % (len(self.member), len(fields)))
+        payload = base64.b64decode("".join(values.split()))
+        fmt = self.struct_format()
+
+        if np:
+            dtype = np.dtype([(name, fmt[0] + code) for (name, component), code in zip(fields, fmt[1:])])
+            records = np.frombuffer(payload, dtype=dtype, count=len(payload) // dtype.itemsize)
+            columns = dict((name, records[name].astype(records[name].dtype.newbyteorder("="))) for name, component in fields)
+        else:
+            size = struct.calcsize(fmt)
+            rows = [struct.unpack_from(fmt, payload, offset) for offset in range(0, len(payload) - size + 1, size)]
+            columns = dict((name, [row[i] for row in rows]) for i, (name, component) in enumerate(fields))
+
+        # ISO-8601 times are encoded as seconds since the epoch, other times relative to referenceTime
+        for name, component in fields:
+            if is_iso_time(component):
+                if np:
+                    columns[name] = (columns[name] * 1e9).astype("int64").view("datetime64[ns]")
+                else:
+                    columns[name] = [EPOCH + timedelta(seconds=t) for t in columns[name]]
+            elif isinstance(component, Time):
+                columns[name] = _relative_times(columns[name], component)
+        return columns
 
 # TODO: Individually whitelist valid classes which correspond to XML tags
-obj_mapping = {name: obj for name, obj in inspect.getmembers(modules[__name__],
-                                                             inspect.isclass)}
+obj_mapping = dict((name, obj) for name, obj in globals().items() if isinstance(obj, type))
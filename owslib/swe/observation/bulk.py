@@ -0,0 +1,362 @@
+# -*- coding: ISO-8859-15 -*-
+# =============================================================================
+# OWSLib. Copyright (C) 2005 Sean C. Gillies
+#
+# Contact email: sgillies@frii.com
+# =============================================================================
+
+"""
+Bulk GetObservation and DescribeSensor for SOS 1.0.0 and 2.0.0.
+
+A bulk observation request is split into one GetObservation per offering,
+observed property and time window.  The windows are bounded by the begin
+and end positions the offerings advertise, the requests run concurrently
+with a limit on the requests in flight per host, and the decoded responses
+are merged into a single time ordered set of columns.
+
+Bulk DescribeSensor fetches the SensorML documents of many procedures
+concurrently, through a cache that may be kept on disk between sessions.
+
+Requests in flight per host are limited by owslib.util.limiter, shared
+with every other openURL caller; per_host sets the limit of the service
+URL there unless one is configured already.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from owslib import util
+from owslib.util import DocumentCache, log
+from owslib.dateparse import UTC, parse_epoch_ns
+from owslib.swe.sensor.sml import SensorML
+from owslib.lazy import LazyModule
+
+# numpy is optional, and imported on first use
+np = LazyModule('numpy', optional=True)
+
+
+# columns of a bulk observation result, in order
+COLUMNS = ('time', 'value', 'offering', 'observed_property', 'procedure', 'feature', 'uom')
+
+
+def format_time(value):
+    """ISO-8601 string of a datetime, in UTC with a Z designator when it is timezone aware"""
+    if value.tzinfo is not None:
+        return value.astimezone(UTC).strftime('%Y-%m-%dT%H:%M:%SZ')
+    return value.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def time_windows(begin, end, window):
+    """
+    Split begin to end into consecutive (start, stop) windows of at most
+    window length.  Neighbouring windows share their boundary; a missing
+    begin or end, or no window, gives a single window, begin after end
+    none.
+    """
+    if begin is None or end is None:
+        return [(begin, end)]
+    if begin > end:
+        return []
+    if window is None or begin == end:
+        return [(begin, end)]
+    windows = []
+    start = begin
+    while start < end:
+        stop = min(start + window, end)
+        windows.append((start, stop))
+        start = stop
+    return windows
+
+
+def _bound(requested, advertised, pick):
+    if requested is None:
+        return advertised
+    if advertised is None:
+        return requested
+    try:
+        return pick(requested, advertised)
+    except TypeError:   # naive against aware, trust the caller
+        return requested
+
+
+def _operation_url(service, operation):
+    try:
+        url = next((m.get('url') for m in service.get_operation_by_name(operation).methods))
+    except (KeyError, StopIteration):
+        url = None
+    return url or service.url
+
+
+def _limit_host(url, per_host):
+    """Limit the requests in flight to url to per_host in the shared limiter, unless it has a limit already"""
+    if per_host is not None and url and util.limiter.limit(url) is None:
+        util.limiter.configure(url, max_in_flight=per_host)
+
+
+def _new_columns():
+    return dict((name, []) for name in COLUMNS if name != 'offering')
+
+
+def decode_csv(response, observed_property=None):
+    """
+    Decode a text/csv GetObservation response as served by IOOS style SOS
+    1.0.0 services: one row per observation, a date_time column, a
+    sensor_id or station_id column and one column per observed property,
+    named after the property and suffixed with its unit in brackets.
+    Only the column of observed_property (matched on the last segment of
+    its URN or URL) is kept; without it the first column after date_time.
+    """
+    if isinstance(response, bytes):
+        response = response.decode('utf-8')
+    reader = csv.reader(response.splitlines())
+    columns = _new_columns()
+    try:
+        header = next(reader)
+    except StopIteration:
+        return columns
+    names = [h.split(' (')[0].strip() for h in header]
+    units = [h[h.find(' (') + 2:-1] if h.endswith(')') and ' (' in h else None for h in header]
+
+    time_index = names.index('date_time')
+    value_index = time_index + 1
+    if observed_property is not None:
+        short = observed_property.rstrip('/').split('/')[-1].split(':')[-1]
+        if short in names:
+            value_index = names.index(short)
+    procedure_index = names.index('sensor_id') if 'sensor_id' in names else (
+        names.index('station_id') if 'station_id' in names else None)
+    feature_index = names.index('station_id') if 'station_id' in names else None
+    uom = units[value_index]
+    nan = float('nan')
+
+    for row in reader:
+        if len(row) <= max(time_index, value_index):
+            continue
+        columns['time'].append(parse_epoch_ns(row[time_index])[0])
+        try:
+            columns['value'].append(float(row[value_index]))
+        except ValueError:
+            columns['value'].append(nan)
+        columns['observed_property'].append(observed_property)
+        columns['procedure'].append(row[procedure_index] if procedure_index is not None else None)
+        columns['feature'].append(row[feature_index] if feature_index is not None else None)
+        columns['uom'].append(uom)
+    return columns
+
+
+class ObservationColumns(object):
+    """
+    Merged result of a bulk GetObservation: parallel columns of time,
+    value, offering, observed_property, procedure, feature and uom.
+
+    Rows are ordered by time (then offering, observed property, procedure
+    and feature), and rows repeating an earlier one on all of these keys,
+    such as points on the boundary of two time windows, are dropped.  With
+    NumPy time is a datetime64[ns] (UTC) array, value a float64 array and
+    the other columns object arrays; without it all columns are lists.
+
+    errors lists the (offering, observed property, eventTime, exception)
+    of the requests that failed and are missing from the columns.
+    """
+
+    def __init__(self, parts=(), errors=()):
+        self.columns = self._merge(list(parts))
+        self.errors = list(errors)
+
+    @staticmethod
+    def _merge(parts):
+        merged = dict((name, []) for name in COLUMNS)
+        for offering, part in parts:
+            merged['offering'].extend([offering] * len(part['time']))
+            for name in COLUMNS:
+                if name != 'offering':
+                    merged[name].extend(part[name])
+
+        keys = ('offering', 'observed_property', 'procedure', 'feature')
+        if not np:
+            order = sorted(range(len(merged['time'])),
+                           key=lambda i: (merged['time'][i],) + tuple(str(merged[k][i]) for k in keys))
+            keep = []
+            last = None
+            for i in order:
+                key = (merged['time'][i],) + tuple(merged[k][i] for k in keys)
+                if key != last:
+                    keep.append(i)
+                last = key
+            return dict((name, [merged[name][i] for i in keep]) for name in COLUMNS)
+
+        time = np.array(merged['time'], dtype='int64')
+        codes = []
+        for name in keys:
+            # factorize the string columns so rows can be lexsorted as integers
+            lookup = {}
+            codes.append(np.array([lookup.setdefault(v, len(lookup)) for v in merged[name]],
+                                  dtype='int64'))
+        order = np.lexsort(tuple(reversed(codes)) + (time,))
+        keep = np.ones(len(order), dtype=bool)
+        if len(order) > 1:
+            same = time[order][1:] == time[order][:-1]
+            for code in codes:
+                same &= code[order][1:] == code[order][:-1]
+            keep[1:] = ~same
+        order = order[keep]
+
+        columns = {'time': time[order].view('datetime64[ns]'),
+                   'value': np.array(merged['value'], dtype='float64')[order]}
+        for name in keys + ('uom',):
+            column = np.empty(len(merged[name]), dtype=object)
+            column[:] = merged[name]
+            columns[name] = column[order]
+        return columns
+
+    def __len__(self):
+        return len(self.columns['time'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __iter__(self):
+        """Rows as tuples in COLUMNS order"""
+        columns = [self.columns[name] for name in COLUMNS]
+        if np:
+            columns = [c.tolist() for c in columns]
+        return iter(zip(*columns))
+
+
+def get_observations(service, offerings=None, observedProperties=None, begin=None, end=None,
+                     window=timedelta(days=7), responseFormat=None, decoder=None,
+                     max_workers=4, per_host=None, offering_key=None, time_filter=None, **kwargs):
+    """
+    Run a bulk GetObservation against an SOS 1.0.0 or 2.0.0 service object.
+
+    offerings are offering ids or SosObservationOffering objects and default
+    to all offerings of the service; observedProperties default to those of
+    each offering.  Every offering is queried from max(begin, its
+    begin_position) to min(end, its end_position) in windows of at most
+    window length, one request per observed property and window.
+
+    decoder(response, observed_property) turns a response into a dict of
+    time (nanoseconds since the epoch), value, observed_property,
+    procedure, feature and uom sequences, see decode_csv and
+    owslib.swe.observation.sos200.decode_columns.  offering_key gives the identifier
+    sent for an offering and time_filter(start, stop) the value of the
+    eventTime argument of service.get_observation.  Remaining keyword
+    arguments go to get_observation unchanged.  Offerings without
+    observations between begin and end are skipped.  Returns an
+    ObservationColumns; requests that fail are logged and listed in its
+    errors.
+    """
+    if offerings is None:
+        offerings = service.offerings
+    offerings = [service[off] if not hasattr(off, 'observed_properties') else off
+                 for off in offerings]
+    offering_key = offering_key or (lambda off: off.id)
+    time_filter = time_filter or (lambda start, stop: '%s/%s' % (format_time(start), format_time(stop)))
+
+    tasks = []
+    for off in offerings:
+        start = _bound(begin, off.begin_position, max)
+        stop = _bound(end, off.end_position, min)
+        properties = observedProperties or off.observed_properties
+        for prop in properties:
+            for window_start, window_stop in time_windows(start, stop, window):
+                event_time = None
+                if window_start is not None and window_stop is not None:
+                    event_time = time_filter(window_start, window_stop)
+                tasks.append((offering_key(off), prop, event_time))
+
+    _limit_host(_operation_url(service, 'GetObservation'), per_host)
+
+    def fetch(task):
+        offering, prop, event_time = task
+        # streamed bodies hold their limiter slot until the decoder has read them
+        log.debug('GetObservation %s %s %s' % (offering, prop, event_time))
+        try:
+            response = service.get_observation(responseFormat=responseFormat, offerings=[offering],
+                                               observedProperties=[prop], eventTime=event_time,
+                                               **dict(kwargs))
+            try:
+                return offering, decoder(response, prop), None
+            finally:
+                if hasattr(response, 'close'):
+                    response.close()
+        except Exception as err:
+            log.warning('GetObservation %s %s %s failed: %s' % (offering, prop, event_time, err))
+            return offering, None, err
+
+    parts = []
+    errors = []
+    if tasks:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as executor:
+            for task, (offering, columns, err) in zip(tasks, executor.map(fetch, tasks)):
+                if err is None:
+                    parts.append((offering, columns))
+                else:
+                    errors.append(task + (err,))
+    return ObservationColumns(parts, errors)
+
+
+class SensorDescriptionCache(DocumentCache):
+    """
+    Thread-safe store of DescribeSensor responses keyed by (service url,
+    output format, procedure id).
+
+    With a directory the raw documents are also written there, one file per
+    key, so the cache survives the session and can be shared between
+    processes; without one it only lives in memory.
+    """
+
+
+# DescribeSensor responses, shared across service instances unless a cache is given
+sensor_description_cache = SensorDescriptionCache()
+
+
+def describe_sensors(service, procedures=None, outputFormat=None, cache=None, max_workers=4, per_host=None,
+                     **kwargs):
+    """
+    DescribeSensor for many procedures of an SOS 1.0.0 or 2.0.0 service.
+
+    procedures default to all procedures of the service's offerings.
+    Documents are looked up in cache (a SensorDescriptionCache, the shared
+    in-memory one by default) and only the missing ones are requested,
+    concurrently and limited per host.  Returns a dict of SensorML objects
+    keyed by procedure; they are parsed lazily, their summary gives the
+    commonly needed fields.  Procedures that fail are logged and left out.
+    """
+    if procedures is None:
+        procedures = []
+        for off in service.offerings:
+            procedures.extend(p for p in off.procedures if p not in procedures)
+    cache = cache if cache is not None else sensor_description_cache
+
+    documents = {}
+    missing = []
+    for procedure in procedures:
+        document = cache.get((service.url, outputFormat, procedure))
+        if document is None:
+            missing.append(procedure)
+        else:
+            documents[procedure] = document
+
+    _limit_host(_operation_url(service, 'DescribeSensor'), per_host)
+
+    def fetch(procedure):
+        try:
+            return procedure, service.describe_sensor(outputFormat=outputFormat, procedure=procedure,
+                                                      **dict(kwargs))
+        except Exception as err:
+            log.warning('DescribeSensor %s failed: %s' % (procedure, err))
+            return procedure, None
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+            for procedure, document in executor.map(fetch, missing):
+                if document is not None:
+                    cache.put((service.url, outputFormat, procedure), document)
+                    documents[procedure] = document
+
+    return dict((procedure, SensorML(documents[procedure])) for procedure in procedures
+                if procedure in documents)
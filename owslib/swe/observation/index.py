@@ -0,0 +1,170 @@
+# -*- coding: ISO-8859-15 -*-
+# =============================================================================
+# OWSLib. Copyright (C) 2005 Sean C. Gillies
+#
+# Contact email: sgillies@frii.com
+# =============================================================================
+
+"""
+Spatio-temporal index over the observation offerings of an SOS 1.0.0 or
+2.0.0 capabilities document.
+
+Offerings are kept sorted on the west edge of their bounding box, so a
+bbox query only looks at offerings starting west of the east edge of the
+query, and the remaining extents are compared as arrays.  Observed
+properties and procedures map to offerings through inverted indexes.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+from bisect import bisect_right
+from collections import defaultdict
+
+from owslib.dateparse import EPOCH
+from owslib.lazy import LazyModule
+
+# numpy is optional, and imported on first use
+np = LazyModule('numpy', optional=True)
+
+
+def normalized_bbox(offering):
+    """
+    (minx, miny, maxx, maxy) of an offering in the axis order of its CRS
+    made easting first, or None.  The SOS readers always take the envelope
+    corners as northing easting pairs, which only holds for CRSs with a
+    yx axis order.
+    """
+    bbox = getattr(offering, 'bbox', None)
+    if bbox is None:
+        return None
+    srs = getattr(offering, 'bbox_srs', None)
+    if srs is not None and srs.axisorder == 'xy':
+        bbox = (bbox[1], bbox[0], bbox[3], bbox[2])
+    return (min(bbox[0], bbox[2]), min(bbox[1], bbox[3]), max(bbox[0], bbox[2]), max(bbox[1], bbox[3]))
+
+
+def _seconds(value, default):
+    """Seconds since the epoch of a datetime, naive ones taken as UTC"""
+    if value is None:
+        return default
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=EPOCH.tzinfo)
+    return (value - EPOCH).total_seconds()
+
+
+class OfferingIndex(object):
+    """
+    Index of observation offerings by bounding box, time extent, observed
+    property and procedure.
+
+    query() returns offering ids, in capabilities order, ready to be passed
+    to get_observation or get_observations.  Offerings without a bounding
+    box or time extent never match a bbox or time constraint.
+    """
+
+    def __init__(self, offerings):
+        self.offerings = dict((off.id, off) for off in offerings)
+        self._order = dict((off.id, i) for i, off in enumerate(offerings))
+
+        self.by_observed_property = defaultdict(set)
+        self.by_procedure = defaultdict(set)
+        for off in offerings:
+            for prop in off.observed_properties:
+                self.by_observed_property[prop].add(off.id)
+            for procedure in getattr(off, 'procedures', []):
+                self.by_procedure[procedure].add(off.id)
+
+        spatial = []
+        for off in offerings:
+            bbox = normalized_bbox(off)
+            if bbox is not None:
+                spatial.append((bbox[0], off.id, bbox))
+        spatial.sort(key=lambda item: item[0])
+        self._ids = [item[1] for item in spatial]
+        self._minx = [item[0] for item in spatial]
+        self._bboxes = [item[2] for item in spatial]
+
+        inf = float('inf')
+        self._extents = [(_seconds(self.offerings[id].begin_position, -inf),
+                          _seconds(self.offerings[id].end_position, inf))
+                         for id in self._ids]
+        self._timed = [off.id for off in offerings
+                       if off.begin_position is not None or off.end_position is not None]
+        self._timed_extents = [(_seconds(self.offerings[id].begin_position, -inf),
+                                _seconds(self.offerings[id].end_position, inf))
+                               for id in self._timed]
+        if np:
+            self._bbox_array = np.array(self._bboxes, dtype='float64').reshape(-1, 4)
+            self._extent_array = np.array(self._extents, dtype='float64').reshape(-1, 2)
+            self._timed_array = np.array(self._timed_extents, dtype='float64').reshape(-1, 2)
+
+    def __len__(self):
+        return len(self.offerings)
+
+    def _spatial(self, bbox, begin, end):
+        """Ids of offerings intersecting bbox, and the time range if given"""
+        minx, miny, maxx, maxy = bbox
+        # offerings sorted on their west edge: only the ones starting before maxx qualify
+        count = bisect_right(self._minx, maxx)
+        if np:
+            boxes = self._bbox_array[:count]
+            hit = (boxes[:, 2] >= minx) & (boxes[:, 1] <= maxy) & (boxes[:, 3] >= miny)
+            if begin is not None or end is not None:
+                extents = self._extent_array[:count]
+                hit &= (extents[:, 1] >= begin) & (extents[:, 0] <= end)
+            return set(self._ids[i] for i in np.flatnonzero(hit))
+        ids = set()
+        for i in range(count):
+            box = self._bboxes[i]
+            if box[2] >= minx and box[1] <= maxy and box[3] >= miny:
+                if begin is None and end is None or (self._extents[i][1] >= begin and
+                                                     self._extents[i][0] <= end):
+                    ids.add(self._ids[i])
+        return ids
+
+    def _temporal(self, begin, end):
+        """Ids of offerings with a time extent overlapping begin to end"""
+        if np:
+            extents = self._timed_array
+            hit = (extents[:, 1] >= begin) & (extents[:, 0] <= end)
+            return set(self._timed[i] for i in np.flatnonzero(hit))
+        return set(id for id, (start, stop) in zip(self._timed, self._timed_extents)
+                   if stop >= begin and start <= end)
+
+    def query(self, bbox=None, begin=None, end=None, observed_property=None, procedure=None):
+        """
+        Ids of the offerings matching all given constraints: intersecting
+        bbox, a (minx, miny, maxx, maxy) tuple in the easting first order of
+        the offerings' CRS, overlapping the begin to end datetime range
+        (either end may be open), and advertising observed_property and
+        procedure (single values or lists, any of which may match).
+        """
+        inf = float('inf')
+        timed = begin is not None or end is not None
+        start = _seconds(begin, -inf) if timed else None
+        stop = _seconds(end, inf) if timed else None
+
+        candidates = None
+        for lookup, values in ((self.by_observed_property, observed_property),
+                               (self.by_procedure, procedure)):
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            ids = set()
+            for value in values:
+                ids.update(lookup.get(value, ()))
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+
+        if bbox is not None:
+            ids = self._spatial(bbox, start, stop)
+            candidates = ids if candidates is None else candidates & ids
+        elif timed:
+            ids = self._temporal(start, stop)
+            candidates = ids if candidates is None else candidates & ids
+        elif candidates is None:
+            candidates = self.offerings
+
+        return sorted(candidates, key=self._order.__getitem__)
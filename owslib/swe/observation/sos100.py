@@ -1,8 +1,8 @@
 from __future__ import (absolute_import, division, print_function)
 
-import cgi
+from six.moves.urllib.parse import parse_qsl
 from owslib.etree import etree
-from datetime import datetime
+from datetime import datetime, timedelta
 try:                    # Python 3
     from urllib.parse import urlencode
 except ImportError:     # Python 2
@@ -10,8 +10,11 @@ except ImportError:     # Python 2
 from owslib import ows
 from owslib.crs import Crs
 from owslib.fes import FilterCapabilities
+from owslib.instrumentation import instrumented, span
 from owslib.util import openURL, testXMLValue, nspath_eval, nspath, extract_time
 from owslib.namespaces import Namespaces
+from owslib.swe.observation import bulk
+from owslib.swe.observation.index import OfferingIndex
 
 def get_namespaces():
     n = Namespaces()
@@ -62,7 +65,8 @@ class SensorObservationService_1_0_0(object):
             raise ows.ExceptionReport(self._capabilities)
 
         # build metadata objects
-        self._build_metadata()
+        with span('SOS.build'):
+            self._build_metadata()
 
     def getOperationByName(self, name):
         """Return a named content item."""
@@ -106,6 +110,9 @@ class SensorObservationService_1_0_0(object):
             self.contents[off.id] = off
             self.offerings.append(off)
 
+        # spatio-temporal index over the offerings, built on first use
+        self._offering_index = None
+
     def describe_sensor(self,   outputFormat=None,
                                 procedure=None,
                                 method='Get',
@@ -147,6 +154,7 @@ class SensorObservationService_1_0_0(object):
 
         return response
 
+    @instrumented('SOS.GetObservation')
     def get_observation(self,   responseFormat=None,
                                 offerings=None,
                                 observedProperties=None,
@@ -212,6 +220,90 @@ class SensorObservationService_1_0_0(object):
         except BaseException:
             return response
 
+    def get_observations(self,  offerings=None,
+                                observedProperties=None,
+                                begin=None,
+                                end=None,
+                                window=timedelta(days=7),
+                                responseFormat='text/csv',
+                                decoder=bulk.decode_csv,
+                                max_workers=4,
+                                per_host=None,
+                                **kwargs):
+        """
+        Bulk GetObservation, split into one request per offering, observed
+        property and time window and merged into one time ordered result.
+        Offerings are requested by name (falling back to their id), as
+        services like NDBC expect.
+
+        Parameters
+        ----------
+        offerings : list
+            Optional. Offering ids or SosObservationOffering objects, all
+            offerings by default
+        observedProperties : list
+            Optional. Observed properties, those of each offering by default
+        begin, end : datetime
+            Optional. Time range, narrowed to the time extent of each offering
+        window : timedelta
+            Optional. Longest time window of a single request
+        decoder : callable
+            Optional. decoder(response, observed_property) returning the
+            columns of a response, see owslib.swe.observation.bulk
+        max_workers : int
+            Optional. Number of concurrent requests
+        per_host : int
+            Optional. Requests in flight to the service URL at once, set in
+            the shared owslib.util.limiter unless it has a limit for it
+        **kwargs : extra arguments
+            passed on to get_observation
+
+        Returns an owslib.swe.observation.bulk.ObservationColumns; requests
+        that fail are logged and listed in its errors.
+        """
+        return bulk.get_observations(
+            self, offerings=offerings, observedProperties=observedProperties, begin=begin, end=end,
+            window=window, responseFormat=responseFormat, decoder=decoder, max_workers=max_workers,
+            per_host=per_host, offering_key=lambda off: off.name or off.id, **kwargs)
+
+    def describe_sensors(self, procedures=None, outputFormat='text/xml;subtype="sensorML/1.0.1"', cache=None,
+                         max_workers=4, per_host=None, **kwargs):
+        """
+        DescribeSensor for many procedures at once, concurrently and through
+        a cache keyed by procedure.
+
+        Parameters
+        ----------
+        procedures : list
+            Optional. Procedure ids, all procedures of the offerings by default
+        outputFormat : string
+            Optional. SensorML output format
+        cache : owslib.swe.observation.bulk.SensorDescriptionCache
+            Optional. Cache to use, e.g. one kept in a directory between
+            sessions; the shared in-memory cache by default
+        max_workers : int
+            Optional. Number of concurrent requests
+        per_host : int
+            Optional. Requests in flight to the service URL at once, set in
+            the shared owslib.util.limiter unless it has a limit for it
+        **kwargs : extra arguments
+            passed on to describe_sensor
+
+        Returns a dict of lazily parsed SensorML objects keyed by procedure.
+        """
+        return bulk.describe_sensors(self, procedures=procedures, outputFormat=outputFormat, cache=cache,
+                                     max_workers=max_workers, per_host=per_host, **kwargs)
+
+    def get_offering_index(self):
+        """
+            Return the OfferingIndex of the observation offerings, to look
+            up offering ids by bbox, time range, observed property and
+            procedure
+        """
+        if self._offering_index is None:
+            self._offering_index = OfferingIndex(self.offerings)
+        return self._offering_index
+
     def get_operation_by_name(self, name):
         """
             Return a Operation item by name, case insensitive
@@ -296,7 +388,7 @@ class SosCapabilitiesReader(object):
         """
         qs = []
         if service_url.find('?') != -1:
-            qs = cgi.parse_qsl(service_url.split('?')[1])
+            qs = parse_qsl(service_url.split('?')[1])
 
         params = [x[0] for x in qs]
 
@@ -310,6 +402,7 @@ class SosCapabilitiesReader(object):
         urlqs = urlencode(tuple(qs))
         return service_url.split('?')[0] + '?' + urlqs
 
+    @instrumented('SOS.GetCapabilities')
     def read(self, service_url):
         """
             Get and parse a WMS capabilities document, returning an
@@ -321,7 +414,8 @@ class SosCapabilitiesReader(object):
         getcaprequest = self.capabilities_url(service_url)
         spliturl=getcaprequest.split('?')
         u = openURL(spliturl[0], spliturl[1], method='Get', username=self.username, password=self.password)
-        return etree.fromstring(u.read())
+        with span('SOS.parse'):
+            return etree.fromstring(u.read())
 
     def read_string(self, st):
         """
@@ -1,6 +1,10 @@
 from __future__ import (absolute_import, division, print_function)
 
-import cgi
+from six.moves.urllib.parse import parse_qsl
+from array import array
+from collections import namedtuple
+from datetime import timedelta
+from io import BytesIO
 from owslib.etree import etree
 try:
     from urllib.parse import urlencode  # Python 3
@@ -9,10 +13,14 @@ except ImportError:
 from owslib import ows
 from owslib.crs import Crs
 from owslib.fes import FilterCapabilities200
+from owslib.instrumentation import instrumented, span
 from owslib.util import openURL, testXMLValue, testXMLAttribute, nspath_eval, extract_time
 from owslib.namespaces import Namespaces
 from owslib.swe.observation.om import MeasurementObservation
-from owslib.swe.observation.waterml2 import MeasurementTimeseriesObservation
+from owslib.swe.observation.waterml2 import MeasurementTimeseriesObservation, decode_timeseries
+from owslib.dateparse import parse_epoch_ns
+from owslib.swe.observation import bulk
+from owslib.swe.observation.index import OfferingIndex
 
 
 def get_namespaces():
@@ -67,7 +75,8 @@ class SensorObservationService_2_0_0(object):
             raise ows.ExceptionReport(se)
 
         # build metadata objects
-        self._build_metadata()
+        with span('SOS.build'):
+            self._build_metadata()
 
     def getOperationByName(self, name):
         """Return a named content item."""
@@ -116,6 +125,9 @@ class SensorObservationService_2_0_0(object):
             observed_prop = testXMLValue(op)
             self.observed_properties.append(observed_prop)
 
+        # spatio-temporal index over the offerings, built on first use
+        self._offering_index = None
+
     def describe_sensor(self, outputFormat=None, procedure=None, method=None, **kwargs):
 
         method = method or 'Get'
@@ -150,6 +162,7 @@ class SensorObservationService_2_0_0(object):
 
         return response
 
+    @instrumented('SOS.GetObservation')
     def get_observation(self,
                         responseFormat=None,
                         offerings=None,
@@ -157,6 +170,7 @@ class SensorObservationService_2_0_0(object):
                         eventTime=None,
                         procedure=None,
                         method=None,
+                        stream=False,
                         **kwargs):
         """
         Parameters
@@ -165,6 +179,10 @@ class SensorObservationService_2_0_0(object):
             Output format. Provide one that is available for all offerings
         method : string
             Optional. HTTP DCP method name: Get or Post.  Must
+        stream : bool
+            Optional. Return a file-like object over the response body
+            instead of the downloaded response, for iter_observations.
+            Exception reports are then raised while decoding.
         **kwargs : extra arguments
             anything else e.g. vendor specific parameters
         """
@@ -202,7 +220,11 @@ class SensorObservationService_2_0_0(object):
             for kw in kwargs:
                 request[kw] = kwargs[kw]
 
-        response = openURL(base_url, request, method, username=self.username, password=self.password, **url_kwargs).read()
+        response = openURL(base_url, request, method, username=self.username, password=self.password,
+                           stream=stream, **url_kwargs)
+        if stream:
+            return response.raw()
+        response = response.read()
         try:
             tr = etree.fromstring(response)
             if tr.tag == nspath_eval("ows:ExceptionReport", namespaces):
@@ -214,6 +236,97 @@ class SensorObservationService_2_0_0(object):
         except BaseException:
             return response
 
+    def get_observations(self,
+                         offerings=None,
+                         observedProperties=None,
+                         begin=None,
+                         end=None,
+                         window=timedelta(days=7),
+                         responseFormat='http://www.opengis.net/om/2.0',
+                         decoder=None,
+                         max_workers=4,
+                         per_host=None,
+                         **kwargs):
+        """
+        Bulk GetObservation, split into one request per offering, observed
+        property and time window and merged into one time ordered result.
+
+        Parameters
+        ----------
+        offerings : list
+            Optional. Offering ids or SosObservationOffering objects, all
+            offerings by default
+        observedProperties : list
+            Optional. Observed properties, those of each offering by default
+        begin, end : datetime
+            Optional. Time range, narrowed to the time extent of each offering
+        window : timedelta
+            Optional. Longest time window of a single request
+        decoder : callable
+            Optional. decoder(response, observed_property) returning the
+            columns of a response, see owslib.swe.observation.bulk.  By
+            default O&M 2.0 responses are streamed through decode_columns.
+        max_workers : int
+            Optional. Number of concurrent requests
+        per_host : int
+            Optional. Requests in flight to the service URL at once, set in
+            the shared owslib.util.limiter unless it has a limit for it
+        **kwargs : extra arguments
+            passed on to get_observation
+
+        Returns an owslib.swe.observation.bulk.ObservationColumns; requests
+        that fail are logged and listed in its errors.
+        """
+        kwargs.setdefault('namespaces', 'xmlns(om,http://www.opengis.net/om/2.0)')
+        if decoder is None:
+            decoder = decode_columns
+            kwargs.setdefault('stream', True)
+        return bulk.get_observations(
+            self, offerings=offerings, observedProperties=observedProperties, begin=begin, end=end,
+            window=window, responseFormat=responseFormat, decoder=decoder, max_workers=max_workers,
+            per_host=per_host,
+            time_filter=lambda start, stop: 'om:phenomenonTime,%s/%s' % (bulk.format_time(start),
+                                                                          bulk.format_time(stop)),
+            **kwargs)
+
+    def describe_sensors(self, procedures=None, outputFormat='http://www.opengis.net/sensorML/1.0.1', cache=None,
+                         max_workers=4, per_host=None, **kwargs):
+        """
+        DescribeSensor for many procedures at once, concurrently and through
+        a cache keyed by procedure.
+
+        Parameters
+        ----------
+        procedures : list
+            Optional. Procedure ids, all procedures of the offerings by default
+        outputFormat : string
+            Optional. SensorML output format
+        cache : owslib.swe.observation.bulk.SensorDescriptionCache
+            Optional. Cache to use, e.g. one kept in a directory between
+            sessions; the shared in-memory cache by default
+        max_workers : int
+            Optional. Number of concurrent requests
+        per_host : int
+            Optional. Requests in flight to the service URL at once, set in
+            the shared owslib.util.limiter unless it has a limit for it
+        **kwargs : extra arguments
+            passed on to describe_sensor
+
+        Returns a dict of lazily parsed SensorML objects keyed by procedure.
+        """
+        return bulk.describe_sensors(self, procedures=procedures, outputFormat=outputFormat, cache=cache,
+                                     max_workers=max_workers, per_host=per_host, **kwargs)
+
+    def get_offering_index(self):
+        """
+            Return the OfferingIndex of the observation offerings, to look
+            up offering ids by bbox, time range, observed property and
+            procedure
+        """
+        if self._offering_index is None:
+            self._offering_index = OfferingIndex(self.offerings)
+        return self._offering_index
+
     def get_operation_by_name(self, name):
         """
             Return a Operation item by name, case insensitive
@@ -300,7 +413,7 @@ class SosCapabilitiesReader(object):
         """
         qs = []
         if service_url.find('?') != -1:
-            qs = cgi.parse_qsl(service_url.split('?')[1])
+            qs = parse_qsl(service_url.split('?')[1])
 
         params = [x[0] for x in qs]
 
@@ -314,6 +427,7 @@ class SosCapabilitiesReader(object):
         urlqs = urlencode(tuple(qs))
         return service_url.split('?')[0] + '?' + urlqs
 
+    @instrumented('SOS.GetCapabilities')
     def read(self, service_url):
         """
             Get and parse a WMS capabilities document, returning an
@@ -325,7 +439,8 @@ class SosCapabilitiesReader(object):
         getcaprequest = self.capabilities_url(service_url)
         spliturl = getcaprequest.split('?')
         u = openURL(spliturl[0], spliturl[1], method='Get', username=self.username, password=self.password)
-        return etree.fromstring(u.read())
+        with span('SOS.parse'):
+            return etree.fromstring(u.read())
 
     def read_string(self, st):
         """
@@ -385,3 +500,165 @@ class ObservationDecoder(object):
             return MeasurementTimeseriesObservation(element)
         else:
             raise NotImplementedError('Result type {} not supported'.format(result_type))
+
+
+# tags used by the streaming decoder, resolved once
+_OBSERVATION_DATA = nspath_eval("sos:observationData", namespaces)
+_OM_OBSERVATION = nspath_eval("om20:OM_Observation", namespaces)
+_EXCEPTION_REPORT = nspath_eval("ows:ExceptionReport", namespaces)
+_PROCEDURE = nspath_eval("om20:procedure", namespaces)
+_OBSERVED_PROPERTY = nspath_eval("om20:observedProperty", namespaces)
+_FEATURE = nspath_eval("om20:featureOfInterest", namespaces)
+_PHENOMENON_TIME = nspath_eval("om20:phenomenonTime", namespaces)
+_TIME_POSITION = nspath_eval("gml32:timePosition", namespaces)
+_END_POSITION = nspath_eval("gml32:endPosition", namespaces)
+_RESULT = nspath_eval("om20:result", namespaces)
+_HREF = nspath_eval("xlink:href", namespaces)
+_GML_ID = nspath_eval("gml32:id", namespaces)
+_MEASUREMENT_TIMESERIES = '{http://www.opengis.net/waterml/2.0}MeasurementTimeseries'
+_TIMESERIES_UOM = ('{http://www.opengis.net/waterml/2.0}defaultPointMetadata/'
+                   '{http://www.opengis.net/waterml/2.0}DefaultTVPMeasurementMetadata/'
+                   '{http://www.opengis.net/waterml/2.0}uom')
+
+ObservationRow = namedtuple('ObservationRow', 'procedure observed_property time value uom feature')
+
+
+def iter_observations(source):
+    """ Stream the om:OM_Observation elements of a GetObservationResponse.
+
+    source is a filename or a file-like object such as the body returned by
+    get_observation(stream=True).  Each element is cleared, and dropped from
+    the tree, once the consumer asks for the next one, so memory use does
+    not grow with the size of the response.  Raises ows.ExceptionReport for
+    exception reports.
+    """
+    root = None
+    for event, element in etree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            continue
+        if element.tag == _OM_OBSERVATION:
+            yield element
+            element.clear()
+        elif element.tag == _OBSERVATION_DATA:
+            element.clear()
+            if root is not None and element in root:
+                root.remove(element)
+        elif element is root and element.tag == _EXCEPTION_REPORT:
+            raise ows.ExceptionReport(element)
+
+
+def _href(element):
+    return element.get(_HREF) if element is not None else None
+
+
+def observation_rows(element, time_positions=None):
+    """ Rows (procedure, observed_property, time, value, uom, feature) of an
+    om:OM_Observation element with a single measurement or a WaterML 2.0
+    measurement timeseries as result.
+
+    Times are nanoseconds since the epoch (UTC) and missing values NaN.
+    time_positions maps gml:ids of time instants seen so far to their
+    positions, to resolve phenomenon times given by reference; it is
+    updated with the instants of this observation.
+    """
+    procedure = _href(element.find(_PROCEDURE))
+    observed_property = _href(element.find(_OBSERVED_PROPERTY))
+    feature = _href(element.find(_FEATURE))
+    result = element.find(_RESULT)
+    if result is None:
+        return []
+
+    timeseries = result.find(_MEASUREMENT_TIMESERIES)
+    if timeseries is not None:
+        times, values, mask, _ = decode_timeseries(timeseries)
+        uom = timeseries.find(_TIMESERIES_UOM)
+        uom = uom.get('code') if uom is not None else None
+        if hasattr(times, 'view'):
+            times = times.view('int64').tolist()
+            mask = mask.tolist()
+            values = values.tolist()
+        nan = float('nan')
+        return [ObservationRow(procedure, observed_property, t, nan if m else v, uom, feature)
+                for t, v, m in zip(times, values, mask)]
+
+    position = None
+    phenomenon_time = element.find(_PHENOMENON_TIME)
+    if phenomenon_time is not None and len(phenomenon_time):
+        primitive = phenomenon_time[0]
+        instant = primitive.find(_TIME_POSITION)
+        if instant is None:
+            instant = primitive.find(_END_POSITION)
+        if instant is not None:
+            position = instant.text
+            if time_positions is not None and primitive.get(_GML_ID):
+                time_positions[primitive.get(_GML_ID)] = position
+    elif phenomenon_time is not None and time_positions is not None:
+        position = time_positions.get((_href(phenomenon_time) or '').lstrip('#'))
+    if not position:
+        return []
+    try:
+        value = float(result.text)
+    except (TypeError, ValueError):
+        value = float('nan')
+    return [ObservationRow(procedure, observed_property, parse_epoch_ns(position.strip())[0],
+                           value, result.get('uom'), feature)]
+
+
+def iter_observation_rows(source):
+    """ Stream ObservationRow tuples from a GetObservationResponse, see
+    iter_observations and observation_rows """
+    time_positions = {}
+    for element in iter_observations(source):
+        for row in observation_rows(element, time_positions):
+            yield row
+
+
+try:
+    array('q')
+    _TIME_TYPECODE = 'q'
+except ValueError:      # Python 2 has no 64 bit integer arrays, 'l' is 32 bits on some platforms
+    _TIME_TYPECODE = None
+
+
+class ObservationBuffers(object):
+    """ Columnar buffers filled from streamed observation rows.
+
+    time (nanoseconds since the epoch) and value are kept in compact
+    typed arrays, the other columns as lists sharing one string object per
+    distinct value.  On Python 2 time is a list.
+    """
+    def __init__(self):
+        self.columns = {'time': array(_TIME_TYPECODE) if _TIME_TYPECODE else [], 'value': array('d'), 'procedure': [],
+                        'observed_property': [], 'uom': [], 'feature': []}
+        self._strings = {}
+
+    def append(self, row):
+        strings = self._strings
+        columns = self.columns
+        columns['time'].append(row.time)
+        columns['value'].append(row.value)
+        for name in ('procedure', 'observed_property', 'uom', 'feature'):
+            value = getattr(row, name)
+            columns[name].append(strings.setdefault(value, value))
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+        return self
+
+    def __len__(self):
+        return len(self.columns['time'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+
+def decode_columns(response, observed_property=None):
+    """ Decode a GetObservationResponse (bytes or file-like) into the
+    columns merged by bulk GetObservation.  observed_property is ignored,
+    the properties are taken from the response. """
+    if isinstance(response, (bytes, str)):
+        response = BytesIO(response if isinstance(response, bytes) else response.encode('utf-8'))
+    return ObservationBuffers().extend(iter_observation_rows(response)).columns
@@ -10,8 +10,12 @@ from owslib.util import nspath_eval
 from owslib.namespaces import Namespaces
 from owslib.util import testXMLAttribute, testXMLValue
 from owslib.swe.common import Quantity
-from dateutil import parser
+from owslib.dateparse import parse_datetime, parse_epoch_ns
 from owslib.swe.observation.om import OM_Observation, Result
+from owslib.lazy import LazyModule
+
+# numpy is optional, and imported on first use
+np = LazyModule('numpy', optional=True)
 
 
 def get_namespaces():
@@ -25,6 +29,71 @@ def nspv(path):
     return nspath_eval(path, namespaces)
 
 
+# tags used by the time-value pair decoder, resolved once instead of per point
+_POINT = nspv("wml2:point")
+_TIME = nspv("wml2:time")
+_VALUE = nspv("wml2:value")
+_METADATA = nspv("wml2:metadata")
+_NIL_REASON = nspv("wml2:TVPMeasurementMetadata/wml2:nilReason")
+_XSI_NIL = nspv("xsi:nil")
+
+
+def decode_timeseries(element, dates=None):
+    ''' Decode the wml2:point elements of a MeasurementTimeseries in one pass.
+
+    Returns (times, values, mask, tz_aware) where times are nanoseconds since
+    the epoch (UTC), values are floats and mask flags missing values: empty
+    or non-numeric values, NaN, xsi:nil and TVP metadata carrying a
+    nilReason.  When NumPy is available the three sequences are
+    datetime64[ns], float64 and bool arrays, otherwise plain lists.
+    The time strings are appended to the list dates if one is given.
+    '''
+    times = []
+    values = []
+    mask = []
+    tz_aware = False
+    nan = float('nan')
+
+    for point in element.iterfind(_POINT):
+        for tvp in point:
+            date_str = None
+            value_str = None
+            missing = False
+            for child in tvp:
+                tag = child.tag
+                if tag == _TIME:
+                    date_str = child.text
+                elif tag == _VALUE:
+                    value_str = child.text
+                    if child.get(_XSI_NIL) in ('true', '1'):
+                        missing = True
+                elif tag == _METADATA:
+                    if child.find(_NIL_REASON) is not None:
+                        missing = True
+            try:
+                ns, aware = parse_epoch_ns(date_str)
+            except Exception:
+                raise ValueError("Error parsing datetime string: %s" % date_str)
+            tz_aware = tz_aware or aware
+            try:
+                value = float(value_str)
+            except (TypeError, ValueError):
+                value = nan
+            times.append(ns)
+            values.append(value)
+            if dates is not None:
+                dates.append(date_str)
+            mask.append(missing or value != value)
+
+    if np:
+        # times outside the datetime64[ns] range become NaT
+        nat, largest = np.iinfo('int64').min, np.iinfo('int64').max
+        times = np.array([t if nat < t <= largest else nat for t in times], dtype='int64').view('datetime64[ns]')
+        values = np.array(values, dtype='float64')
+        mask = np.array(mask, dtype=bool)
+    return times, values, mask, tz_aware
+
+
 class MeasurementTimeseriesObservation(OM_Observation):
     ''' A timeseries observation that has a measurement timeseries as
     result. An implementation of the WaterML2
@@ -58,17 +127,34 @@ class MeasurementTimeseries(Timeseries):
         self.defaultTVPMetadata = TVPMeasurementMetadata(element.find(
             nspv("wml2:defaultPointMetadata/wml2:DefaultTVPMeasurementMetadata")))
 
-        elems = element.findall(nspv("wml2:point"))
-        self.points = []
-        for point in elems:
-            self.points.append(TimeValuePair(point))
+        self._dates = []
+        self.times, self.values, self.mask, _ = decode_timeseries(element, self._dates)
+        self._points = None
+
+    def get_arrays(self):
+        ''' Return the (times, values, mask) arrays of the timeseries: times
+        as datetime64[ns] (UTC), values as float64 and a boolean mask of
+        missing values.  Requires NumPy. '''
+        if not np:
+            raise ImportError("NumPy is required for array access to timeseries")
+        return self.times, self.values, self.mask
+
+    @property
+    def points(self):
+        ''' TimeValuePairs of the timeseries, built on first access.  Their
+        datetimes are parsed from the time strings as they are, keeping
+        their offsets and dates outside the range of the arrays. '''
+        if self._points is None:
+            self._points = list(self)
+        return self._points
 
     def __iter__(self):
-        for point in self.points:
-            yield point
+        values = self.values.tolist() if np else self.values
+        for date_str, value in zip(self._dates, values):
+            yield TimeValuePair(datetime=parse_datetime(date_str), value=value)
 
     def __len__(self):
-        return len(self.points)
+        return len(self.values)
 
     def _parse_metadata(self, element):
         ''' Parse metadata elements relating to timeseries:
@@ -82,11 +168,16 @@ class TimeValuePair(object):
     ''' A time-value pair as specified by WaterML2.0
         Currently no support for tvp metadata.
     '''
-    def __init__(self, element):
+    def __init__(self, element=None, datetime=None, value=None):
+        if element is None:
+            self.datetime = datetime
+            self.value = value
+            return
+
         date_str = testXMLValue(
             element.find(nspv("wml2:MeasurementTVP/wml2:time")))
         try:
-            self.datetime = parser.parse(date_str)
+            self.datetime = parse_datetime(date_str)
         except:
             raise ValueError("Error parsing datetime string: %s" % date_str)
 
@@ -27,7 +27,56 @@ class SensorML(object):
         if hasattr(self._root, 'getroot'):
             self._root = self._root.getroot()
 
-        self.members = [Member(x) for x in self._root.findall(nsp('sml:member'))]
+        self._members = None
+        self._summary = None
+
+    @property
+    def members(self):
+        """ Fully parsed members, built on first access """
+        if self._members is None:
+            self._members = [Member(x) for x in self._root.findall(nsp('sml:member'))]
+        return self._members
+
+    @property
+    def summary(self):
+        """ SensorSummary of the first member, without parsing the whole document """
+        if self._summary is None:
+            self._summary = SensorSummary(self._root)
+        return self._summary
+
+class SensorSummary(object):
+    """ Identifiers, classifiers, keywords and location of the first process of a
+    SensorML document, read straight from the tree.  Cheaper than the full
+    parse by members when building catalogues of many sensors. """
+    def __init__(self, element):
+        member = element.find(nsp('sml:member'))
+        process = member[-1] if member is not None and len(member) else element
+
+        self.id          = testXMLAttribute(process, nsp('gml:id'))
+        self.name        = testXMLValue(process.find(nsp('gml:name')))
+        self.description = testXMLValue(process.find(nsp('gml:description')))
+        self.keywords    = extract_xml_list(process.findall(nsp('sml:keywords/sml:KeywordList/sml:keyword')))
+
+        self.identifiers = {}
+        for identifier in process.findall(nsp('sml:identification/sml:IdentifierList/sml:identifier')):
+            self.identifiers[testXMLAttribute(identifier, 'name')] = testXMLValue(identifier.find(nsp('sml:Term/sml:value')))
+
+        self.classifiers = {}
+        for classifier in process.findall(nsp('sml:classification/sml:ClassifierList/sml:classifier')):
+            self.classifiers[testXMLAttribute(classifier, 'name')] = testXMLValue(classifier.find(nsp('sml:Term/sml:value')))
+
+        # gml:Point location, as found in the axis order of its srsName
+        self.location     = None
+        self.location_srs = None
+        point = process.find(nsp('sml:location/gml:Point'))
+        if point is not None:
+            self.location_srs = testXMLAttribute(point, 'srsName')
+            coordinates = testXMLValue(point.find(nsp('gml:pos'))) or testXMLValue(point.find(nsp('gml:coordinates')))
+            if coordinates:
+                try:
+                    self.location = tuple(float(c) for c in coordinates.replace(',', ' ').split())
+                except ValueError:
+                    self.location = None
 
 class Member(object):
     def __new__(cls, element):
@@ -18,6 +18,7 @@
 from __future__ import (absolute_import, division, print_function)
 
 from .etree import etree
+from .instrumentation import instrumented, span
 from .util import openURL, testXMLValue, ServiceException
 
 
@@ -61,7 +62,8 @@ class TileMapService(object):
             self._capabilities = reader.read(self.url, timeout=self.timeout)
 
         # build metadata objects
-        self._buildMetadata(parse_remote_metadata)
+        with span('TMS.build'):
+            self._buildMetadata(parse_remote_metadata)
 
 
     def _getcapproperty(self):
@@ -126,6 +128,7 @@ class TileMapService(object):
         else:
             raise ValueError('cannot find zoomlevel %i for TileMap' % z)
 
+    @instrumented('TMS.GetTile')
     def gettile(self, x,y,z, id=None, title=None, srs=None, mimetype=None, timeout=None):
         if not id and not title and not srs:
             raise ValueError('either id or title and srs must be specified')
@@ -317,12 +320,14 @@ class TMSCapabilitiesReader(object):
         self.password = pw
 
 
+    @instrumented('TMS.GetCapabilities')
     def read(self, service_url, timeout=30):
         """Get and parse a TMS capabilities document, returning an
         elementtree instance
         """
         u = openURL(service_url, '', method='Get', username=self.username, password=self.password, timeout=timeout)
-        return etree.fromstring(u.read())
+        with span('TMS.parse'):
+            return etree.fromstring(u.read())
 
     def readString(self, st):
         """Parse a TMS capabilities document, returning an elementtree instance
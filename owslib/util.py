@@ -9,14 +9,23 @@
 
 from __future__ import (absolute_import, division, print_function)
 
+import hashlib
+import os
+import random
 import sys
-from collections import OrderedDict
-from dateutil import parser
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from collections import OrderedDict, deque
 from datetime import datetime
 import pytz
 from owslib.etree import etree, ParseError
 from owslib.namespaces import Namespaces
-from six.moves.urllib.parse import urlsplit, urlencode, urlparse, parse_qs, urlunparse
+from owslib.dateparse import parse_datetime
+from owslib import instrumentation
+from owslib.lazy import LazyModule
+from six.moves.urllib.parse import urlsplit, urlencode, urlparse, parse_qs, parse_qsl, urlunparse
 
 try:
     from StringIO import StringIO  # Python 2
@@ -24,18 +33,19 @@ try:
 except ImportError:
     from io import StringIO, BytesIO  # Python 3
 
-import cgi
 import re
 from copy import deepcopy
 import warnings
 import six
-import requests
 import codecs
 
 """
 Utility functions and classes
 """
 
+# imported on first request, it is the larger part of import time otherwise
+requests = LazyModule('requests')
+
 class ServiceException(Exception):
     #TODO: this should go in ows common module when refactored.  
     pass
@@ -119,27 +129,585 @@ class ResponseWrapper(object):
     Return object type from openURL.
 
     Provides a thin shim around requests response object to maintain code compatibility.
+    Responses opened with stream=True hold their limiter slot until the body is read
+    (through read() or to the end of raw()) or closed.
     """
-    def __init__(self, response):
+    def __init__(self, response, release=None):
         self._response = response
+        self._release = release or _noop
 
     def info(self):
         return self._response.headers
 
     def read(self):
-        return self._response.content
+        try:
+            return self._response.content
+        finally:
+            self._release()
 
     def geturl(self):
         return self._response.url.replace('&&', '&')
 
+    def raw(self):
+        """File-like object over the body of a response opened with stream=True"""
+        self._response.raw.decode_content = True
+        return _StreamedBody(self._response.raw, self._release)
+
+    def close(self):
+        try:
+            self._response.close()
+        finally:
+            self._release()
+
+    def __del__(self):
+        # responses dropped unread do not keep their slot
+        self._release()
+
+def _noop():
+    pass
+
+class _StreamedBody(object):
+    """Body of a streamed response, calling release once read to the end or closed"""
+
+    def __init__(self, raw, release):
+        self._raw = raw
+        self._release = release
+
+    def read(self, *args, **kwargs):
+        data = self._raw.read(*args, **kwargs)
+        if not data or not (args or kwargs):
+            self._release()
+        return data
+
+    def readinto(self, buffer):
+        count = self._raw.readinto(buffer)
+        if not count:
+            self._release()
+        return count
+
+    def __iter__(self):
+        for line in self._raw:
+            yield line
+        self._release()
+
+    def close(self):
+        try:
+            self._raw.close()
+        finally:
+            self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
     # @TODO: __getattribute__ for poking at response
 
-def openURL(url_base, data=None, method='Get', cookies=None, username=None, password=None, timeout=30, headers=None):
+class DocumentCache(object):
+    """
+    Thread-safe store of raw documents (bytes) keyed by tuples.
+
+    With a directory the documents are also written there, one file per
+    key, so the cache survives the session and can be shared between
+    processes; without one it only lives in memory.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._store = {}
+        self._lock = threading.Lock()
+        if directory is not None and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, key):
+        digest = hashlib.sha1('\n'.join(str(k) for k in key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.xml')
+
+    def get(self, key):
+        with self._lock:
+            value = self._store.get(key)
+        if value is None and self.directory is not None:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    value = f.read()
+            except (IOError, OSError):
+                return None
+            with self._lock:
+                self._store[key] = value
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._store[key] = value
+        if self.directory is not None:
+            # write to a temporary file first so readers never see partial documents
+            handle, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(handle, 'wb') as f:
+                f.write(value)
+            path = self._path(key)
+            if hasattr(os, 'replace'):
+                os.replace(tmp, path)
+            else:
+                if os.path.exists(path):
+                    os.remove(path)
+                os.rename(tmp, path)
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith('.xml'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._store)
+
+
+class CircuitOpenError(IOError):
+    """Requests to the host are not sent while its circuit breaker is open"""
+    pass
+
+
+class DeadlineExceeded(IOError):
+    """The time of the deadline() in force ran out"""
+    pass
+
+
+# status codes of responses counted as failures of the host
+_UNHEALTHY = (500, 502, 503, 504)
+
+
+def _retry_after(value):
+    """Seconds to wait according to a Retry-After header (delay-seconds or HTTP-date), None if unparsable"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    from email.utils import mktime_tz, parsedate_tz
+    try:
+        return max(0.0, mktime_tz(parsedate_tz(value)) - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class RetryPolicy(object):
+    """
+    When and after how long failed requests are sent again.
+
+    Requests failing with a connection error, a timeout or a response
+    status in statuses are sent up to retries more times.  Before retry n
+    (from 0) backoff * 2 ** n seconds, at most max_backoff, are waited; with
+    jitter a random part of that, so clients failing together do not
+    retry together.  A Retry-After header of the response takes the place
+    of the backoff; when it asks for more than max_backoff the request is
+    not retried.
+
+    Only requests of methods are retried.  POST is left out by default as
+    it is also used for transactions; add it for services only queried
+    with POST (CSW GetRecords, WFS GetFeature).  Chunked POST bodies
+    (iterators) are never sent twice.
+    """
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30, jitter=True,
+                 statuses=(429, 500, 502, 503, 504), methods=('GET',)):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = tuple(statuses)
+        self.methods = tuple(m.upper() for m in methods)
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry attempt (from 0), None not to retry"""
+        if retry_after is not None:
+            seconds = _retry_after(retry_after)
+            if seconds is not None:
+                return seconds if seconds <= self.max_backoff else None
+        seconds = min(self.max_backoff, self.backoff * 2 ** attempt)
+        if self.jitter:
+            seconds = random.uniform(0, seconds)
+        return seconds
+
+    def __repr__(self):
+        return 'RetryPolicy(retries=%r, backoff=%r, max_backoff=%r, jitter=%r, statuses=%r, methods=%r)' % (
+            self.retries, self.backoff, self.max_backoff, self.jitter, self.statuses, self.methods)
+
+
+class CircuitBreaker(object):
+    """
+    Thread-safe circuit breakers of the hosts requests are sent to.
+
+    After failures consecutive failed requests to a host (connection
+    errors, timeouts, 500/502/503/504 responses) its circuit opens:
+    requests to it raise CircuitOpenError without being sent.  After
+    reset_timeout seconds the circuit is half-open and one trial request
+    is let through; its success closes the circuit, its failure opens it
+    again for another reset_timeout.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+    def __init__(self, failures=5, reset_timeout=30):
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self._hosts = {}    # host -> [state, consecutive failures, time of the last state change]
+        self._lock = threading.Lock()
+
+    def state(self, host):
+        """State of the circuit of host"""
+        with self._lock:
+            return self._hosts.get(host.lower(), [self.CLOSED])[0]
+
+    def allow(self, host):
+        """Raise CircuitOpenError unless a request to host may be sent now"""
+        host = host.lower()
+        with self._lock:
+            circuit = self._hosts.get(host)
+            if circuit is None or circuit[0] == self.CLOSED:
+                return
+            waited = time.time() - circuit[2]
+            # a trial whose outcome never got recorded does not block the host for good
+            if waited < self.reset_timeout:
+                if circuit[0] == self.OPEN:
+                    raise CircuitOpenError('Circuit breaker for %s is open, retry in %.1fs'
+                                           % (host, self.reset_timeout - waited))
+                raise CircuitOpenError('Circuit breaker for %s is half-open, a trial request is under way' % host)
+            circuit[0], circuit[2] = self.HALF_OPEN, time.time()
+        log.info('Circuit breaker for %s half-open after %.1fs, sending a trial request', host, waited)
+
+    def record(self, host, success, reason=''):
+        """Record the outcome of a request to host"""
+        host = host.lower()
+        with self._lock:
+            circuit = self._hosts.setdefault(host, [self.CLOSED, 0, time.time()])
+            previous = circuit[0]
+            if success:
+                circuit[:] = [self.CLOSED, 0, time.time()]
+            else:
+                circuit[1] += 1
+                if previous == self.HALF_OPEN or circuit[1] >= self.failures:
+                    circuit[0], circuit[2] = self.OPEN, time.time()
+            state, failures = circuit[0], circuit[1]
+        if state == previous:
+            return
+        if state == self.OPEN:
+            log.warning('Circuit breaker for %s opened for %ss after %d failures: %s',
+                        host, self.reset_timeout, failures, reason)
+        else:
+            log.info('Circuit breaker for %s closed', host)
+
+    def reset(self):
+        """Close all circuits"""
+        with self._lock:
+            self._hosts.clear()
+
+
+# applied to the requests of openURL and http_post (and the asyncio transport),
+# None for neither:  owslib.util.retry_policy = RetryPolicy(methods=('GET', 'POST'))
+retry_policy = None
+circuit_breaker = None
+
+try:
+    # Python 3.7+: deadlines follow asyncio tasks as well as threads
+    from contextvars import ContextVar
+    _deadline = ContextVar('owslib_deadline', default=None)
+except ImportError:
+    _deadline = None
+    _deadlines = threading.local()
+
+
+def _deadline_end():
+    if _deadline is not None:
+        return _deadline.get()
+    return getattr(_deadlines, 'end', None)
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Limit the requests made by openURL and http_post in the block to
+    seconds in all, retries and backoff included, e.g. for a whole paged
+    harvest.  Requests get no more than the time left as their timeout,
+    are not retried past it and raise DeadlineExceeded once it is spent.
+    An inner deadline can shorten, not extend, the outer one.  Deadlines
+    hold for the current thread, and on Python 3.7+ for the current
+    asyncio task (the asyncio transport honours them too).
+    """
+    end = time.time() + seconds
+    outer = _deadline_end()
+    if outer is not None:
+        end = min(end, outer)
+    if _deadline is not None:
+        token = _deadline.set(end)
+        try:
+            yield
+        finally:
+            _deadline.reset(token)
+    else:
+        _deadlines.end = end
+        try:
+            yield
+        finally:
+            _deadlines.end = outer
+
+
+def remaining_time():
+    """Seconds left of the deadline() in force, None without one"""
+    end = _deadline_end()
+    if end is None:
+        return None
+    return end - time.time()
+
+
+def _retry_delay(policy, method, url, attempt, reason, retry_after=None):
+    """Seconds to wait before retrying a failed request under policy, None not to retry; logs the decision"""
+    if policy is None or method not in policy.methods or attempt >= policy.retries:
+        return None
+    delay = policy.delay(attempt, retry_after)
+    if delay is None:
+        log.warning('Not retrying %s %s (%s): Retry-After %s exceeds %ss', method, url, reason, retry_after,
+                    policy.max_backoff)
+        return None
+    left = remaining_time()
+    if left is not None and delay >= left:
+        log.warning('Not retrying %s %s (%s): %.2fs left of the deadline', method, url, reason, max(0, left))
+        return None
+    log.warning('Retrying %s %s in %.2fs (retry %d of %d): %s', method, url, delay, attempt + 1, policy.retries,
+                reason)
+    return delay
+
+
+class _HostLimit(object):
+    """
+    Token bucket and in-flight slots of a host or configured URL.  Its
+    methods do not block, so threads and event loops can share it.
+    """
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate or 0)
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._tokens = self.burst
+        self._updated = time.time()
+        self._waiters = deque()     # callables waking the callers waiting for a slot
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, returning the seconds until it is due"""
+        if not self.rate:
+            return 0
+        with self._lock:
+            now = time.time()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0
+
+    def enter(self, wake):
+        """Take an in-flight slot: True if one is free, otherwise wake() is called when one is handed over"""
+        with self._lock:
+            if self.max_in_flight is None or (self.in_flight < self.max_in_flight and not self._waiters):
+                self.in_flight += 1
+                return True
+            self._waiters.append(wake)
+            return False
+
+    def withdraw(self, wake):
+        """Stop waiting for a slot: False if it was handed over already, leave() it then"""
+        with self._lock:
+            try:
+                self._waiters.remove(wake)
+                return True
+            except ValueError:
+                return False
+
+    def leave(self):
+        """Give the slot back, to the longest waiting caller if any"""
+        with self._lock:
+            if not self._waiters:
+                self.in_flight -= 1
+                return
+            wake = self._waiters.popleft()
+        wake()
+
+
+class Limiter(object):
+    """
+    Rate and concurrency limits of the requests sent to each host,
+    shared by all threads and event loops sending them.
+
+    rate: requests per second, with bursts of up to burst requests
+        (default max(1, rate)); None for no rate limit
+    max_in_flight: requests waiting for a response at once; None for no limit
+
+    The limits given here apply to each host separately.  configure() sets
+    those of a service URL: requests to it and to URLs under it share them
+    (the longest configured URL applies), others to the same host do not.
+    """
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self._hosts = {}        # host -> _HostLimit of the default limits
+        self._configured = {}   # host -> [(path, _HostLimit)], longest path first
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _split(url):
+        parts = urlsplit(url if '//' in url else '//' + url)
+        return parts.netloc.lower(), parts.path.rstrip('/')
+
+    def configure(self, url, rate=None, burst=None, max_in_flight=None):
+        """Limit the requests to url (or host[:port]) and the URLs under it"""
+        host, path = self._split(url)
+        with self._lock:
+            paths = [p for p in self._configured.get(host, []) if p[0] != path]
+            paths.append((path, _HostLimit(rate, burst, max_in_flight)))
+            paths.sort(key=lambda p: len(p[0]), reverse=True)
+            self._configured[host] = paths
+
+    def limit(self, url):
+        """_HostLimit of the requests to url, None if they are not limited"""
+        if not self._configured and self.rate is None and self.max_in_flight is None:
+            return None
+        host, path = self._split(url)
+        with self._lock:
+            for prefix, limit in self._configured.get(host, ()):
+                if path == prefix or path.startswith(prefix + '/'):
+                    return limit
+            if self.rate is None and self.max_in_flight is None:
+                return None
+            if host not in self._hosts:
+                self._hosts[host] = _HostLimit(self.rate, self.burst, self.max_in_flight)
+            return self._hosts[host]
+
+    def acquire(self, url):
+        """
+        Wait until a request to url may be sent, within the deadline() in
+        force; returns what to pass to release() once it is answered.
+        """
+        limit = self.limit(url)
+        if limit is None:
+            return None
+        event = threading.Event()
+        if not limit.enter(event.set):
+            left = remaining_time()
+            if not event.wait(None if left is None else max(0, left)) and limit.withdraw(event.set):
+                raise DeadlineExceeded('Deadline exceeded waiting for a request slot of %s' % url)
+        delay = limit.reserve()
+        if delay:
+            left = remaining_time()
+            if left is not None and delay > left:
+                limit.leave()
+                raise DeadlineExceeded('Deadline exceeded waiting %.2fs for the rate limit of %s' % (delay, url))
+            log.debug('Waiting %.2fs for the rate limit of %s', delay, url)
+            time.sleep(delay)
+        return limit
+
+    def release(self, limit):
+        """Release what acquire() returned"""
+        if limit is not None:
+            limit.leave()
+
+
+# requests of openURL and http_post (and the asyncio transport) pass through it:
+#   owslib.util.limiter.configure('https://example.org/geoserver/wms', rate=5, max_in_flight=4)
+# or replace it to limit every host:  owslib.util.limiter = Limiter(rate=10, max_in_flight=8)
+limiter = Limiter()
+
+
+def _releaser(limit):
+    """Callable releasing the limiter slot limit once, however often it is called"""
+    held = [limit] if limit is not None else []
+
+    def release():
+        try:
+            limit = held.pop()
+        except IndexError:
+            return
+        limit.leave()
+    return release
+
+
+def _send(method, url, session=None, **rkwargs):
+    """
+    requests.request, or session.request, under the retry policy, circuit
+    breaker, limiter and deadline in force.  Returns (response, release):
+    the limiter slot of a stream=True response is held until release() is
+    called, that of other responses is released already.
+    """
+    stream = rkwargs.get('stream', False)
+    policy, breaker = retry_policy, circuit_breaker
+    data = rkwargs.get('data')
+    if data is not None and not isinstance(data, (six.binary_type, six.text_type, dict, list, tuple)):
+        policy = None   # iterators of chunks can be sent once only
+    host = urlsplit(url).netloc
+    timeout = rkwargs.get('timeout')
+    attempt = 0
+    while True:
+        if breaker is not None:
+            breaker.allow(host)
+        limit = limiter.acquire(url)
+        error = response = retry_after = None
+        try:
+            left = remaining_time()
+            if left is not None:
+                if left <= 0:
+                    raise DeadlineExceeded('Deadline exceeded before %s %s' % (method, url))
+                rkwargs['timeout'] = left if timeout is None else min(timeout, left)
+            response = (session or requests).request(method, url, **rkwargs)
+        except (requests.ConnectionError, requests.Timeout) as err:
+            error, reason = err, '%s: %s' % (type(err).__name__, err)
+        except BaseException:
+            limiter.release(limit)
+            raise
+        else:
+            reason = 'HTTP %d' % response.status_code
+            retry_after = response.headers.get('Retry-After')
+        if error is not None or not stream:
+            # streamed bodies keep the slot until they are read
+            limiter.release(limit)
+            limit = None
+        if breaker is not None:
+            breaker.record(host, error is None and response.status_code not in _UNHEALTHY, reason)
+
+        failed = error is not None or (policy is not None and response.status_code in policy.statuses)
+        delay = _retry_delay(policy, method, url, attempt, reason, retry_after) if failed else None
+        if delay is None:
+            if error is not None:
+                raise error
+            return response, _releaser(limit)
+        if response is not None:
+            response.close()
+        limiter.release(limit)
+        time.sleep(delay)
+        attempt += 1
+
+
+def openURL(url_base, data=None, method='Get', cookies=None, username=None, password=None, timeout=30, headers=None,
+            stream=False, session=None):
     """
     Function to open URLs.
 
     Uses requests library but with additional checks for OGC service exceptions and url formatting.
     Also handles cookies and simple user password authentication.
+    With stream=True the body is not downloaded up front (read it through ResponseWrapper.raw);
+    exception reports sent as 200 responses are then left to the caller to detect.
+    POST data may also be an iterator of bytes chunks, sent with chunked transfer encoding;
+    its Content-Type header is then up to the caller.
+    Requests are sent under the retry_policy, circuit_breaker, limiter and deadline() in force,
+    through session (a requests.Session, to reuse its connections) if given.
     """
     headers = headers if headers is not None else {}
     rkwargs = {}
@@ -157,11 +725,12 @@ def openURL(url_base, data=None, method='Get', cookies=None, username=None, pass
     method = method.split("}")[-1]
 
     if method.lower() == 'post':
-        try:
-            xml = etree.fromstring(data)
-            headers['Content-Type'] = 'text/xml'
-        except (ParseError, UnicodeEncodeError):
-            pass
+        if isinstance(data, (six.binary_type, six.text_type)):
+            try:
+                xml = etree.fromstring(data)
+                headers['Content-Type'] = 'text/xml'
+            except (ParseError, UnicodeEncodeError):
+                pass
 
         rkwargs['data'] = data
 
@@ -174,21 +743,37 @@ def openURL(url_base, data=None, method='Get', cookies=None, username=None, pass
     if cookies is not None:
         rkwargs['cookies'] = cookies
 
-    req = requests.request(method.upper(),
-                           url_base,
-                           headers=headers,
-                           **rkwargs)
+    if stream:
+        rkwargs['stream'] = True
 
-    if req.status_code in [400, 401]:
-        raise ServiceException(req.text)
+    with instrumentation.span('http', url=url_base, method=method.upper()) as span:
+        req, release = _send(method.upper(), url_base, session, headers=headers, **rkwargs)
+        if instrumentation.enabled():
+            span.annotate(status=req.status_code, ttfb=req.elapsed.total_seconds())
+            if not stream:
+                span.annotate(bytes=len(req.content))
 
-    if req.status_code in [404, 500, 502, 503, 504]:    # add more if needed
-        req.raise_for_status()
+    try:
+        if req.status_code in [400, 401]:
+            raise ServiceException(req.text)
+
+        if req.status_code in [404, 500, 502, 503, 504]:    # add more if needed
+            req.raise_for_status()
+
+        # check for service exceptions without the http header set
+        if not stream:
+            _check_exception_report(req.headers, req.content)
+    except Exception:
+        release()
+        raise
+
+    return ResponseWrapper(req, release)
 
-    # check for service exceptions without the http header set
-    if 'Content-Type' in req.headers and req.headers['Content-Type'] in ['text/xml', 'application/xml', 'application/vnd.ogc.se_xml']:
+def _check_exception_report(headers, content):
+    """Raise ServiceException when content, an XML response, is an OGC exception report"""
+    if 'Content-Type' in headers and headers['Content-Type'] in ['text/xml', 'application/xml', 'application/vnd.ogc.se_xml']:
         #just in case 400 headers were not set, going to have to read the xml to see if it's an exception report.
-        se_tree = etree.fromstring(req.content)
+        se_tree = etree.fromstring(content)
 
         # to handle the variety of namespaces and terms across services
         # and versions, especially for "legacy" responses like WMS 1.3.0
@@ -205,8 +790,6 @@ def openURL(url_base, data=None, method='Get', cookies=None, username=None, pass
                 # and we need to deal with some message nesting
                 raise ServiceException('\n'.join([str(t).strip() for t in serviceException.itertext() if str(t).strip()]))
 
-    return ResponseWrapper(req)
-
 #default namespace for nspath is OWS common
 OWS_NAMESPACE = 'http://www.opengis.net/ows/1.1'
 def nspath(path, ns=OWS_NAMESPACE):
@@ -263,7 +846,7 @@ def add_namespaces(root, ns_keys):
         # We can't re-add an existing namespaces.  Get a list of current
         # namespaces in use
         existing_namespaces = set()
-        for elem in root.getiterator():
+        for elem in root.iter():
             if elem.tag[0] == "{":
                 uri, tag = elem.tag[1:].split("}")
                 existing_namespaces.add(namespaces.get_namespace_from_url(uri))
@@ -382,8 +965,10 @@ def http_post(url=None, request=None, lang='en-US', timeout=10, username=None, p
     if username is not None and password is not None:
         rkwargs['auth'] = (username, password)
 
-    up = requests.post(url, request, headers=headers, **rkwargs)
-    return up.content
+    with instrumentation.span('http', url=url, method='POST') as span:
+        up = _send('POST', url, data=request, headers=headers, timeout=timeout, **rkwargs)[0]
+        span.annotate(status=up.status_code, ttfb=up.elapsed.total_seconds(), bytes=len(up.content))
+        return up.content
 
 def element_to_string(element, encoding=None, xml_declaration=False):
     """
@@ -474,7 +1059,7 @@ def build_get_url(base_url, params):
     
     qs = []
     if base_url.find('?') != -1:
-        qs = cgi.parse_qsl(base_url.split('?')[1])
+        qs = parse_qsl(base_url.split('?')[1])
 
     pars = [x[0] for x in qs]
 
@@ -522,7 +1107,7 @@ Would be 2006-07-27T21:10:00Z, not 'now'
         return None
 
     try:
-        dt = parser.parse(element.text)
+        dt = parse_datetime(element.text)
     except Exception:
         att = testXMLValue(element.attrib.get('indeterminatePosition'), True)
         if att and att == 'now':
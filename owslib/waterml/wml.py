@@ -4,7 +4,11 @@ from owslib.etree import etree
 from owslib.util import nspath, testXMLValue, openURL
 from owslib.util import xml_to_dict as _xml_to_dict
 from datetime import datetime
-from dateutil import parser
+from owslib.dateparse import parse_datetime, parse_datetime_array
+from owslib.lazy import LazyModule
+
+# numpy is optional, and imported on first use
+np = LazyModule('numpy', optional=True)
 
 namespaces = {
     'wml1.1':'{http://www.cuahsi.org/waterML/1.1/}',
@@ -117,7 +121,7 @@ class QueryInfo(XMLParser):
         # try:
             # create queryinfo object from dict
         xml_dict = _xml_to_dict(self._root)
-        self.creation_time = parser.parse(xml_dict.get('creation_time')) if xml_dict.get('creation_time') is not None else None
+        self.creation_time = parse_datetime(xml_dict.get('creation_time')) if xml_dict.get('creation_time') is not None else None
         self.notes = [testXMLValue(note) for note in self._findall('note')]
         self.criteria = Criteria(self._find('criteria'), self._ns)
         # except:
@@ -143,12 +147,12 @@ class Criteria(XMLParser):
         self.location_param = xml_dict.get('location_param')
         self.variable_param = xml_dict.get('variable_param')
         try:
-            self.begin_date_time = parser.parse(xml_dict['begin_date_time'])
+            self.begin_date_time = parse_datetime(xml_dict['begin_date_time'])
         except:
             self.begin_date_time = None
 
         try:
-            self.end_date_time = parser.parse(xml_dict['end_date_time'])
+            self.end_date_time = parse_datetime(xml_dict['end_date_time'])
         except:
             self.end_date_time = None
 
@@ -381,10 +385,10 @@ class Series(XMLParser):
         self.sample_medium = xml_dict.get('sample_medium')
         self.data_type = xml_dict.get('data_type')
         # date-time
-        self.begin_date_time = parser.parse(xml_dict.get('begin_date_time'))
-        self.begin_date_time_utc = parser.parse(xml_dict.get('begin_date_time_utc')) if xml_dict.get('begin_date_time_utc') is not None else None
-        self.end_date_time = parser.parse(xml_dict.get('end_date_time'))
-        self.end_date_time_utc = parser.parse(xml_dict.get('end_date_time_utc')) if xml_dict.get('end_date_time_utc') is not None else None
+        self.begin_date_time = parse_datetime(xml_dict.get('begin_date_time'))
+        self.begin_date_time_utc = parse_datetime(xml_dict.get('begin_date_time_utc')) if xml_dict.get('begin_date_time_utc') is not None else None
+        self.end_date_time = parse_datetime(xml_dict.get('end_date_time'))
+        self.end_date_time_utc = parse_datetime(xml_dict.get('end_date_time_utc')) if xml_dict.get('end_date_time_utc') is not None else None
         # method info
         self.method_description = xml_dict.get('method_description')
         self.method_code = xml_dict.get('method_code')
@@ -615,7 +619,36 @@ class TimeSeries(XMLParser):
         except:
             raise
 
+# value attributes decoded into string columns by Values, keyed by column name
+VALUE_ID_COLUMNS = (
+    ('method_id', 'methodID'),
+    ('method_code', 'methodCode'),
+    ('source_id', 'sourceID'),
+    ('source_code', 'sourceCode'),
+    ('sample_id', 'sampleID'),
+    ('quality_control_level', 'qualityControlLevel'),
+    ('quality_control_level_code', 'qualityControlLevelCode'),
+    ('censor_code', 'censorCode'),
+)
+
+
+def _to_float(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
 class Values(XMLParser):
+    """
+        A set of time series values, decoded into columns.
+
+        The columns dictionary holds one entry per value: date_time and date_time_utc (datetime64[ns]),
+        value (float64) and the string columns listed in VALUE_ID_COLUMNS, missing attributes being ''.
+        Columns are NumPy arrays when NumPy is available, lists otherwise.  Value objects are only built
+        when the values attribute is accessed.  get_date_values returns the dates as parsed from the document,
+        keeping their UTC offsets.
+    """
     def __init__(self,xml,version='wml1.1'):
         super(Values,self).__init__(xml,version)
         self.parse_values()
@@ -624,28 +657,45 @@ class Values(XMLParser):
         for v in self.values:
             yield v
 
-    """Accessor properties/methods"""
-    def get_date_values(self,method_id=None,source_id=None,sample_id=None,quality_level=None,utc=False):
-        varl = [v for v in self.values]
-        if method_id is not None:
-            varl = [v for v in varl if v.method_id == method_id]
-
-        if source_id is not None:
-            varl = [v for v in varl if v.source_id == source_id]
+    def __len__(self):
+        return len(self._value_text)
 
-        if sample_id is not None:
-            varl = [v for v in varl if v.sample_id == sample_id]
+    """Accessor properties/methods"""
+    @property
+    def values(self):
+        if self._values is None:
+            self._values = [Value(val, self._ns) for val in self._value_elements]
+        return self._values
 
-        if quality_level is not None:
-            varl = [v for v in varl if v.quality_control_level == quality_level]
+    def get_mask(self,method_id=None,source_id=None,sample_id=None,quality_level=None):
+        """
+            Return a boolean mask selecting the values that match all of the given ids, or None when no
+            filter is given.
+        """
+        mask = None
+        for column, wanted in (('method_id', method_id), ('source_id', source_id),
+                               ('sample_id', sample_id), ('quality_control_level', quality_level)):
+            if wanted is None:
+                continue
+            if np:
+                selected = self.columns[column] == wanted
+                mask = selected if mask is None else mask & selected
+            else:
+                selected = [v == wanted for v in self.columns[column]]
+                mask = selected if mask is None else [a and b for a, b in zip(mask, selected)]
+        return mask
 
-        if not utc:
-            return [(v.date_time,v.value) for v in varl]
-        else:
-            return [(v.date_time_utc,v.value) for v in varl]
+    def get_date_values(self,method_id=None,source_id=None,sample_id=None,quality_level=None,utc=False):
+        mask = self.get_mask(method_id, source_id, sample_id, quality_level)
+        dates = self._date_text['date_time_utc' if utc else 'date_time']
+        text = self._value_text.tolist() if np else self._value_text
+        if mask is not None:
+            selected = mask.tolist() if np else mask
+            dates = [d for d, m in zip(dates, selected) if m]
+            text = [t for t, m in zip(text, selected) if m]
+        return [(parse_datetime(d) if d is not None else None, t) for d, t in zip(dates, text)]
 
     def parse_values(self):
-        xml_dict = _xml_to_dict(self._root)
         # method info
         self.methods = [Method(method,self._ns) for method in self._findall('method')]
 
@@ -673,8 +723,36 @@ class Values(XMLParser):
             unit = self._find('unit')
             self.unit = Unit(unit, self._ns) if unit is not None else None
 
-        # values
-        self.values = [Value(val, self._ns) for val in self._findall('value')]
+        # values, decoded column-wise in a single pass
+        self._value_elements = self._findall('value')
+        self._values = None
+
+        text = []
+        date_time = []
+        date_time_utc = []
+        ids = dict((column, []) for column, attribute in VALUE_ID_COLUMNS)
+        for val in self._value_elements:
+            d = val.attrib
+            text.append(val.text.strip() if val.text else None)
+            date_time.append(d.get('dateTime'))
+            date_time_utc.append(d.get('dateTimeUTC'))
+            for column, attribute in VALUE_ID_COLUMNS:
+                ids[column].append(d.get(attribute, ''))
+
+        self._date_text = {'date_time': date_time, 'date_time_utc': date_time_utc}
+        self.columns = {
+            'date_time': parse_datetime_array(date_time, utc=False),
+            'date_time_utc': parse_datetime_array(date_time_utc, utc=False),
+        }
+        if np:
+            self._value_text = np.array(text, dtype=object)
+            self.columns['value'] = np.array([_to_float(t) for t in text], dtype='float64')
+            for column, values in ids.items():
+                self.columns[column] = np.array(values, dtype=str)
+        else:
+            self._value_text = text
+            self.columns['value'] = [_to_float(t) for t in text]
+            self.columns.update(ids)
 
 
 class Value(XMLParser):
@@ -688,9 +766,9 @@ class Value(XMLParser):
             d = self._root.attrib
             self.qualifiers = d.get('qualifiers')
             self.censor_code = d.get('censorCode')
-            self.date_time = parser.parse(d.get('dateTime')) if d.get('dateTime') is not None else None
+            self.date_time = parse_datetime(d.get('dateTime')) if d.get('dateTime') is not None else None
             self.time_offset = d.get('timeOffset')
-            self.date_time_utc = parser.parse(d.get('dateTimeUTC')) if d.get('dateTimeUTC') is not None else None
+            self.date_time_utc = parse_datetime(d.get('dateTimeUTC')) if d.get('dateTimeUTC') is not None else None
             self.method_id = d.get('methodID')
             self.source_id = d.get('sourceID')
             self.accuracy_std_dev = d.get('accuracyStdDev')
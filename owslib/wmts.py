@@ -42,9 +42,8 @@ except ImportError:      # Python 2
     from urllib import urlencode
     from urlparse import urlparse, urlunparse, parse_qs, ParseResult
 from .etree import etree
+from .instrumentation import instrumented, span
 from .util import clean_ows_url, openURL, testXMLValue, getXMLInteger
-from .fgdc import Metadata
-from .iso import MD_Metadata
 from .ows import ServiceProvider, ServiceIdentification, OperationsMetadata
 
 
@@ -184,7 +183,8 @@ class WebMapTileService(object):
             raise ServiceException(err_message, xml)
 
         # build metadata objects
-        self._buildMetadata(parse_remote_metadata)
+        with span('WMTS.build'):
+            self._buildMetadata(parse_remote_metadata)
 
     def _getcapproperty(self):
         if not self._capabilities:
@@ -395,6 +395,7 @@ TILEMATRIX=6&TILEROW=4&TILECOL=4&FORMAT=image%2Fjpeg'
 
         return restenc
 
+    @instrumented('WMTS.GetTile')
     def gettile(self, base_url=None, layer=None, style=None, format=None,
                 tilematrixset=None, tilematrix=None, row=None, column=None,
                 **kwargs):
@@ -443,7 +444,23 @@ TILEMATRIX=6&TILEROW=4&TILECOL=4&FORMAT=image%2Fjpeg'
             >>> out.close()
 
         """
-        vendor_kwargs = self.vendor_kwargs or {}
+        url, data = self._gettile_url(base_url, layer, style, format,
+                                      tilematrixset, tilematrix, row, column,
+                                      **kwargs)
+        u = openURL(url, data, username=self.username,
+                    password=self.password)
+        if self.restonly:
+            return u
+        return self._check_gettile_response(u)
+
+    def _gettile_url(self, base_url=None, layer=None, style=None,
+                     format=None, tilematrixset=None, tilematrix=None,
+                     row=None, column=None, **kwargs):
+        """(url, query string or None) of a GetTile request
+
+        The arguments are those of gettile.
+        """
+        vendor_kwargs = dict(self.vendor_kwargs or {})
         vendor_kwargs.update(kwargs)
 
         # REST only WMTS
@@ -451,8 +468,7 @@ TILEMATRIX=6&TILEROW=4&TILECOL=4&FORMAT=image%2Fjpeg'
             resurl = self.buildTileResource(
                 layer, style, format, tilematrixset, tilematrix,
                 row, column, **vendor_kwargs)
-            u = openURL(resurl, username=self.username, password=self.password)
-            return u
+            return resurl, None
 
         # KVP implemetation
         data = self.buildTileRequest(layer, style, format, tilematrixset,
@@ -477,9 +493,13 @@ TILEMATRIX=6&TILEROW=4&TILECOL=4&FORMAT=image%2Fjpeg'
                     base_url = get_verbs[0].get('url')
             except StopIteration:
                 pass
-        u = openURL(base_url, data, username=self.username,
-                    password=self.password)
+        return base_url, data
 
+    def _check_gettile_response(self, u):
+        """Raise the service exception reported by GetTile response u
+
+        Returns u when there is none.
+        """
         # check for service exceptions, and return
         if u.info()['Content-Type'] == 'application/vnd.ogc.se_xml':
             se_xml = u.read()
@@ -822,6 +842,7 @@ class WMTSCapabilitiesReader:
                              query, pieces.fragment)
         return urlunparse(pieces)
 
+    @instrumented('WMTS.GetCapabilities')
     def read(self, service_url, vendor_kwargs=None):
         """Get and parse a WMTS capabilities document, returning an
         elementtree instance
@@ -836,7 +857,8 @@ class WMTSCapabilitiesReader:
         spliturl = getcaprequest.split('?')
         u = openURL(spliturl[0], spliturl[1], method='Get',
                     username=self.username, password=self.password)
-        return etree.fromstring(u.read())
+        with span('WMTS.parse'):
+            return etree.fromstring(u.read())
 
     def readString(self, st):
         """Parse a WMTS capabilities document, returning an elementtree instance
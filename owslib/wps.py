@@ -28,7 +28,11 @@ a) "GetCapabilities"
 
 b) "DescribeProcess"
     - use the method wps.describeprocess(identifier, xml=None)
-    - identifier is the process identifier, retrieved from the list obtained from a previous "GetCapabilities" invocation
+    - identifier is the process identifier, retrieved from the list obtained from a previous "GetCapabilities" invocation;
+      "ALL" or a list of identifiers describes several processes in one request
+    - described processes replace their entry in wps.processes; wps.getprocess(identifier) looks them up by identifier
+    - a ProcessDescriptionCache passed as WebProcessingService(cache=...) keeps the descriptions, on disk if wanted,
+      keyed by service URL, identifier and process version
     - the optional keyword argument "xml" may be used to avoid a real live request, and instead read the WPS process description document from a cached XML file
 
 c) "Execute"
@@ -49,10 +53,18 @@ c) "Execute"
                   - "GMLMultiPolygonFeatureCollection" can be used to define one or more polygons of (latitude, longitude) points.
           - "output" is an optional output identifier to be included in the ResponseForm section of the request.
 
+    - with stream=True the request document is written piece by piece while it is posted (chunked transfer encoding),
+      so large ComplexDataInput values (files or iterators of chunks) and GMLMultiPolygonFeatureCollection inputs
+      (iterables of polygons) are never held in memory as a whole
+
     - the optional keyword argument "response" mey be used to avoid submitting a real live request, and instead reading the WPS execution response document
       from a cached XML file (for debugging or testing purposes)
+    - a ResultCache passed as WebProcessingService(result_cache=...) memoises executions: a call with the same identifier,
+      inputs and output as a succeeded one within the cache's time-to-live returns the stored response without contacting the server
     - the convenience module function monitorExecution() can be used to periodically check the status of a remote running job, and eventually download the output
       either to a named file, or to a file specified by the server.
+    - to monitor many jobs at once, owslib.wpsjobs.WPSJobManager (Python 3.5+) polls their status concurrently
+      on an asyncio event loop, with a polling interval adapted to the progress each job reports.
 
 
 Examples
@@ -86,11 +98,19 @@ Also, the directory tests/ contains several examples of well-formed "Execute" re
 
 from __future__ import (absolute_import, division, print_function)
 
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from owslib.etree import etree
 from owslib.ows import DEFAULT_OWS_NAMESPACE, ServiceIdentification, ServiceProvider, OperationsMetadata, BoundingBox
 from time import sleep
+from xml.sax.saxutils import escape, quoteattr
+from owslib.instrumentation import annotate, instrumented, span
 from owslib.util import (testXMLValue, build_get_url, clean_ows_url, dump, getTypedValue,
-                         getNamespace, element_to_string, nspath, openURL, nspath_eval, log)
+                         getNamespace, element_to_string, nspath, openURL, nspath_eval, log, DocumentCache)
 from xml.dom.minidom import parseString
 from owslib.namespaces import Namespaces
 try:                    # Python 3
@@ -115,6 +135,12 @@ WFS_SCHEMA_LOCATION = 'http://schemas.opengis.net/wfs/1.1.0/wfs.xsd'
 WPS_DEFAULT_SCHEMA_LOCATION = 'http://schemas.opengis.net/wps/1.0.0/wpsExecute_request.xsd'
 WPS_DEFAULT_VERSION = '1.0.0'
 
+# bytes read and written at a time when streaming outputs to disk or requests to the server
+CHUNK_SIZE = 65536
+
+# vertices written at a time into a streamed gml:posList
+POSLIST_BATCH = 4096
+
 
 def get_namespaces():
     ns = n.get_namespaces(["ogc", "wfs", "wps", "gml", "xsi", "xlink"])
@@ -165,6 +191,64 @@ def is_complexdata(val):
     return isinstance(val, IComplexDataInput)
 
 
+def is_streamed(val):
+    """
+    Checks if the provided value is a file-like object or an iterator of chunks,
+    rather than a value held in memory.
+    """
+    if hasattr(val, 'read'):
+        return True
+    if isinstance(val, (bytes, str)) or is_literaldata(val):
+        return False
+    return hasattr(val, '__iter__') or hasattr(val, '__next__')
+
+
+def _encode(text):
+    return text if isinstance(text, bytes) else text.encode('utf-8')
+
+
+def _escape(chunk):
+    """XML-escaped UTF-8 bytes of a text or bytes chunk"""
+    chunk = _encode(chunk)
+    # '&', '<' and '>' never occur inside multi-byte UTF-8 sequences, so chunks can be escaped independently
+    return chunk.replace(b'&', b'&amp;').replace(b'<', b'&lt;').replace(b'>', b'&gt;')
+
+
+def _chunks(value, chunk_size=CHUNK_SIZE):
+    """Bytes chunks of a file-like object or of an iterator of text or bytes chunks"""
+    if hasattr(value, 'read'):
+        while True:
+            chunk = value.read(chunk_size)
+            if not chunk:
+                break
+            yield _encode(chunk)
+    else:
+        for chunk in value:
+            yield _encode(chunk)
+
+
+def _buffered(chunks, size=CHUNK_SIZE):
+    """Coalesce small bytes chunks into pieces of at least size bytes"""
+    buf = []
+    length = 0
+    for chunk in chunks:
+        buf.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield b''.join(buf)
+            buf = []
+            length = 0
+    if buf:
+        yield b''.join(buf)
+
+
+def _start_tag(tag, attrib=(), nsmap=()):
+    """Start tag of a prefixed element, with namespace declarations for the prefixes in nsmap"""
+    items = ['xmlns:%s=%s' % (prefix, quoteattr(namespaces[prefix])) for prefix in nsmap]
+    items.extend('%s=%s' % (name, quoteattr(value)) for name, value in attrib)
+    return _encode('<%s>' % ' '.join([tag] + items))
+
+
 class IComplexDataInput(object):
 
     """
@@ -178,6 +262,129 @@ class IComplexDataInput(object):
         """
         raise NotImplementedError
 
+    def iterXml(self):
+        """
+        Method that returns the XML snippet as an iterator of bytes chunks,
+        used when the request document is streamed to the server.
+        Inputs holding large data override it to avoid building the snippet in memory.
+        """
+        yield etree.tostring(self.getXml())
+
+
+class ProcessDescriptionCache(DocumentCache):
+
+    """
+    Thread-safe store of ProcessDescription documents keyed by (service url, process identifier, process version).
+
+    With a directory the documents are also written there, one file per key, so process descriptions
+    survive the session; a new process version advertised in the capabilities is simply a cache miss.
+    """
+
+
+class ResultCache(object):
+
+    """
+    Thread-safe memo of succeeded WPS executions, keyed on the service URL, process identifier,
+    inputs and requested outputs.
+
+    Entries hold the final ExecuteResponse document; they expire ttl seconds after they were stored
+    (outputs given as references only live as long as the server keeps them), and the least recently
+    used entries are evicted beyond max_entries entries or max_bytes bytes of documents.
+    hits, misses, evictions and expirations count what happened since creation, see stats().
+    """
+
+    def __init__(self, ttl=3600, max_entries=256, max_bytes=None, clock=time.time):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.size = 0
+        self._entries = OrderedDict()    # key -> (expiry time, document)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url, identifier, inputs, output=None):
+        """
+        Digest of an execute request, or None for requests that cannot be cached:
+        inputs read from files or iterators, which would be consumed by hashing them.
+        Inputs are canonicalised, so their order only matters between values of the same input.
+        """
+        digest = hashlib.sha256()
+
+        def update(*parts):
+            for part in parts:
+                part = _encode(part if isinstance(part, (bytes, str)) or is_literaldata(part) else repr(part))
+                digest.update(str(len(part)).encode('ascii') + b':' + part)
+
+        update(url, identifier, repr(output))
+        for key, val in sorted(inputs, key=lambda item: item[0]):
+            if is_literaldata(val):
+                update('literal', key, val)
+            elif isinstance(val, ComplexDataInput):
+                if is_streamed(val.value):
+                    return None
+                update('complex', key, val.mimeType, val.encoding, val.schema, val.value)
+            elif is_boundingboxdata(val):
+                update('bbox', key, [float(v) for v in val.data], val.crs, val.dimensions)
+            elif is_complexdata(val):
+                if isinstance(val, GMLMultiPolygonFeatureCollection) and not hasattr(val.polygons, '__len__'):
+                    return None
+                update('xml', key, etree.tostring(val.getXml()))
+            else:
+                return None
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Stored document for key, or None if there is none or it expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # most recently used last
+            self._entries[key] = self._entries.pop(key)
+            return entry[1]
+
+    def put(self, key, document):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self.clock() + self.ttl, document)
+            self.size += len(document)
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     self.max_bytes is not None and self.size > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        self.size -= len(self._entries.pop(key)[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """Counters and current size of the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'expirations': self.expirations, 'entries': len(self._entries), 'bytes': self.size,
+                    'hit_ratio': float(self.hits) / lookups if lookups else 0.0}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
 
 class WebProcessingService(object):
 
@@ -187,11 +394,14 @@ class WebProcessingService(object):
     Implements IWebProcessingService.
     """
 
-    def __init__(self, url, version=WPS_DEFAULT_VERSION, username=None, password=None, verbose=False, skip_caps=False):
+    def __init__(self, url, version=WPS_DEFAULT_VERSION, username=None, password=None, verbose=False, skip_caps=False,
+                 cache=None, result_cache=None):
         """
         Initialization method resets the object status.
         By default it will execute a GetCapabilities invocation to the remote service,
         which can be skipped by using skip_caps=True.
+        An optional ProcessDescriptionCache keeps process descriptions between describeprocess() calls,
+        an optional ResultCache the responses of succeeded execute() calls.
         """
 
         # fields passed in from object initializer
@@ -200,6 +410,8 @@ class WebProcessingService(object):
         self.password = password
         self.version = version
         self.verbose = verbose
+        self.cache = cache
+        self.result_cache = result_cache
 
         # fields populated by method invocations
         self._capabilities = None
@@ -207,6 +419,8 @@ class WebProcessingService(object):
         self.provider = None
         self.operations = []
         self.processes = []
+        # identifier -> position in self.processes
+        self._processIndex = {}
 
         if not skip_caps:
             self.getcapabilities()
@@ -230,30 +444,149 @@ class WebProcessingService(object):
         log.debug(element_to_string(self._capabilities))
 
         # populate the capabilities metadata obects from the XML tree
-        self._parseCapabilitiesMetadata(self._capabilities)
+        with span('WPS.build'):
+            self._parseCapabilitiesMetadata(self._capabilities)
 
     def describeprocess(self, identifier, xml=None):
         """
         Requests a process document from a WPS service and populates the process metadata.
         Returns the process object.
+
+        With a cache, a process whose advertised version was described before is not requested again.
+        Use describeprocesses() to describe several processes at once.
+        """
+
+        return self.describeprocesses(identifier, xml=xml)[0]
+
+    def describeprocesses(self, identifiers='ALL', xml=None, max_workers=4):
+        """
+        Requests the process documents of several processes from a WPS service and populates their metadata.
+        Returns the list of process objects.
+
+        identifiers: "ALL", or a list or comma-separated string of process identifiers.  The processes are
+        described in a single request; services rejecting such requests are asked for each process separately,
+        max_workers requests at a time.  With a cache, processes whose advertised version was described before
+        are not requested again.
         """
 
         # read capabilities document
         reader = WPSDescribeProcessReader(
             version=self.version, verbose=self.verbose)
+        if isinstance(identifiers, (list, tuple)):
+            identifiers = list(identifiers)
+        else:
+            identifiers = [i.strip() for i in identifiers.split(',')]
+
         if xml:
             # read from stored XML file
             rootElement = reader.readFromString(xml)
-        else:
-            # read from server
-            rootElement = reader.readFromUrl(self.url, identifier)
+            log.info(element_to_string(rootElement))
+            return self._parseProcessDescriptions(rootElement)
+
+        if identifiers == ['ALL'] and self.cache is not None and self.processes:
+            # versions are known from the capabilities: only the processes missing from the cache are requested
+            identifiers = [p.identifier for p in self.processes]
+
+        described = {}
+        missing = []
+        for ident in identifiers:
+            process = self._cachedProcess(ident)
+            if process is None:
+                missing.append(ident)
+            else:
+                described[ident] = self._setProcess(process)
 
-        log.info(element_to_string(rootElement))
+        if missing:
+            processes = self._describeProcesses(reader, missing, max_workers)
+            if missing == ['ALL'] or len(identifiers) == 1:
+                return processes
+            for process in processes:
+                described[process.identifier] = process
 
-        # build metadata objects
-        return self._parseProcessMetadata(rootElement)
+        return [described[ident] for ident in identifiers if ident in described]
 
-    def execute(self, identifier, inputs, output=None, request=None, response=None):
+    def getprocess(self, identifier):
+        """
+        Returns the process with the given identifier, as described by the last describeprocess() call
+        or listed in the capabilities.  Raises KeyError for unknown processes.
+        """
+        position = self._processIndex.get(identifier)
+        if position is None or position >= len(self.processes) or \
+                self.processes[position].identifier != identifier:
+            # self.processes was changed from outside
+            self._processIndex = dict((p.identifier, n) for n, p in enumerate(self.processes))
+            position = self._processIndex[identifier]
+        return self.processes[position]
+
+    def _setProcess(self, process):
+        """Adds process to self.processes, replacing the process with the same identifier"""
+        try:
+            self.processes[self._processIndex[process.identifier]] = process
+        except (KeyError, IndexError):
+            self._processIndex = dict((p.identifier, n) for n, p in enumerate(self.processes))
+            if process.identifier in self._processIndex:
+                self.processes[self._processIndex[process.identifier]] = process
+            else:
+                self._processIndex[process.identifier] = len(self.processes)
+                self.processes.append(process)
+        return process
+
+    def _cachedProcess(self, identifier):
+        """Process read from the cache, for the version advertised in the capabilities"""
+        if self.cache is None:
+            return None
+        try:
+            version = self.getprocess(identifier).processVersion
+        except KeyError:
+            return None
+        if version is None:
+            return None
+        document = self.cache.get((self.url, identifier, version))
+        if document is None:
+            return None
+        return Process(etree.fromstring(document), verbose=self.verbose)
+
+    def _describeProcesses(self, reader, identifiers, max_workers):
+        """Describes identifiers in one request, or one by one if the service rejects it"""
+        try:
+            rootElement = reader.readFromUrl(self.url, ','.join(identifiers),
+                                             username=self.username, password=self.password)
+            log.info(element_to_string(rootElement))
+            processes = self._parseProcessDescriptions(rootElement)
+        except Exception as err:
+            if len(identifiers) == 1 and identifiers[0] != 'ALL':
+                raise
+            log.warning('DescribeProcess of %s failed (%s), describing processes separately' %
+                        (','.join(identifiers), err))
+            processes = []
+
+        if len(identifiers) == 1 and identifiers[0] != 'ALL':
+            return processes
+        if identifiers == ['ALL']:
+            if processes:
+                return processes
+            if not self.processes:
+                self.getcapabilities()
+            identifiers = [p.identifier for p in self.processes]
+        else:
+            # single requests for processes the bulk request did not return
+            returned = set(p.identifier for p in processes)
+            identifiers = [ident for ident in identifiers if ident not in returned]
+            if not identifiers:
+                return processes
+
+        def describe(ident):
+            rootElement = reader.readFromUrl(self.url, ident, username=self.username, password=self.password)
+            return self._parseProcessDescriptions(rootElement, register=False)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(identifiers)))) as executor:
+            for described in executor.map(describe, identifiers):
+                for process in described:
+                    processes.append(self._setProcess(process))
+        return processes
+
+    @instrumented('WPS.Execute')
+    def execute(self, identifier, inputs, output=None, request=None, response=None, stream=False):
         """
         Submits a WPS process execution request.
         Returns a WPSExecution object, which can be used to monitor the status of the job, and ultimately retrieve the result.
@@ -263,6 +596,10 @@ class WebProcessingService(object):
         output: optional identifier for process output reference (if not provided, output will be embedded in the response)
         request: optional pre-built XML request document, prevents building of request from other arguments
         response: optional pre-built XML response document, prevents submission of request to live WPS server
+        stream: write the request document while posting it with chunked transfer encoding, instead of building it in memory
+
+        With a result_cache, a call matching a succeeded one returns the stored response (execution.cached is True)
+        and nothing is sent; asynchronous executions are stored once a status check finds them succeeded.
         """
 
         # instantiate a WPSExecution object
@@ -270,12 +607,28 @@ class WebProcessingService(object):
         execution = WPSExecution(version=self.version, url=self.url,
                                  username=self.username, password=self.password, verbose=self.verbose)
 
+        if self.result_cache is not None and request is None and response is None:
+            key = self.result_cache.key(self.url, identifier, inputs, output)
+            if key is not None:
+                document = self.result_cache.get(key)
+                annotate(cache_hit=document is not None)
+                if document is not None:
+                    log.info('Using cached WPS response')
+                    execution.cached = True
+                    execution.parseResponse(etree.fromstring(document))
+                    return execution
+                execution._resultCache = (self.result_cache, key)
+
         # build XML request from parameters
-        if request is None:
+        if request is None and stream:
+            request = execution.iterRequest(identifier, inputs, output)
+        elif request is None:
             requestElement = execution.buildRequest(identifier, inputs, output)
             request = etree.tostring(requestElement)
             execution.request = request
-        log.debug(request)
+            log.debug(request)
+        else:
+            log.debug(request)
 
         # submit the request to the live server
         if response is None:
@@ -295,20 +648,26 @@ class WebProcessingService(object):
         Method to parse a <ProcessDescriptions> XML element and returned the constructed Process object
         """
 
-        processDescriptionElement = rootElement.find('ProcessDescription')
-        process = Process(processDescriptionElement, verbose=self.verbose)
+        return self._parseProcessDescriptions(rootElement)[0]
 
-        # override existing processes in object metadata, if existing already
-        found = False
-        for n, p in enumerate(self.processes):
-            if p.identifier == process.identifier:
-                self.processes[n] = process
-                found = True
-        # otherwise add it
-        if not found:
-            self.processes.append(process)
+    def _parseProcessDescriptions(self, rootElement, register=True):
+        """
+        Method to parse all processes of a <ProcessDescriptions> XML element, returns the list of Process objects.
+        Processes replace the existing ones with the same identifier in the object metadata and go to the cache.
+        """
 
-        return process
+        if not rootElement.tag.endswith('ProcessDescriptions'):
+            raise ValueError('Not a ProcessDescriptions document: %s' % rootElement.tag)
+        processes = []
+        for processDescriptionElement in rootElement.findall('ProcessDescription'):
+            process = Process(processDescriptionElement, verbose=self.verbose)
+            if self.cache is not None and process.processVersion is not None:
+                self.cache.put((self.url, process.identifier, process.processVersion),
+                               etree.tostring(processDescriptionElement))
+            if register:
+                self._setProcess(process)
+            processes.append(process)
+        return processes
 
     def _parseCapabilitiesMetadata(self, root):
         ''' Sets up capabilities metadata objects '''
@@ -363,8 +722,7 @@ class WebProcessingService(object):
             # </wps:ProcessOfferings>
             elif element.tag.endswith('ProcessOfferings'):
                 for child in element.findall(nspath('Process', ns=ns)):
-                    p = Process(child, verbose=self.verbose)
-                    self.processes.append(p)
+                    p = self._setProcess(Process(child, verbose=self.verbose))
                     if self.verbose == True:
                         dump(self.processes[-1])
 
@@ -379,12 +737,14 @@ class WPSReader(object):
         self.version = version
         self.verbose = verbose
 
-    def _readFromUrl(self, url, data, method='Get', username=None, password=None):
+    def _readFromUrl(self, url, data, method='Get', username=None, password=None, headers=None):
         """
         Method to get and parse a WPS document, returning an elementtree instance.
         url: WPS service base url.
-        data: GET: dictionary of HTTP (key, value) parameter pairs, POST: XML document to post
+        data: GET: dictionary of HTTP (key, value) parameter pairs, POST: XML document to post,
+            or an iterator of bytes chunks posted with chunked transfer encoding
         username, password: optional user credentials
+        headers: optional HTTP headers of a POST request
         """
 
         if method == 'Get':
@@ -396,12 +756,14 @@ class WPSReader(object):
             spliturl = request_url.split('?')
             u = openURL(spliturl[0], spliturl[
                         1], method='Get', username=username, password=password)
-            return etree.fromstring(u.read())
+            with span('WPS.parse'):
+                return etree.fromstring(u.read())
 
         elif method == 'Post':
             u = openURL(url, data, method='Post',
-                        username=username, password=password)
-            return etree.fromstring(u.read())
+                        username=username, password=password, headers=headers)
+            with span('WPS.parse'):
+                return etree.fromstring(u.read())
 
         else:
             raise Exception("Unrecognized HTTP method: %s" % method)
@@ -428,6 +790,7 @@ class WPSCapabilitiesReader(WPSReader):
         super(WPSCapabilitiesReader, self).__init__(
             version=version, verbose=verbose)
 
+    @instrumented('WPS.GetCapabilities')
     def readFromUrl(self, url, username=None, password=None):
         """
         Method to get and parse a WPS capabilities document, returning an elementtree instance.
@@ -451,6 +814,7 @@ class WPSDescribeProcessReader(WPSReader):
         super(WPSDescribeProcessReader, self).__init__(
             version=version, verbose=verbose)
 
+    @instrumented('WPS.DescribeProcess')
     def readFromUrl(self, url, identifier, username=None, password=None):
         """
         Reads a WPS DescribeProcess document from a remote service and returns the XML etree object
@@ -473,13 +837,13 @@ class WPSExecuteReader(WPSReader):
         # superclass initializer
         super(WPSExecuteReader, self).__init__(verbose=verbose)
 
-    def readFromUrl(self, url, data={}, method='Get', username=None, password=None):
+    def readFromUrl(self, url, data={}, method='Get', username=None, password=None, headers=None):
         """
         Reads a WPS status document from a remote service and returns the XML etree object.
         url: the URL to submit the GET/POST request to.
         """
 
-        return self._readFromUrl(url, data, method, username=username, password=password)
+        return self._readFromUrl(url, data, method, username=username, password=password, headers=headers)
 
 
 class WPSExecution():
@@ -514,6 +878,10 @@ class WPSExecution():
         self.dataInputs = []
         self.processOutputs = []
 
+        # whether the response came from a ResultCache, and the (cache, key) to store a successful response under
+        self.cached = False
+        self._resultCache = None
+
     def buildRequest(self, identifier, inputs=[], output=None):
         """
         Method to build a WPS process request.
@@ -605,24 +973,67 @@ class WPSExecution():
         #   </wps:ResponseDocument>
         # </wps:ResponseForm>
         if output is not None:
-            responseFormElement = etree.SubElement(
-                root, nspath_eval('wps:ResponseForm', namespaces))
-            responseDocumentElement = etree.SubElement(
-                responseFormElement, nspath_eval(
-                    'wps:ResponseDocument', namespaces),
-                                                       attrib={'storeExecuteResponse': 'true', 'status': 'true'})
-            if isinstance(output, str):
-                self._add_output(
-                    responseDocumentElement, output, asReference=True)
-            elif isinstance(output, list):
-                for (identifier, as_reference) in output:
-                    self._add_output(
-                        responseDocumentElement, identifier, asReference=as_reference)
-            else:
-                raise Exception(
-                    'output parameter is neither string nor list. output=%s' % output)
+            root.append(self._responseForm(output))
         return root
 
+    def iterRequest(self, identifier, inputs=[], output=None):
+        """
+        Method to write a WPS process request as an iterator of bytes chunks, to be posted with chunked transfer encoding.
+        Takes the same arguments as buildRequest() and produces the same document, but never holds it in memory:
+        ComplexData inputs are written through their iterXml() method, so a ComplexDataInput whose value is
+        a file or an iterator of chunks, or a GMLMultiPolygonFeatureCollection of an iterable of polygons,
+        is read while the request is being sent.
+        Inputs and output are checked up front, before anything is sent.
+        """
+        for (key, val) in inputs:
+            if not (is_literaldata(val) or is_complexdata(val) or is_boundingboxdata(val)):
+                raise Exception(
+                    'input type of "%s" parameter is unknown' % key)
+        responseForm = self._responseForm(output) if output is not None else None
+        return _buffered(self._iterRequest(identifier, inputs, responseForm))
+
+    def _iterRequest(self, identifier, inputs, responseForm):
+        yield _start_tag('wps:Execute', [('service', 'WPS'), ('version', WPS_DEFAULT_VERSION),
+                                         ('xsi:schemaLocation', '%s %s' % (namespaces['wps'],
+                                                                           WPS_DEFAULT_SCHEMA_LOCATION))],
+                         nsmap=['wps', 'ows', 'xlink', 'xsi'])
+        yield b'<ows:Identifier>' + _escape(identifier) + b'</ows:Identifier>'
+        yield b'<wps:DataInputs>'
+        for (key, val) in inputs:
+            yield b'<wps:Input><ows:Identifier>' + _escape(key) + b'</ows:Identifier>'
+            if is_literaldata(val):
+                log.debug("literaldata %s", key)
+                yield b'<wps:Data><wps:LiteralData>' + _escape(val) + b'</wps:LiteralData></wps:Data>'
+            elif is_complexdata(val):
+                log.debug("complexdata %s", key)
+                for chunk in val.iterXml():
+                    yield chunk
+            else:
+                yield etree.tostring(val.get_xml())
+            yield b'</wps:Input>'
+        yield b'</wps:DataInputs>'
+        if responseForm is not None:
+            yield etree.tostring(responseForm)
+        yield b'</wps:Execute>'
+
+    def _responseForm(self, output):
+        responseFormElement = etree.Element(nspath_eval('wps:ResponseForm', namespaces))
+        responseDocumentElement = etree.SubElement(
+            responseFormElement, nspath_eval(
+                'wps:ResponseDocument', namespaces),
+                                                   attrib={'storeExecuteResponse': 'true', 'status': 'true'})
+        if isinstance(output, str):
+            self._add_output(
+                responseDocumentElement, output, asReference=True)
+        elif isinstance(output, list):
+            for (identifier, as_reference) in output:
+                self._add_output(
+                    responseDocumentElement, identifier, asReference=as_reference)
+        else:
+            raise Exception(
+                'output parameter is neither string nor list. output=%s' % output)
+        return responseFormElement
+
     def _add_output(self, element, identifier, asReference=False):
         outputElement = etree.SubElement(
             element, nspath_eval('wps:Output', namespaces),
@@ -691,54 +1102,84 @@ class WPSExecution():
         """
         Method to write the outputs of a WPS process to a file:
         either retrieves the referenced files from the server, or writes out the content of response embedded output.
+        All outputs are streamed one after the other into the same file, without holding them in memory.
 
         filepath: optional path to the output file, otherwise a file will be created in the local directory with the name assigned by the server,
                   or default name 'wps.out' for embedded output.
         """
 
         if self.isSucceded():
-            content = b''
-            for output in self.processOutputs:
-
-                output_content = output.retrieveData(
-                    self.username, self.password)
-
-                # ExecuteResponse contains reference to server-side output
-                if output_content is not b'':
-                    content = content + output_content
-                    if filepath is None:
-                        filepath = output.fileName
-
-                # ExecuteResponse contain embedded output
-                if len(output.data) > 0:
-                    if filepath is None:
-                        filepath = 'wps.out'
-                    for data in output.data:
-                        content = content + data
-
-            # write out content
-            if content is not '':
-                out = open(filepath, 'wb')
-                out.write(content)
-                out.close()
-                log.info('Output written to file: %s' % filepath)
+            out = None
+            try:
+                for output in self.processOutputs:
+
+                    # ExecuteResponse contains reference to server-side output
+                    if output.reference is not None:
+                        output.fileName = output._referenceFileName()
+                        if filepath is None:
+                            filepath = output.fileName
+                        out = out or open(filepath, 'wb')
+                        output.streamData(out, self.username, self.password)
+
+                    # ExecuteResponse contain embedded output
+                    if len(output.data) > 0:
+                        if filepath is None:
+                            filepath = 'wps.out'
+                        out = out or open(filepath, 'wb')
+                        output.writeData(out)
+            finally:
+                if out is not None:
+                    out.close()
+                    log.info('Output written to file: %s' % filepath)
 
         else:
             raise Exception(
                 "Execution not successfully completed: status=%s" % self.status)
 
+    def downloadOutputs(self, directory='', checksums=None, max_workers=4):
+        """
+        Method to write each output of a WPS process to its own file, streaming referenced outputs
+        from the server concurrently and writing embedded output as it goes.
+        Returns a dictionary of file paths keyed by output identifier.
+
+        directory: directory to write to, the file names are the ones assigned by the server, or the output identifiers
+        checksums: optional dictionary of 'algorithm:hexdigest' strings (e.g. 'sha256:9f86...') keyed by output identifier,
+                   a mismatch removes the file and raises a ValueError
+        max_workers: number of concurrent downloads
+        """
+
+        if not self.isSucceded():
+            raise Exception(
+                "Execution not successfully completed: status=%s" % self.status)
+        checksums = checksums or {}
+
+        def write(output):
+            return output.identifier, output.writeToDisk(
+                os.path.join(directory, ''), self.username, self.password, checksum=checksums.get(output.identifier))
+
+        outputs = [output for output in self.processOutputs if output.reference is not None or len(output.data) > 0]
+        if not outputs:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(outputs)))) as executor:
+            return dict(executor.map(write, outputs))
+
     def submitRequest(self, request):
         """
         Submits a WPS Execute document to a remote service, returns the XML response document from the server.
         This method will save the request document and the first returned response document.
 
-        request: the XML request document to be submitted as POST to the server.
+        request: the XML request document to be submitted as POST to the server,
+            or an iterator of bytes chunks (see iterRequest()), posted with chunked transfer encoding and not saved.
         """
 
-        self.request = request
+        headers = None
+        if isinstance(request, (bytes, str)) or is_literaldata(request):
+            self.request = request
+        else:
+            headers = {'Content-Type': 'text/xml'}
         reader = WPSExecuteReader(verbose=self.verbose)
         response = reader.readFromUrl(
-            self.url, request, method='Post', username=self.username, password=self.password)
+            self.url, request, method='Post', username=self.username, password=self.password, headers=headers)
         self.response = response
         return response
 
@@ -759,6 +1200,9 @@ class WPSExecution():
         Method to parse a WPS response document
         """
 
+        # every response describes the complete state of the execution
+        self.errors = []
+
         rootTag = response.tag.split('}')[1]
         # <ns0:ExecuteResponse>
         if rootTag == 'ExecuteResponse':
@@ -771,6 +1215,11 @@ class WPSExecution():
         else:
             log.debug('Unknown Response')
 
+        if self._resultCache is not None and self.isSucceded():
+            cache, key = self._resultCache
+            cache.put(key, etree.tostring(response))
+            self._resultCache = None
+
         # log status, errors
         log.info('Execution status=%s' % self.status)
         log.info('Percent completed=%s' % self.percentCompleted)
@@ -832,6 +1281,10 @@ class WPSExecution():
         self.process = Process(
             root.find(nspath('Process', ns=wpsns)), verbose=self.verbose)
 
+        # inputs and outputs are listed again in each status document
+        self.dataInputs = []
+        self.processOutputs = []
+
         #<wps:DataInputs xmlns:wps="http://www.opengis.net/wps/1.0.0"
         # xmlns:ows="http://www.opengis.net/ows/1.1"
         # xmlns:xlink="http://www.w3.org/1999/xlink">
@@ -1205,62 +1658,120 @@ class Output(InputOutput):
                 if bbox:
                     self.data.append(bbox)
 
+    def _referenceFileName(self):
+        """
+        Name of the referenced output file: the value of the query string of the reference,
+        or the last part of its path.
+        """
+        # a) 'http://cida.usgs.gov/climate/gdp/process/RetrieveResultServlet?id=1318528582026OUTPUT.601bb3d0-547f-4eab-8642-7c7d2834459e'
+        # b) 'http://rsg.pml.ac.uk/wps/wpsoutputs/outputImage-11294Bd6l2a.tif'
+        if '?' in self.reference:
+            return self.reference.split('?')[1].split('=')[1]
+        return self.reference.split('/')[-1]
+
+    def _openReference(self, username=None, password=None, stream=False):
+        log.info('Output URL=%s' % self.reference)
+        self.fileName = self._referenceFileName()
+        if '?' in self.reference:
+            spliturl = self.reference.split('?')
+            return openURL(spliturl[0], spliturl[1], method='Get', username=username, password=password,
+                           stream=stream)
+        return openURL(self.reference, '', method='Get', username=username, password=password, stream=stream)
+
     def retrieveData(self, username=None, password=None):
         """
         Method to retrieve data from server-side reference:
         returns "" if the reference is not known.
+        The whole output is read into memory, see streamData and writeToDisk for large outputs.
 
         username, password: credentials to access the remote WPS server
         """
 
-        url = self.reference
-        if url is None:
+        if self.reference is None:
             return ""
+        return self._openReference(username, password).read()
 
-        # a) 'http://cida.usgs.gov/climate/gdp/process/RetrieveResultServlet?id=1318528582026OUTPUT.601bb3d0-547f-4eab-8642-7c7d2834459e'
-        # b) 'http://rsg.pml.ac.uk/wps/wpsoutputs/outputImage-11294Bd6l2a.tif'
-        log.info('Output URL=%s' % url)
-        if '?' in url:
-            spliturl = url.split('?')
-            u = openURL(spliturl[0], spliturl[
-                        1], method='Get', username=username, password=password)
-            # extract output filepath from URL query string
-            self.fileName = spliturl[1].split('=')[1]
-        else:
-            u = openURL(
-                url, '', method='Get', username=username, password=password)
-            # extract output filepath from base URL
-            self.fileName = url.split('/')[-1]
+    def streamData(self, out, username=None, password=None, digest=None, chunk_size=CHUNK_SIZE):
+        """
+        Method to copy the server-side reference to the file-like object out in chunks.
+        Returns the number of bytes written.
+
+        digest: optional hashlib object updated with the data
+        """
+
+        source = self._openReference(username, password, stream=True).raw()
+        size = 0
+        try:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                out.write(chunk)
+                if digest is not None:
+                    digest.update(chunk)
+                size += len(chunk)
+        finally:
+            source.close()
+        return size
+
+    def writeData(self, out, digest=None):
+        """
+        Method to write the embedded output data to the file-like object out, item by item.
+        """
 
-        return u.read()
+        for data in self.data:
+            if isinstance(data, BoundingBox):
+                data = ' '.join(str(c) for c in (data.minx, data.miny, data.maxx, data.maxy))
+            if not isinstance(data, bytes):
+                data = data.encode('utf-8')
+            out.write(data)
+            if digest is not None:
+                digest.update(data)
 
-    def writeToDisk(self, path=None, username=None, password=None):
+    def writeToDisk(self, path=None, username=None, password=None, checksum=None):
         """
         Method to write an output of a WPS process to disk:
-        it either retrieves the referenced file from the server, or write out the content of response embedded output.
+        it either streams the referenced file from the server, or writes out the content of response embedded output.
+        Returns the path of the file written, or None if the output has no content.
 
-        filepath: optional path to the output file, otherwise a file will be created in the local directory with the name assigned by the server,
+        path: optional prefix of the output file, prepended as is to the name assigned by the server
+              (so a directory needs its trailing separator), otherwise the file is created in the local directory,
         username, password: credentials to access the remote WPS server
+        checksum: optional 'algorithm:hexdigest' string to verify the written content against,
+                  a mismatch removes the file and raises a ValueError
         """
 
-        # Check if ExecuteResponse contains reference to server-side output
-        content = self.retrieveData(username, password)
+        if self.reference is None and len(self.data) == 0:
+            return None
 
-        # ExecuteResponse contain embedded output
-        if content is "" and len(self.data) > 0:
+        if self.reference is not None:
+            self.fileName = self._referenceFileName()
+        else:
+            self.fileName = self.identifier
+        if self.fileName == "":
             self.fileName = self.identifier
-            for data in self.data:
-                content = content + data
+        self.filePath = (path or '') + self.fileName
+
+        digest = None
+        if checksum is not None:
+            algorithm, expected = checksum.split(':', 1)
+            digest = hashlib.new(algorithm)
+
+        with open(self.filePath, 'wb') as out:
+            # ExecuteResponse contains reference to server-side output
+            if self.reference is not None:
+                self.streamData(out, username, password, digest=digest)
+            # ExecuteResponse contain embedded output
+            else:
+                self.writeData(out, digest=digest)
 
-        # write out content
-        if content is not "":
-            if self.fileName == "":
-                self.fileName = self.identifier
-            self.filePath = path + self.fileName
-            out = open(self.filePath, 'wb')
-            out.write(content)
-            out.close()
-            log.info('Output written to file: %s' % self.filePath)
+        if digest is not None and digest.hexdigest().lower() != expected.lower():
+            os.remove(self.filePath)
+            raise ValueError('Checksum mismatch for output %s: expected %s, got %s' %
+                             (self.identifier, expected, digest.hexdigest()))
+
+        log.info('Output written to file: %s' % self.filePath)
+        return self.filePath
 
 
 class WPSException:
@@ -1300,6 +1811,9 @@ class Process(object):
 
         # <ProcessDescription statusSupported="true" storeSupported="true" ns0:processVersion="1.0.0">
         self.processVersion = elem.get(nspath('processVersion', ns=wpsns))
+        if self.processVersion is None:
+            # <ProcessDescription> is unqualified, its processVersion attribute is not
+            self.processVersion = elem.get(nspath_eval('wps:processVersion', namespaces))
         self.statusSupported = bool(elem.get("statusSupported"))
         self.storeSupported = bool(elem.get("storeSupported"))
         self.abstract = None
@@ -1390,17 +1904,46 @@ class BoundingBoxDataInput(object):
 
 class ComplexDataInput(IComplexDataInput, ComplexData):
 
+    """
+    ComplexData input given by value: a URL (sent as a wps:Reference), a string,
+    or a file-like object or iterator of text or bytes chunks, read only when the request is written.
+    """
+
     def __init__(self, value, mimeType=None, encoding=None, schema=None):
         super(ComplexDataInput, self).__init__(
             mimeType=mimeType, encoding=encoding, schema=schema)
         self.value = value
 
     def getXml(self):
+        if is_streamed(self.value):
+            # reads the whole value in memory; iterXml() does not
+            self.value = b''.join(_chunks(self.value)).decode('utf-8')
         if is_reference(self.value):
             return self.complexDataAsReference()
         else:
             return self.complexDataRaw()
 
+    def iterXml(self):
+        if not is_streamed(self.value):
+            for chunk in super(ComplexDataInput, self).iterXml():
+                yield chunk
+            return
+        yield _start_tag('wps:Data', nsmap=['wps'])
+        yield _start_tag('wps:ComplexData', self._attributes())
+        for chunk in _chunks(self.value):
+            yield _escape(chunk)
+        yield b'</wps:ComplexData></wps:Data>'
+
+    def _attributes(self):
+        attrib = []
+        if self.encoding:
+            attrib.append(('encoding', self.encoding))
+        if self.schema:
+            attrib.append(('schema', self.schema))
+        if self.mimeType:
+            attrib.append(('mimeType', self.mimeType))
+        return attrib
+
     def complexDataAsReference(self):
         """
            <wps:Reference xlink:href="http://somewhere/test.xml"/>
@@ -1419,15 +1962,8 @@ class ComplexDataInput(IComplexDataInput, ComplexData):
         '''
         dataElement = etree.Element(nspath_eval('wps:Data', namespaces))
 
-        attrib = dict()
-        if self.encoding:
-            attrib['encoding'] = self.encoding
-        if self.schema:
-            attrib['schema'] = self.schema
-        if self.mimeType:
-            attrib['mimeType'] = self.mimeType
         complexDataElement = etree.SubElement(
-            dataElement, nspath_eval('wps:ComplexData', namespaces), attrib=attrib)
+            dataElement, nspath_eval('wps:ComplexData', namespaces), attrib=dict(self._attributes()))
         complexDataElement.text = self.value
         return dataElement
 
@@ -1547,9 +2083,38 @@ class GMLMultiPolygonFeatureCollection(FeatureCollection):
         Initializer accepts an array of polygons, where each polygon is an array of (lat,lon) tuples.
         Example: polygons = [ [(-102.8184, 39.5273), (-102.8184, 37.418), (-101.2363, 37.418), (-101.2363, 39.5273), (-102.8184, 39.5273)],
                               [(-92.8184, 39.5273), (-92.8184, 37.418), (-91.2363, 37.418), (-91.2363, 39.5273), (-92.8184, 39.5273)] ]
+        When the request is streamed, polygons and their vertices may also be iterators (e.g. generators reading
+        a large file), consumed while the request is written.
         '''
         self.polygons = polygons
 
+    def iterXml(self):
+        yield _start_tag('wps:Data', nsmap=['wps', 'gml', 'xsi'])
+        yield _start_tag('wps:ComplexData', [('mimeType', 'text/xml'), ('encoding', 'UTF-8'),
+                                             ('schema', GML_SCHEMA_LOCATION)])
+        yield _start_tag('gml:featureMembers', [('xsi:schemaLocation', '%s %s' % (DRAW_NAMESPACE,
+                                                                                  DRAW_SCHEMA_LOCATION))])
+        yield b'<gml:box gml:id="box.1"><gml:the_geom>'
+        yield _start_tag('gml:MultiPolygon', [('srsDimension', '2'),
+                                              ('srsName', 'http://www.opengis.net/gml/srs/epsg.xml#4326')])
+        for polygon in self.polygons:
+            yield (b'<gml:polygonMember><gml:Polygon><gml:exterior><gml:LinearRing>'
+                   b'<gml:posList>')
+            batch = []
+            separator = b''
+            for x, y in polygon:
+                batch.append("%s %s" % (x, y))
+                if len(batch) == POSLIST_BATCH:
+                    yield separator + _escape(' '.join(batch))
+                    separator = b' '
+                    batch = []
+            if batch:
+                yield separator + _escape(' '.join(batch))
+            yield (b'</gml:posList>'
+                   b'</gml:LinearRing></gml:exterior></gml:Polygon></gml:polygonMember>')
+        yield b'</gml:MultiPolygon></gml:the_geom><gml:ID>0</gml:ID></gml:box>'
+        yield b'</gml:featureMembers></wps:ComplexData></wps:Data>'
+
     def getXml(self):
         '''
             <wps:Data>
@@ -1607,7 +2172,7 @@ class GMLMultiPolygonFeatureCollection(FeatureCollection):
             posListElement = etree.SubElement(
                 linearRingElement, nspath_eval('gml:posList', namespaces))
             posListElement.text = ' '.join(
-                ["%s %s" % (x, y) for x, y in polygon[:]])
+                ["%s %s" % (x, y) for x, y in polygon])
 
         idElement = etree.SubElement(
             boxElement, nspath_eval('gml:ID', namespaces))
@@ -0,0 +1,225 @@
+# -*- coding: ISO-8859-15 -*-
+# =============================================================================
+# OWSLib. Copyright (C) 2005 Sean C. Gillies
+#
+# Contact email: sgillies@frii.com
+# =============================================================================
+
+"""
+Asynchronous monitoring of many WPS executions (Python 3.5+).
+
+WPSJobManager tracks WPSExecution objects on an asyncio event loop.  Each
+job polls its statusLocation on its own schedule: the delay grows
+exponentially while a job reports no progress and otherwise follows the
+rate at which percentCompleted advances, so short jobs are picked up
+quickly and long ones are not hammered.  Status checks and downloads are
+made with openURL over one pooled requests session, on a small executor
+shared by all jobs, so hundreds of jobs need neither a thread nor a
+connection each, and the retry policy, circuit breaker, limiter,
+deadlines and instrumentation of owslib.util apply to them.  Outputs are
+downloaded into a directory per job, job-<id>; failed jobs are logged.
+
+Example::
+
+    manager = WPSJobManager(directory='outputs')
+    for inputs in batches:
+        manager.add(wps.execute('gdp.Algorithm', inputs, output='OUTPUT'),
+                    callback=lambda job: print(job.execution.status))
+    manager.run()
+"""
+
+import asyncio
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from owslib.util import log, openURL, requests
+
+
+def _running_loop():
+    """The event loop running the current coroutine, None outside one"""
+    try:
+        return asyncio.get_running_loop()
+    except AttributeError:      # Python < 3.7
+        loop = asyncio.get_event_loop()
+        return loop if loop.is_running() else None
+    except RuntimeError:
+        return None
+
+
+class WPSJob(object):
+    """
+    A WPSExecution tracked by a WPSJobManager.
+
+    Awaiting a job waits for the execution to complete and returns the job;
+    done() tells whether it has.  id numbers the jobs of a manager, delay is
+    the current polling interval and paths the files its outputs were
+    downloaded to.
+    """
+
+    def __init__(self, execution, future, delay, id=0):
+        self.id = id
+        self.execution = execution
+        self.future = future
+        self.delay = delay
+        self.polls = 0
+        self.paths = []
+        self._progress = None   # (time, percentCompleted) of the last progress seen
+
+    def done(self):
+        return self.future.done()
+
+    def __await__(self):
+        return self.future.__await__()
+
+    def next_delay(self, min_delay, max_delay, backoff):
+        """
+        Polling interval after a status check: half the estimated time to
+        completion when percentCompleted advances, the previous interval
+        times backoff when it does not.
+        """
+        now = time.monotonic()
+        percent = self.execution.percentCompleted or 0
+        if self._progress is None or percent <= self._progress[1]:
+            if self._progress is None:
+                self._progress = (now, percent)
+            delay = self.delay * backoff
+        else:
+            elapsed = now - self._progress[0]
+            rate = (percent - self._progress[1]) / elapsed if elapsed > 0 else 0
+            delay = (100 - percent) / rate / 2 if rate > 0 else self.delay * backoff
+            self._progress = (now, percent)
+        self.delay = min(max(delay, min_delay), max_delay)
+        return self.delay
+
+
+class WPSJobManager(object):
+    """
+    Tracks many WPS executions concurrently on an asyncio event loop.
+
+    min_delay, max_delay: bounds of the polling interval in seconds
+    backoff: growth of the interval while a job reports no progress
+    max_connections: size of the connection pool, and of the executor
+        running the blocking HTTP calls
+    download: download the referenced outputs of succeeded jobs, into a
+        job-<id> directory per job under directory (the working directory
+        by default)
+    loop: event loop to track the jobs on; by default the running one, or
+        a new one when jobs are added outside a running loop
+    """
+
+    def __init__(self, min_delay=1, max_delay=60, backoff=2.0, max_connections=10, download=False,
+                 directory=None, timeout=30, loop=None):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.download = download
+        self.directory = directory
+        self.timeout = timeout
+        self.jobs = []
+
+        self._loop = loop
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @property
+    def loop(self):
+        if self._loop is None:
+            self._loop = _running_loop() or asyncio.new_event_loop()
+        return self._loop
+
+    def add(self, execution, callback=None):
+        """
+        Start tracking execution and return its WPSJob.  callback(job) is
+        called on the event loop once the job completed, successfully or
+        not.  Executions that completed already (synchronous responses)
+        finish without polling.
+        """
+        future = self.loop.create_future()
+        job = WPSJob(execution, future, self.min_delay, len(self.jobs))
+        future.add_done_callback(lambda f: self._log_failure(job))
+        if callback is not None:
+            future.add_done_callback(lambda f: callback(job))
+        self.jobs.append(job)
+        job._task = self.loop.create_task(self._track(job))
+        return job
+
+    @staticmethod
+    def _log_failure(job):
+        """Log the error of a failed job, which also marks it as retrieved for asyncio"""
+        if not job.future.cancelled() and job.future.exception() is not None:
+            log.warning('WPS job %d (%s) failed: %s' %
+                        (job.id, job.execution.statusLocation, job.future.exception()))
+
+    def _poll(self, job):
+        """Blocking status check, run on the executor"""
+        execution = job.execution
+        response = openURL(execution.statusLocation, method='Get', username=execution.username,
+                           password=execution.password, timeout=self.timeout, session=self.session)
+        execution.checkStatus(response=response.read(), sleepSecs=0)
+
+    def _retrieve(self, job, output):
+        """Blocking download of one referenced output of job, run on the executor"""
+        execution = job.execution
+        response = openURL(output.reference, method='Get', username=execution.username,
+                           password=execution.password, timeout=self.timeout, stream=True,
+                           session=self.session)
+        try:
+            name = output._referenceFileName() or output.identifier
+            output.fileName = name
+            directory = os.path.join(self.directory or '', 'job-%d' % job.id)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            path = os.path.join(directory, name)
+            with open(path, 'wb') as f:
+                shutil.copyfileobj(response.raw(), f, 65536)
+        finally:
+            response.close()
+        output.filePath = path
+        log.info('Output written to file: %s' % path)
+        return path
+
+    async def _track(self, job):
+        execution = job.execution
+        loop = _running_loop()
+        try:
+            while not execution.isComplete():
+                if execution.statusLocation is None:
+                    raise ValueError('Execution has no statusLocation to poll')
+                await asyncio.sleep(job.delay)
+                await loop.run_in_executor(self._executor, self._poll, job)
+                job.polls += 1
+                if not execution.isComplete():
+                    job.next_delay(self.min_delay, self.max_delay, self.backoff)
+                log.debug('WPS job %s: %s (%s%%), next check in %.1fs' %
+                          (execution.statusLocation, execution.status, execution.percentCompleted, job.delay))
+
+            if self.download and execution.isSucceded():
+                outputs = [o for o in execution.processOutputs if o.reference is not None]
+                job.paths = await asyncio.gather(*[
+                    loop.run_in_executor(self._executor, self._retrieve, job, output)
+                    for output in outputs])
+        except Exception as err:
+            if not job.future.done():
+                job.future.set_exception(err)
+            return
+        if not job.future.done():
+            job.future.set_result(job)
+
+    async def wait(self, jobs=None, return_exceptions=False):
+        """Wait for jobs (all tracked jobs by default) and return them"""
+        jobs = self.jobs if jobs is None else jobs
+        return await asyncio.gather(*[job.future for job in jobs], return_exceptions=return_exceptions)
+
+    def run(self, return_exceptions=False):
+        """Blocking helper: run the event loop until all tracked jobs completed"""
+        return self.loop.run_until_complete(self.wait(return_exceptions=return_exceptions))
+
+    def close(self):
+        """Release the executor and the connection pool"""
+        self._executor.shutdown(wait=False)
+        self.session.close()
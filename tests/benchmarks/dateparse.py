@@ -0,0 +1,60 @@
+"""
+Benchmark of owslib.dateparse against dateutil over the date time strings
+found in the SOS and CUAHSI WaterML fixtures.
+
+Usage: python -m tests.benchmarks.dateparse [repeat]
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import glob
+import os
+import re
+import sys
+import timeit
+
+from dateutil import parser
+
+from owslib import dateparse
+from tests.utils import resource_file
+
+DATETIME = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?')
+FIXTURES = ('sos_*.xml', 'cuahsi_*.xml')
+
+
+def fixture_strings():
+    """Date time strings of each fixture, keyed by file name"""
+    strings = {}
+    for pattern in FIXTURES:
+        for path in sorted(glob.glob(resource_file(pattern))):
+            with open(path, 'rb') as f:
+                found = DATETIME.findall(f.read().decode('utf-8', 'replace'))
+            if found:
+                strings[os.path.basename(path)] = found
+    return strings
+
+
+def bench(function, strings, repeat):
+    def run():
+        dateparse.clear_cache()
+        function(strings)
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def main(repeat=5):
+    candidates = [
+        ('dateutil', lambda strings: [parser.parse(s) for s in strings]),
+        ('parse_datetime', lambda strings: [dateparse.parse_datetime(s) for s in strings]),
+        ('parse_epoch_ns', lambda strings: [dateparse.parse_epoch_ns(s) for s in strings]),
+    ]
+    if dateparse.np:
+        candidates.append(('parse_datetime_array', dateparse.parse_datetime_array))
+
+    print('%-42s %7s %s' % ('fixture', 'strings', '  '.join('%20s' % name for name, f in candidates)))
+    for name, strings in sorted(fixture_strings().items()):
+        timings = [bench(function, strings, repeat) for label, function in candidates]
+        print('%-42s %7d %s' % (name, len(strings), '  '.join('%18.3fms' % (t * 1000) for t in timings)))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,102 @@
+"""
+Import time of the OWSLib service modules, each imported in a fresh
+interpreter, checked against a budget.  Modules that are imported on
+first use (numpy, pyproj, requests, the metadata parsers) must not be
+imported by `import owslib.<service>` at all.
+
+Exits with status 1 when a module is over budget or imports one of
+the lazy modules, so it can run in CI.
+
+Usage: python -m tests.benchmarks.imports [--repeat N] [--scale F] [module ...]
+
+    --repeat N   imports per module, the fastest is kept (default 5)
+    --scale F    multiply the budgets by F, for slow machines (default 1)
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import argparse
+import json
+import subprocess
+import sys
+
+# milliseconds, cumulative import time of the module and everything it imports
+BUDGETS = {
+    'owslib.wms': 120,
+    'owslib.wmts': 120,
+    'owslib.wfs': 120,
+    'owslib.wcs': 120,
+    'owslib.csw': 120,
+    'owslib.sos': 150,
+    'owslib.wps': 120,
+    'owslib.tms': 120,
+}
+
+# imported on first use only
+LAZY = ('numpy', 'pyproj', 'requests', 'owslib.iso', 'owslib.fgdc', 'owslib.dif', 'owslib.gm03', 'cgi')
+
+CHILD = '''
+import json, sys, time
+before = set(sys.modules)
+started = time.time()
+import %s
+elapsed = time.time() - started
+print(json.dumps({"time": elapsed, "modules": sorted(set(sys.modules) - before)}))
+'''
+
+
+def measure(module, repeat=5):
+    """(seconds, modules imported) of the fastest of repeat imports of module"""
+    best = None
+    for i in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', CHILD % module])
+        result = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+        if best is None or result['time'] < best['time']:
+            best = result
+    return best['time'], best['modules']
+
+
+def importtime(module, count=10):
+    """Slowest imports of module as reported by python -X importtime (Python 3.7+), as text"""
+    if sys.version_info < (3, 7):
+        return ''
+    process = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', 'import %s' % module],
+                               stderr=subprocess.PIPE, stdout=subprocess.PIPE)
+    stderr = process.communicate()[1].decode('utf-8')
+    rows = []
+    for line in stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    return '\n'.join('%10.1f ms %s' % (cumulative / 1000.0, name) for cumulative, name in sorted(rows)[-count:])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import time of the OWSLib service modules')
+    parser.add_argument('modules', nargs='*', help='modules to check, all by default')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--detail', action='store_true', help='show the slowest imports of each module')
+    args = parser.parse_args(argv)
+
+    failures = []
+    print('%-14s %10s %10s  %s' % ('module', 'ms', 'budget', 'eagerly imported'))
+    for module in args.modules or sorted(BUDGETS):
+        elapsed, modules = measure(module, args.repeat)
+        budget = BUDGETS.get(module, 120) * args.scale
+        eager = [m for m in LAZY if m in modules]
+        print('%-14s %10.1f %10.0f  %s' % (module, elapsed * 1000, budget, ', '.join(eager)))
+        if args.detail:
+            print(importtime(module))
+        if elapsed * 1000 > budget:
+            failures.append('%s takes %.1f ms to import, the budget is %.0f ms' % (module, elapsed * 1000, budget))
+        if eager:
+            failures.append('%s imports %s' % (module, ', '.join(eager)))
+
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""
+Micro-benchmark of parsing the documents in tests/resources: construction
+of service objects from stored capabilities (WebMapService(xml=...),
+WebFeatureService(xml=...), ...), metadata records (MD_Metadata, DIF,
+GM03, ...), WaterML and SOS responses.  Each document is timed, and the
+memory allocated while parsing it is measured with tracemalloc.
+
+Each etree implementation runs in its own process, lxml and
+xml.etree (lxml blocked), so both are measured from one run.  Results
+can be saved as JSON and compared with those of an earlier run.
+
+Usage: python -m tests.benchmarks.parsers [options] [pattern ...]
+
+    --repeat N       timings per document, the best is kept (default 5)
+    --backend NAME   lxml or etree, both by default
+    --save PATH      write the results to PATH
+    --compare PATH   show times relative to the results saved in PATH
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import argparse
+import fnmatch
+import gc
+import glob
+import json
+import os
+import subprocess
+import sys
+import timeit
+import warnings
+
+try:
+    import tracemalloc
+except ImportError:     # Python 2
+    tracemalloc = None
+
+from tests.utils import resource_file
+
+URL = 'http://localhost/'
+BACKENDS = ('lxml', 'etree')
+
+
+def _version(content, default):
+    """version attribute of the root element"""
+    from owslib.etree import etree
+    return etree.fromstring(content).get('version', default)
+
+
+def wms(content):
+    from owslib.wms import WebMapService
+    return WebMapService(URL, version=_version(content, '1.1.1'), xml=content)
+
+
+def wmts(content):
+    from owslib.wmts import WebMapTileService
+    return WebMapTileService(URL, xml=content)
+
+
+def wfs(content):
+    from owslib.wfs import WebFeatureService
+    return WebFeatureService(URL, version=_version(content, '1.0.0'), xml=content)
+
+
+def wcs(content):
+    from owslib.wcs import WebCoverageService
+    # the WCS clients take documents as text
+    return WebCoverageService(URL, version=_version(content, '1.0.0'), xml=content.decode('utf-8'))
+
+
+def sos(content):
+    from owslib.sos import SensorObservationService
+    return SensorObservationService(URL, version=_version(content, '1.0.0'), xml=content)
+
+
+def sos_observation(content):
+    from owslib.etree import etree
+    from owslib.swe.observation.sos200 import SOSGetObservationResponse
+    return SOSGetObservationResponse(etree.fromstring(content))
+
+
+def wps_capabilities(content):
+    from owslib.wps import WebProcessingService
+    wps = WebProcessingService(URL, skip_caps=True)
+    wps.getcapabilities(xml=content)
+    return wps
+
+
+def wps_describeprocess(content):
+    from owslib.wps import WebProcessingService
+    return WebProcessingService(URL, skip_caps=True).describeprocesses('ALL', xml=content)
+
+
+def wps_execute_response(content):
+    from owslib.wps import WPSExecution
+    execution = WPSExecution()
+    execution.checkStatus(response=content, sleepSecs=0)
+    return execution
+
+
+def iso(content):
+    from owslib.etree import etree
+    from owslib.iso import MD_Metadata
+    return MD_Metadata(etree.fromstring(content))
+
+
+def iso_che(content):
+    from owslib.etree import etree
+    from owslib.iso_che import CHE_MD_Metadata
+    return CHE_MD_Metadata(etree.fromstring(content))
+
+
+def iso_codelist(content):
+    from owslib.etree import etree
+    from owslib.iso import CodelistCatalogue
+    return CodelistCatalogue(etree.fromstring(content))
+
+
+def csw_record(content):
+    from owslib.etree import etree
+    from owslib.csw import CswRecord
+    return CswRecord(etree.fromstring(content))
+
+
+def dif(content):
+    from owslib.etree import etree
+    from owslib.dif import DIF
+    return DIF(etree.fromstring(content))
+
+
+def fgdc(content):
+    from owslib.etree import etree
+    from owslib.fgdc import Metadata
+    return Metadata(etree.fromstring(content))
+
+
+def gm03(content):
+    from owslib.etree import etree
+    from owslib.gm03 import GM03
+    return GM03(etree.fromstring(content))
+
+
+def sensorml(content):
+    from owslib.swe.sensor.sml import SensorML
+    return SensorML(content)
+
+
+def swe_datarecord(content):
+    from owslib.etree import etree
+    from owslib.swe.common import DataRecord
+    return DataRecord(etree.fromstring(content))
+
+
+def waterml(content):
+    from owslib.etree import etree
+    from owslib.waterml.wml10 import WaterML_1_0
+    from owslib.waterml.wml11 import WaterML_1_1
+    namespace = etree.fromstring(content).tag.split('}')[0]
+    if namespace.endswith('/1.0/'):
+        return WaterML_1_0(content).response
+    return WaterML_1_1(content).response
+
+
+# (fixture pattern, parser), the first matching pattern wins; fixtures matching none are listed as skipped
+PARSERS = (
+    ('wms*', wms),
+    ('*wmts-cap*', wmts),
+    ('wfs_*GetCapabilities*', wfs),
+    ('mapserver-wfs-cap.xml', wfs),
+    ('wcs_*describecoverage*', None),
+    ('wcs_*', wcs),
+    ('sos_*get_observation*', sos_observation),
+    ('sos_*getobservation*', sos_observation),
+    ('sos_*', sos),
+    ('wps_*Capabilities.xml', wps_capabilities),
+    ('wps_*DescribeProcess.xml', wps_describeprocess),
+    ('wps_*ExecuteResponse*', wps_execute_response),
+    ('iso_che.xml', iso_che),
+    ('*iso*.xml', iso),
+    ('gmxCodelists.xml', iso_codelist),
+    ('*_dc.xml', csw_record),
+    ('*_dif.xml', dif),
+    ('*_fgdc.xml', fgdc),
+    ('gm03_*', gm03),
+    ('sml_*', sensorml),
+    ('swe_*', swe_datarecord),
+    ('cuahsi_*', waterml),
+)
+
+
+def parser_of(name):
+    for pattern, parser in PARSERS:
+        if fnmatch.fnmatch(name, pattern):
+            return parser
+    return None
+
+
+def fixtures(patterns=None):
+    """(file name, parser) of the fixtures in tests/resources, parser None for skipped ones"""
+    names = sorted(os.path.basename(p) for p in glob.glob(resource_file('*.xml')))
+    if patterns:
+        names = [n for n in names if any(fnmatch.fnmatch(n, p) for p in patterns)]
+    return [(name, parser_of(name)) for name in names]
+
+
+def allocated(parser, content):
+    """Peak bytes allocated while parsing content, None without tracemalloc"""
+    if tracemalloc is None:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        parser(content)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(patterns=None, repeat=5):
+    """{file name: {'parser', 'time', 'memory'} or {'error'}} with the etree module in use"""
+    results = {}
+    for name, parser in fixtures(patterns):
+        if parser is None:
+            continue
+        with open(resource_file(name), 'rb') as f:
+            content = f.read()
+        try:
+            parser(content)     # warm up imports and caches
+            timing = min(timeit.repeat(lambda: parser(content), number=1, repeat=repeat))
+            results[name] = {'parser': parser.__name__, 'time': timing, 'memory': allocated(parser, content)}
+        except Exception as err:
+            results[name] = {'parser': parser.__name__, 'error': '%s: %s' % (type(err).__name__, err)}
+    return results
+
+
+def run_backend(backend, patterns, repeat):
+    """measure() in a child process using backend, None if it is not installed"""
+    command = [sys.executable, '-m', 'tests.benchmarks.parsers', '--child', '--backend', backend,
+               '--repeat', str(repeat)] + list(patterns or [])
+    output = subprocess.check_output(command, cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))) or '.')
+    return json.loads(output.decode('utf-8'))
+
+
+def _child(backend, patterns, repeat):
+    warnings.simplefilter('ignore')
+    if backend == 'etree':
+        sys.modules['lxml'] = None      # owslib.etree falls back to xml.etree
+    else:
+        try:
+            import lxml.etree
+        except ImportError:
+            print(json.dumps(None))
+            return
+    print(json.dumps(measure(patterns, repeat)))
+
+
+def report(results, baseline=None):
+    for backend, documents in results.items():
+        if documents is None:
+            print('%s: not installed\n' % backend)
+            continue
+        base = (baseline or {}).get(backend) or {}
+        print('%s\n%-48s %-22s %10s %10s %s' % (backend, 'fixture', 'parser', 'time ms', 'alloc KB',
+                                                  'vs baseline' if baseline else ''))
+        for name, result in sorted(documents.items()):
+            if 'error' in result:
+                print('%-48s %-22s failed: %s' % (name, result['parser'], result['error']))
+                continue
+            previous = base.get(name, {}).get('time')
+            print('%-48s %-22s %10.3f %10s %s' % (
+                name, result['parser'], result['time'] * 1000,
+                '%.1f' % (result['memory'] / 1024.0) if result['memory'] is not None else '-',
+                '%9.2fx' % (result['time'] / previous) if previous else ''))
+        print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of parsing the fixtures in tests/resources')
+    parser.add_argument('patterns', nargs='*', help='fixture name patterns, all fixtures by default')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--backend', choices=BACKENDS, action='append')
+    parser.add_argument('--save')
+    parser.add_argument('--compare')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return _child(args.backend[0], args.patterns, args.repeat)
+
+    results = dict((backend, run_backend(backend, args.patterns, args.repeat))
+                   for backend in args.backend or BACKENDS)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    report(results, baseline)
+
+    skipped = [name for name, p in fixtures(args.patterns) if p is None]
+    if skipped:
+        print('skipped: %s' % ', '.join(skipped))
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
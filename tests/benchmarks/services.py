@@ -0,0 +1,274 @@
+"""
+End-to-end benchmark of the service clients against the local stand-in
+server of tests/standin.py: throughput, latency percentiles and peak RSS
+of each scenario, run in its own process so peak RSS is its own.
+
+Usage: python -m tests.benchmarks.services [options] [scenario ...]
+
+    --iterations N    operations per scenario (default 50)
+    --concurrency N   threads issuing operations (default 1)
+    --latency S       seconds the server waits before each response
+    --bandwidth B     bytes per second the server writes at
+    --error-rate R    fraction of requests the server answers with 503
+    --json PATH       also write the results to PATH
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+from tests.standin import StandInServer
+
+
+def wms_capabilities(version):
+    def setup(url):
+        return url
+
+    def operation(url):
+        from owslib.wms import WebMapService
+        WebMapService(url + '/wms', version=version)
+    return setup, operation
+
+
+def wms_getmap():
+    def setup(url):
+        from owslib.wms import WebMapService
+        wms = WebMapService(url + '/wms', version='1.1.1')
+        name = list(wms.contents)[0]
+        return wms, name, wms[name].boundingBoxWGS84
+
+    def operation(state):
+        wms, name, bbox = state
+        wms.getmap(layers=[name], srs='EPSG:4326', bbox=bbox, size=(256, 256), format='image/png').read()
+    return setup, operation
+
+
+def wmts_capabilities():
+    def setup(url):
+        return url
+
+    def operation(url):
+        from owslib.wmts import WebMapTileService
+        WebMapTileService(url + '/wmts')
+    return setup, operation
+
+
+def wmts_gettile():
+    def setup(url):
+        from owslib.wmts import WebMapTileService
+        wmts = WebMapTileService(url + '/wmts')
+        name = list(wmts.contents)[0]
+        tilematrixset = list(wmts[name].tilematrixsetlinks)[0]
+        tilematrix = list(wmts.tilematrixsets[tilematrixset].tilematrix)[0]
+        return wmts, name, tilematrixset, tilematrix
+
+    def operation(state):
+        wmts, name, tilematrixset, tilematrix = state
+        wmts.gettile(layer=name, tilematrixset=tilematrixset, tilematrix=tilematrix, row=0, column=0).read()
+    return setup, operation
+
+
+def wfs_getfeature(version, page=100):
+    def setup(url):
+        from owslib.wfs import WebFeatureService
+        wfs = WebFeatureService(url + '/wfs', version=version)
+        return wfs, list(wfs.contents)[0], [0]
+
+    def operation(state):
+        wfs, typename, position = state
+        start = position[0]
+        position[0] = (start + page) % 1000
+        wfs.getfeature(typename=[typename], maxfeatures=page, startindex=start).read()
+    return setup, operation
+
+
+def csw_getrecords():
+    def setup(url):
+        from owslib.csw import CatalogueServiceWeb
+        return CatalogueServiceWeb(url + '/csw', skip_caps=True)
+
+    def operation(csw):
+        csw.getrecords2(maxrecords=10, esn='full')
+    return setup, operation
+
+
+def sos_capabilities():
+    def setup(url):
+        return url
+
+    def operation(url):
+        from owslib.sos import SensorObservationService
+        SensorObservationService(url + '/sos')
+    return setup, operation
+
+
+def sos_getobservation():
+    def setup(url):
+        from owslib.sos import SensorObservationService
+        sos = SensorObservationService(url + '/sos')
+        return sos, sos.offerings[0]
+
+    def operation(state):
+        sos, offering = state
+        sos.get_observation(offerings=[offering.name], responseFormat=offering.response_formats[0],
+                            observedProperties=[offering.observed_properties[0]])
+    return setup, operation
+
+
+def wps_capabilities():
+    def setup(url):
+        return url
+
+    def operation(url):
+        from owslib.wps import WebProcessingService
+        WebProcessingService(url + '/wps')
+    return setup, operation
+
+
+def wps_execute():
+    def setup(url):
+        from owslib.wps import WebProcessingService
+        return WebProcessingService(url + '/wps', skip_caps=True)
+
+    def operation(wps):
+        execution = wps.execute('gov.usgs.cida.gdp.wps.algorithm.FeatureWeightedGridStatisticsAlgorithm',
+                                [("DATASET_ID", "ccsm3_a1b_tmax")], output='OUTPUT')
+        while not execution.isComplete():
+            execution.checkStatus(sleepSecs=0)
+    return setup, operation
+
+
+SCENARIOS = OrderedDict([
+    ('WMS 1.1.1 GetCapabilities', wms_capabilities('1.1.1')),
+    ('WMS 1.3.0 GetCapabilities', wms_capabilities('1.3.0')),
+    ('WMS GetMap', wms_getmap()),
+    ('WMTS GetCapabilities', wmts_capabilities()),
+    ('WMTS GetTile', wmts_gettile()),
+    ('WFS 1.1.0 GetFeature', wfs_getfeature('1.1.0')),
+    ('WFS 2.0.0 GetFeature', wfs_getfeature('2.0.0')),
+    ('CSW GetRecords', csw_getrecords()),
+    ('SOS GetCapabilities', sos_capabilities()),
+    ('SOS GetObservation', sos_getobservation()),
+    ('WPS GetCapabilities', wps_capabilities()),
+    ('WPS Execute', wps_execute()),
+])
+
+
+def percentile(values, p):
+    """Nearest rank percentile of sorted values"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(p / 100.0 * len(values) + 0.5)) - 1))]
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, None if unknown"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run(name, url, iterations, concurrency):
+    """Result of running scenario name against the server at url"""
+    setup, operation = SCENARIOS[name]
+    state = setup(url)
+
+    def timed(i):
+        started = time.time()
+        try:
+            operation(state)
+        except Exception:
+            return None
+        return time.time() - started
+
+    started = time.time()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            timings = list(executor.map(timed, range(iterations)))
+    else:
+        timings = [timed(i) for i in range(iterations)]
+    elapsed = time.time() - started
+
+    latencies = sorted(t for t in timings if t is not None)
+    return {
+        'operations': iterations,
+        'errors': iterations - len(latencies),
+        'throughput': iterations / elapsed if elapsed else None,
+        'p50': percentile(latencies, 50),
+        'p90': percentile(latencies, 90),
+        'p99': percentile(latencies, 99),
+        'peak_rss': peak_rss(),
+    }
+
+
+def _child(name, url, iterations, concurrency, queue):
+    try:
+        queue.put(run(name, url, iterations, concurrency))
+    except Exception as err:
+        queue.put({'failed': '%s: %s' % (type(err).__name__, err)})
+
+
+def run_isolated(name, url, iterations, concurrency):
+    """run() in a child process"""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_child, args=(name, url, iterations, concurrency, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def _ms(value):
+    return '%9.2f' % (value * 1000) if value is not None else '%9s' % '-'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='End-to-end benchmark of the OWSLib service clients')
+    parser.add_argument('scenarios', nargs='*', help='scenarios to run, all by default: %s' % ', '.join(SCENARIOS))
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--latency', type=float, default=0)
+    parser.add_argument('--bandwidth', type=float, default=None)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--json')
+    args = parser.parse_args(argv)
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error('unknown scenarios: %s' % ', '.join(unknown))
+
+    results = OrderedDict()
+    with StandInServer(latency=args.latency, bandwidth=args.bandwidth, error_rate=args.error_rate) as server:
+        print('%-28s %6s %6s %9s %9s %9s %9s %9s' % ('scenario', 'ops', 'errors', 'ops/s',
+                                                      'p50 ms', 'p90 ms', 'p99 ms', 'RSS MB'))
+        for name in names:
+            result = results[name] = run_isolated(name, server.url, args.iterations, args.concurrency)
+            if 'failed' in result:
+                print('%-28s failed: %s' % (name, result['failed']))
+                continue
+            print('%-28s %6d %6d %9.1f %s %s %s %9s' % (
+                name, result['operations'], result['errors'], result['throughput'] or 0,
+                _ms(result['p50']), _ms(result['p90']), _ms(result['p99']),
+                '%.1f' % (result['peak_rss'] / 1048576.0) if result['peak_rss'] else '-'))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
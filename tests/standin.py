@@ -0,0 +1,368 @@
+"""
+In-process stand-in for OGC web services, serving the documents in
+tests/resources so clients can be exercised without network access.
+
+    server = StandInServer(latency=0.05, bandwidth=1e6, error_rate=0.01)
+    wms = WebMapService(server.url + '/wms', version='1.1.1')
+    ...
+    server.shutdown()
+
+Requests are routed on their service and request parameters (KVP or the
+root element of POST documents), the path is ignored.  Host names in the
+served capabilities are replaced by the server's, so clients follow the
+operation urls back to it.  GetMap and GetTile images and GetFeature
+collections are synthesised: features are paged with maxFeatures/count
+and startIndex over a collection of `features` points.  WPS Execute
+answers with a started process whose status document reports success
+after `status_polls` status requests.  Capabilities carry an ETag and
+conditional requests for them are answered with 304; increasing
+`revision` changes the ETags.  `peak` is the most requests handled at
+once, `connections` the connections accepted.
+
+`responses` maps request paths (without query string) to canned bodies
+answered instead: a body, a list of bodies returned in turn, the last
+one repeatedly, or a function of the full request path returning a body
+(None for a 404).  Requests received are recorded in `requests`, and
+the (headers, body) of POST requests in `posts`.
+
+latency (seconds) delays each response, bandwidth (bytes per second)
+throttles writing bodies and error_rate is the fraction of requests
+answered with 503.  Setting `failures` answers that many next requests
+with 503, with a Retry-After header of `retry_after` seconds if set.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import hashlib
+import random
+import re
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import defaultdict
+
+from owslib.etree import etree
+from tests.utils import resource_file
+
+try:                    # Python 3
+    from urllib.parse import urlparse, parse_qsl
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:     # Python 2
+    from urlparse import urlparse, parse_qsl
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+# (service, request) -> fixture, or {version: fixture} with the first version by default
+FIXTURES = {
+    ('WMS', 'GetCapabilities'): (('1.1.1', 'wms_nationalatlas_getcapabilities_111.xml'),
+                                 ('1.3.0', 'wms_nationalatlas_getcapabilities_130.xml')),
+    ('WMTS', 'GetCapabilities'): 'geoserver21-wmts-cap.xml',
+    ('WFS', 'GetCapabilities'): (('1.0.0', 'mapserver-wfs-cap.xml'),
+                                 ('1.1.0', 'wfs_HSRS_GetCapabilities_1_1_0.xml'),
+                                 ('2.0.0', 'wfs_CUZK_GetCapabilities_2_0_0.xml')),
+    ('WFS', 'DescribeFeatureType'): 'mapserver-wfs-schema.xml',
+    ('WCS', 'GetCapabilities'): (('1.0.0', 'wcs_naip2004_100.xml'),
+                                 ('1.1.0', 'wcs_naip2004_110.xml')),
+    ('WCS', 'DescribeCoverage'): 'wcs_naip2004_100_describecoverage.xml',
+    ('SOS', 'GetCapabilities'): 'sos_52n_getcapabilities.xml',
+    ('SOS', 'GetObservation'): 'sos_52n_get_observation_ioos.xml',
+    ('SOS', 'DescribeSensor'): 'sml_ndbc_station.xml',
+    ('WPS', 'GetCapabilities'): 'wps_USGSCapabilities.xml',
+    ('WPS', 'DescribeProcess'): 'wps_USGSDescribeProcess.xml',
+}
+
+# CSW records returned by GetRecords, in turn
+RECORDS = ('9250AA67-F3AC-6C12-0CB9-0662231AA181_dc.xml',)
+
+# attributes holding service urls, their host is replaced by the server's
+URL_ATTRIBUTE = re.compile(br'((?:href|onlineResource|template)=")https?://[^/"?]*')
+
+IMAGE_FORMATS = {'png': 'image/png', 'jpeg': 'image/jpeg', 'jpg': 'image/jpeg', 'gif': 'image/gif'}
+
+
+def png(width, height, rgb=(0x33, 0x66, 0x99)):
+    """PNG image of a single colour"""
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data +
+                struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+    row = b'\x00' + struct.pack('BBB', *rgb) * width
+    return (b'\x89PNG\r\n\x1a\n' +
+            chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(row * height)) +
+            chunk(b'IEND', b''))
+
+
+def feature_collection(typename, start, count, total, version='1.1.0'):
+    """GML collection of point features start to start + count of total"""
+    end = max(start, min(start + count, total))
+    prefix, name = typename.split(':', 1) if ':' in typename else ('ms', typename)
+    if version.startswith('2'):
+        head = ('<wfs:FeatureCollection xmlns:wfs="http://www.opengis.net/wfs/2.0" '
+                'xmlns:gml="http://www.opengis.net/gml/3.2" xmlns:%s="http://example.org/%s" '
+                'numberMatched="%d" numberReturned="%d" timeStamp="2016-01-01T00:00:00Z">'
+                % (prefix, prefix, total, end - start))
+        member, point = 'wfs:member', '<gml:Point gml:id="p%d" srsName="urn:ogc:def:crs:EPSG::4326"><gml:pos>%s %s</gml:pos></gml:Point>'
+    else:
+        head = ('<wfs:FeatureCollection xmlns:wfs="http://www.opengis.net/wfs" '
+                'xmlns:gml="http://www.opengis.net/gml" xmlns:%s="http://example.org/%s">' % (prefix, prefix))
+        member, point = 'gml:featureMember', '<gml:Point srsName="EPSG:4326"><gml:coordinates>%.0s%s,%s</gml:coordinates></gml:Point>'
+    parts = [head]
+    for i in range(start, end):
+        parts.append('<%s><%s:%s gml:id="%s.%d"><%s:id>%d</%s:id><%s:name>Feature %d</%s:name>'
+                      '<%s:geometry>%s</%s:geometry></%s:%s></%s>'
+                      % (member, prefix, name, name, i, prefix, i, prefix, prefix, i, prefix,
+                         prefix, point % (i, -180 + (i * 7) % 360, -90 + (i * 3) % 180), prefix, prefix, name, member))
+    parts.append('</wfs:FeatureCollection>')
+    return ''.join(parts).encode('utf-8')
+
+
+def records_response(start, count, total=100):
+    """csw:GetRecordsResponse repeating the RECORDS fixtures"""
+    records = []
+    for path in RECORDS:
+        with open(resource_file(path), 'rb') as f:
+            records.append(re.sub(br'^<\?xml[^>]*\?>\s*', b'', f.read()))
+    end = max(start, min(start + count, total + 1))
+    return (b'<?xml version="1.0" encoding="UTF-8"?>'
+            b'<csw:GetRecordsResponse xmlns:csw="http://www.opengis.net/cat/csw/2.0.2" version="2.0.2">'
+            b'<csw:SearchStatus timestamp="2016-01-01T00:00:00Z"/>'
+            b'<csw:SearchResults numberOfRecordsMatched="%d" numberOfRecordsReturned="%d" '
+            b'nextRecord="%d" recordSchema="http://www.opengis.net/cat/csw/2.0.2" elementSet="full">'
+            % (total, end - start, end if end <= total else 0) +
+            b''.join(records[i % len(records)] for i in range(start, end)) +
+            b'</csw:SearchResults></csw:GetRecordsResponse>')
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # clients may close connections early, e.g. after the root element of a document
+        if not isinstance(sys.exc_info()[1], socket.error):
+            HTTPServer.handle_error(self, request, client_address)
+
+
+class StandInServer(object):
+    """Local HTTP server standing in for OGC web services, started on creation"""
+
+    def __init__(self, latency=0, bandwidth=None, error_rate=0, features=1000, status_polls=1, seed=0,
+                 responses=None):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.features = features
+        self.status_polls = status_polls
+        self.counts = defaultdict(int)    # (service, request) -> requests received
+        self.revision = 0                 # part of the capabilities ETags, increase it to change them
+        self.errors = 0
+        self.failures = 0                 # next requests answered with 503
+        self.retry_after = None           # Retry-After header of the 503 responses
+        self.active = 0                   # requests being handled
+        self.peak = 0                     # most requests handled at once
+        self.connections = 0              # connections accepted
+        self.responses = responses if responses is not None else {}
+        self.requests = []                # paths of the requests received
+        self.posts = []                   # (headers, body) of the POST requests received
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._documents = {}
+        self._images = {}
+        self._executions = 0
+        self._polls = defaultdict(int)
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                BaseHTTPRequestHandler.setup(self)
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                server._track(self, None)
+
+            def do_POST(self):
+                server._track(self, self.read_body())
+
+            def read_body(self):
+                if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+                    chunks = []
+                    while True:
+                        size = int(self.rfile.readline().split(b';')[0], 16)
+                        chunk = self.rfile.read(size + 2)[:size]
+                        if size == 0:
+                            break
+                        chunks.append(chunk)
+                    return b''.join(chunks)
+                return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:%d' % self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def document(self, name):
+        """Fixture name with the server's host in its urls"""
+        try:
+            return self._documents[name]
+        except KeyError:
+            with open(resource_file(name), 'rb') as f:
+                content = URL_ATTRIBUTE.sub(lambda m: m.group(1) + self.url.encode('ascii'), f.read())
+            self._documents[name] = content
+            return content
+
+    def image(self, width, height):
+        key = (width, height)
+        if key not in self._images:
+            self._images[key] = png(width, height)
+        return self._images[key]
+
+    def _track(self, handler, body):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            self._handle(handler, body)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def _handle(self, handler, body):
+        with self._lock:
+            self.requests.append(handler.path)
+            if body is not None:
+                self.posts.append((dict(handler.headers.items()), body))
+        url = urlparse(handler.path)
+        params = dict((k.lower(), v) for k, v in parse_qsl(url.query, keep_blank_values=True))
+        if body:
+            try:
+                root = etree.fromstring(body)
+                params.setdefault('request', root.tag.split('}')[-1])
+                for key, value in root.attrib.items():
+                    params.setdefault(key.split('}')[-1].lower(), value)
+            except Exception:
+                pass
+        service = params.get('service', '').upper()
+        request = params.get('request', '')
+        if not request and url.path.startswith('/wps/status/'):
+            service, request = 'WPS', 'Status'
+        elif not request and url.path.rsplit('.', 1)[-1] in IMAGE_FORMATS:
+            service, request = 'WMTS', 'GetTile'
+
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.counts[(service, request)] += 1
+            failed = self.failures > 0 or (self.error_rate and self._random.random() < self.error_rate)
+            if failed:
+                self.errors += 1
+                self.failures = max(0, self.failures - 1)
+        if failed:
+            headers = {'Retry-After': str(self.retry_after)} if self.retry_after is not None else None
+            return self._send(handler, 503, b'Service temporarily unavailable', 'text/plain', headers)
+
+        try:
+            if url.path in self.responses:
+                status, content, content_type = self.canned(handler.path)
+            else:
+                status, content, content_type = self.respond(service, request, params, url.path)
+        except Exception as err:
+            status, content, content_type = 500, str(err).encode('utf-8'), 'text/plain'
+        headers = {}
+        if status == 200 and request == 'GetCapabilities':
+            headers['ETag'] = '"%s-%d"' % (hashlib.md5(content).hexdigest()[:12], self.revision)
+            if handler.headers.get('If-None-Match') == headers['ETag']:
+                status, content = 304, b''
+        self._send(handler, status, content, content_type, headers)
+
+    def canned(self, path):
+        """(status, body, content type) of the canned response for a request path"""
+        bodies = self.responses[path.split('?')[0]]
+        if callable(bodies):
+            bodies = bodies(path)
+        if isinstance(bodies, list):
+            with self._lock:
+                body = bodies.pop(0) if len(bodies) > 1 else bodies[0]
+        else:
+            body = bodies
+        if body is None:
+            return 404, b'', 'text/plain'
+        return 200, body, 'text/xml' if body.lstrip()[:1] == b'<' else 'application/octet-stream'
+
+    def respond(self, service, request, params, path):
+        """(status, body, content type) answering a request"""
+        xml = 'text/xml'
+        if request == 'GetMap':
+            width, height = int(params.get('width', 256)), int(params.get('height', 256))
+            return 200, self.image(width, height), params.get('format', 'image/png')
+        if request == 'GetTile':
+            return 200, self.image(256, 256), params.get('format', IMAGE_FORMATS.get(path.rsplit('.', 1)[-1], 'image/png'))
+        if request == 'GetFeature':
+            version = params.get('version', '1.1.0')
+            count = params.get('count', params.get('maxfeatures', self.features))
+            content = feature_collection(params.get('typename', params.get('typenames', 'ms:features')).split(',')[0],
+                                         int(params.get('startindex', 0)), int(count), self.features, version)
+            return 200, content, xml
+        if request == 'GetRecords':
+            return 200, records_response(int(params.get('startposition', 1)), int(params.get('maxrecords', 10))), xml
+        if request == 'Execute':
+            with self._lock:
+                self._executions += 1
+                execution = self._executions
+            content = re.sub(br'statusLocation="[^"]*"',
+                             b'statusLocation="' + ('%s/wps/status/%d' % (self.url, execution)).encode('ascii') + b'"',
+                             self.document('wps_USGSExecuteResponse1a.xml'))
+            return 200, content, xml
+        if request == 'Status':
+            with self._lock:
+                self._polls[path] += 1
+                polls = self._polls[path]
+            name = 'wps_USGSExecuteResponse1a.xml' if polls < self.status_polls else 'wps_USGSExecuteResponse1b.xml'
+            return 200, self.document(name), xml
+
+        fixtures = FIXTURES.get((service, request))
+        if fixtures is None:
+            return 404, b'', 'text/plain'
+        if not isinstance(fixtures, str):
+            versions = dict(fixtures)
+            fixtures = versions.get(params.get('version', params.get('acceptversions')), fixtures[0][1])
+        return 200, self.document(fixtures), xml
+
+    def _send(self, handler, status, content, content_type, headers=None):
+        handler.send_response(status)
+        handler.send_header('Content-Type', content_type)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(content)))
+        handler.end_headers()
+        if not self.bandwidth:
+            handler.wfile.write(content)
+            return
+        # throttle writing to about bandwidth bytes per second
+        size = max(1024, int(self.bandwidth / 20))
+        started = time.time()
+        for offset in range(0, len(content), size):
+            handler.wfile.write(content[offset:offset + size])
+            delay = started + (offset + size) / self.bandwidth - time.time()
+            if delay > 0:
+                time.sleep(delay)